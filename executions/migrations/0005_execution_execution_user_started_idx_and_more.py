@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-18 20:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("executions", "0004_remove_execution_temporal_run_id"),
+        ("workflows", "0007_workflow_workflow_user_created_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="execution",
+            index=models.Index(
+                fields=["created_by", "-started_at", "-id"],
+                name="execution_user_started_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="execution",
+            index=models.Index(
+                fields=["created_by", "status", "-started_at", "-id"],
+                name="execution_user_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="execution",
+            index=models.Index(
+                fields=["created_by", "workflow", "-started_at", "-id"],
+                name="execution_user_workflow_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskexecution",
+            index=models.Index(
+                fields=["task", "-started_at"], name="taskexecution_started_idx"
+            ),
+        ),
+    ]
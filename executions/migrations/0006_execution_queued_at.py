@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("executions", "0005_execution_execution_user_started_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="execution",
+            name="queued_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-18 21:05
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Concat
+
+
+def snapshot_recipients(apps, schema_editor):
+    TaskExecution = apps.get_model("executions", "TaskExecution")
+    EmailTask = apps.get_model("workflows", "EmailTask")
+
+    TaskExecution.objects.filter(
+        task__task_type="email",
+        status__in=("completed", "failed"),
+        started_at__isnull=False,
+    ).update(
+        recipients=Subquery(
+            EmailTask.objects.filter(task_id=OuterRef("task_id"))
+            .annotate(
+                snapshot=Concat(
+                    F("recipients"), Value(","), F("cc"), output_field=TextField()
+                )
+            )
+            .values("snapshot")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("executions", "0006_execution_queued_at"),
+        ("workflows", "0008_reporttask_report_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskexecution",
+            name="recipients",
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.RunPython(snapshot_recipients, migrations.RunPython.noop),
+    ]
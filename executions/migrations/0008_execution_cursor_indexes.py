@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-18 21:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("executions", "0007_taskexecution_recipients"),
+        ("workflows", "0008_reporttask_report_type"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="execution",
+            name="execution_user_started_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="execution",
+            name="execution_user_status_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="execution",
+            name="execution_user_workflow_idx",
+        ),
+        migrations.AddIndex(
+            model_name="execution",
+            index=models.Index(
+                fields=["created_by", "-id"], name="execution_user_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="execution",
+            index=models.Index(
+                fields=["created_by", "started_at"], name="execution_user_started_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="execution",
+            index=models.Index(
+                fields=["created_by", "status", "-id"], name="execution_user_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="execution",
+            index=models.Index(
+                fields=["created_by", "workflow", "-id"],
+                name="execution_user_workflow_idx",
+            ),
+        ),
+    ]
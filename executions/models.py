@@ -10,6 +10,7 @@ class Execution(models.Model):
     )
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     started_at = models.DateTimeField(auto_now_add=True)
+    queued_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     status = models.CharField(
         max_length=20,
@@ -26,6 +27,23 @@ class Execution(models.Model):
     temporal_workflow_id = models.CharField(max_length=100, blank=True)
     error_message = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_by", "-id"], name="execution_user_id_idx"),
+            models.Index(
+                fields=["created_by", "started_at"],
+                name="execution_user_started_idx",
+            ),
+            models.Index(
+                fields=["created_by", "status", "-id"],
+                name="execution_user_status_idx",
+            ),
+            models.Index(
+                fields=["created_by", "workflow", "-id"],
+                name="execution_user_workflow_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"Execution {self.id} - {self.workflow.name} ({self.status})"
 
@@ -53,9 +71,15 @@ class TaskExecution(models.Model):
     )
 
     error_message = models.TextField(blank=True)
+    recipients = models.TextField(null=True, blank=True)
 
     class Meta:
         ordering = ["execution", "task__order"]
+        indexes = [
+            models.Index(
+                fields=["task", "-started_at"], name="taskexecution_started_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Task {self.task.name} ({self.status})"
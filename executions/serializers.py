@@ -49,6 +49,26 @@ class ExecutionSerializer(serializers.ModelSerializer):
         return obj.execution_time()
 
 
+class ExecutionFilterSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(
+        choices=Execution._meta.get_field("status").choices, required=False
+    )
+    workflow = serializers.IntegerField(min_value=1, required=False)
+    started_after = serializers.DateTimeField(required=False)
+    started_before = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        started_after = data.get("started_after")
+        started_before = data.get("started_before")
+
+        if started_after and started_before and started_after > started_before:
+            raise serializers.ValidationError(
+                "started_after deve ser anterior a started_before"
+            )
+
+        return data
+
+
 class TaskExecutionDetailSerializer(serializers.ModelSerializer):
     task_name = serializers.CharField(source="task.name", read_only=True)
     task_type = serializers.CharField(source="task.task_type", read_only=True)
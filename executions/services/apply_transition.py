@@ -0,0 +1,14 @@
+from django.db import transaction
+
+from .update_execution import set_execution_status
+from .update_task_execution import set_task_execution_status
+from ..types.transition import TransitionParams
+
+
+def apply_transition(transition_params: TransitionParams) -> None:
+    with transaction.atomic():
+        for task_execution_params in transition_params.task_executions:
+            set_task_execution_status(task_execution_params)
+
+        for execution_params in transition_params.executions:
+            set_execution_status(execution_params)
@@ -1,4 +1,5 @@
 from asgiref.sync import async_to_sync
+from django.utils import timezone
 
 from temporal.services.prepare_schedule import prepare_schedule_input
 from temporal.services.prepare_workflow import prepare_workflow_input
@@ -9,8 +10,9 @@ from ..models import Execution
 
 def start_execution(execution_id: int) -> None:
     try:
-        execution = Execution.objects.get(pk=execution_id)
+        execution = Execution.objects.select_related("workflow").get(pk=execution_id)
         workflow_input = prepare_workflow_input(execution)
+        queued_at = timezone.now()
 
         if hasattr(execution.workflow, "schedule"):
             schedule_input = prepare_schedule_input(execution)
@@ -19,6 +21,7 @@ def start_execution(execution_id: int) -> None:
             result = async_to_sync(start_workflow)(workflow_input)
 
         execution.temporal_workflow_id = result
+        execution.queued_at = queued_at
         execution.save()
 
     except Execution.DoesNotExist:
@@ -5,18 +5,22 @@ from ..models import Execution
 from ..types.execution import UpdateExecutionParams
 
 
-def update_execution_status(execution_params: UpdateExecutionParams) -> None:
-    with transaction.atomic():
-        execution = Execution.objects.select_for_update().get(
-            id=execution_params.execution_id
-        )
-        execution.status = execution_params.status
+def set_execution_status(execution_params: UpdateExecutionParams) -> None:
+    execution = Execution.objects.select_for_update().get(
+        id=execution_params.execution_id
+    )
+    execution.status = execution_params.status
+
+    if execution.status == "running":
+        execution.started_at = timezone.now()
+    if execution.status in ["completed", "failed", "canceled", "terminated"]:
+        execution.completed_at = timezone.now()
 
-        if execution.status == "running":
-            execution.started_at = timezone.now()
-        if execution.status in ["completed", "failed", "canceled", "terminated"]:
-            execution.completed_at = timezone.now()
+    execution.error_message = execution_params.error_message or ""
 
-        execution.error_message = execution_params.error_message or ""
+    execution.save()
 
-        execution.save()
+
+def update_execution_status(execution_params: UpdateExecutionParams) -> None:
+    with transaction.atomic():
+        set_execution_status(execution_params)
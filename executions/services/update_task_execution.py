@@ -1,24 +1,35 @@
 from django.db import transaction
 from django.utils import timezone
 
+from reports.services.rollup import add_to_rollup, remove_from_rollup
 from ..models import TaskExecution
 from ..types.task_execution import UpdateTaskExecutionParams
 
 
-def update_task_execution_status(
+def set_task_execution_status(
     task_execution_params: UpdateTaskExecutionParams,
 ) -> None:
-    with transaction.atomic():
-        task_execution = TaskExecution.objects.get(
-            id=task_execution_params.task_execution_id
-        )
-        task_execution.status = task_execution_params.status
+    task_execution = (
+        TaskExecution.objects.select_for_update(of=("self",))
+        .select_related("task")
+        .get(id=task_execution_params.task_execution_id)
+    )
+    remove_from_rollup(task_execution)
+    task_execution.status = task_execution_params.status
+
+    if task_execution.status == "running":
+        task_execution.started_at = timezone.now()
+    elif task_execution.status in ["completed", "failed"]:
+        task_execution.completed_at = timezone.now()
+
+    task_execution.error_message = task_execution_params.error_message or ""
 
-        if task_execution.status == "running":
-            task_execution.started_at = timezone.now()
-        elif task_execution.status in ["completed", "failed"]:
-            task_execution.completed_at = timezone.now()
+    task_execution.save()
+    add_to_rollup(task_execution)
 
-        task_execution.error_message = task_execution_params.error_message or ""
 
-        task_execution.save()
+def update_task_execution_status(
+    task_execution_params: UpdateTaskExecutionParams,
+) -> None:
+    with transaction.atomic():
+        set_task_execution_status(task_execution_params)
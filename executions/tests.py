@@ -1,10 +1,17 @@
+from datetime import timedelta
 from unittest.mock import patch
 
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-from executions.models import Execution
+from executions.models import Execution, TaskExecution
+from executions.services.apply_transition import apply_transition
 from executions.services.reset_execution import reset_execution
 from executions.services.start_execution import start_execution
+from executions.types.execution import UpdateExecutionParams
+from executions.types.task_execution import UpdateTaskExecutionParams
+from executions.types.transition import TransitionParams
 from users.models import User
 from workflows.models import Workflow, Task, Schedule
 
@@ -161,3 +168,218 @@ class ExecutionServicesTestCase(TestCase):
             reset_execution(non_existent_id)
 
         self.assertIn("não existe", str(context.exception))
+
+
+class ApplyTransitionTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="password123"
+        )
+        self.workflow = Workflow.objects.create(
+            name="Test Workflow", created_by=self.user
+        )
+        self.execution = Execution.objects.create(
+            workflow=self.workflow, created_by=self.user
+        )
+        self.first_task_execution = TaskExecution.objects.create(
+            execution=self.execution,
+            task=Task.objects.create(
+                workflow=self.workflow,
+                created_by=self.user,
+                name="First Task",
+                order=1,
+                task_type="email",
+            ),
+        )
+        self.second_task_execution = TaskExecution.objects.create(
+            execution=self.execution,
+            task=Task.objects.create(
+                workflow=self.workflow,
+                created_by=self.user,
+                name="Second Task",
+                order=2,
+                task_type="email",
+            ),
+        )
+
+    def test_apply_transition_updates_tasks_and_execution(self):
+        apply_transition(
+            TransitionParams(
+                task_executions=[
+                    UpdateTaskExecutionParams(
+                        task_execution_id=self.first_task_execution.id,
+                        status="completed",
+                    ),
+                    UpdateTaskExecutionParams(
+                        task_execution_id=self.second_task_execution.id,
+                        status="failed",
+                        error_message="Falha no envio",
+                    ),
+                ],
+                executions=[
+                    UpdateExecutionParams(
+                        execution_id=self.execution.id,
+                        status="failed",
+                        error_message="Falha no envio",
+                    )
+                ],
+            )
+        )
+
+        self.first_task_execution.refresh_from_db()
+        self.second_task_execution.refresh_from_db()
+        self.execution.refresh_from_db()
+
+        self.assertEqual(self.first_task_execution.status, "completed")
+        self.assertIsNotNone(self.first_task_execution.completed_at)
+        self.assertEqual(self.second_task_execution.status, "failed")
+        self.assertEqual(self.second_task_execution.error_message, "Falha no envio")
+        self.assertEqual(self.execution.status, "failed")
+        self.assertIsNotNone(self.execution.completed_at)
+
+    def test_apply_transition_is_atomic(self):
+        with self.assertRaises(TaskExecution.DoesNotExist):
+            apply_transition(
+                TransitionParams(
+                    task_executions=[
+                        UpdateTaskExecutionParams(
+                            task_execution_id=self.first_task_execution.id,
+                            status="completed",
+                        ),
+                        UpdateTaskExecutionParams(
+                            task_execution_id=99999, status="running"
+                        ),
+                    ]
+                )
+            )
+
+        self.first_task_execution.refresh_from_db()
+        self.assertEqual(self.first_task_execution.status, "running")
+        self.assertIsNone(self.first_task_execution.completed_at)
+
+
+class ExecutionViewSetQueriesTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="password123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _create_executions(self, count, tasks=3):
+        workflow = Workflow.objects.create(name="Test Workflow", created_by=self.user)
+        Schedule.objects.create(
+            workflow=workflow, created_by=self.user, minute=0, hour=0
+        )
+        workflow_tasks = [
+            Task.objects.create(
+                workflow=workflow,
+                created_by=self.user,
+                name=f"Task {index}",
+                order=index,
+                task_type="email",
+            )
+            for index in range(tasks)
+        ]
+        executions = []
+
+        for _ in range(count):
+            execution = Execution.objects.create(
+                workflow=workflow, created_by=self.user
+            )
+            TaskExecution.objects.bulk_create(
+                TaskExecution(execution=execution, task=task) for task in workflow_tasks
+            )
+            executions.append(execution)
+
+        return executions
+
+    def test_list_uses_fixed_number_of_queries(self):
+        self._create_executions(2)
+
+        with self.assertNumQueries(2):
+            response = self.client.get("/executions/")
+
+        self.assertEqual(len(response.json()["results"]), 2)
+
+        self._create_executions(10)
+
+        with self.assertNumQueries(2):
+            response = self.client.get("/executions/")
+
+        results = response.json()["results"]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(results), 12)
+        self.assertEqual(len(results[0]["task_executions"]), 3)
+        self.assertEqual(results[0]["workflow"]["schedule"]["hour"], 0)
+
+    def test_retrieve_uses_fixed_number_of_queries(self):
+        execution = self._create_executions(1, tasks=10)[0]
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/executions/{execution.id}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [task["task"]["name"] for task in response.json()["task_executions"]],
+            [f"Task {index}" for index in range(10)],
+        )
+
+    def test_list_paginates_with_cursor(self):
+        executions = self._create_executions(5, tasks=1)
+
+        response = self.client.get("/executions/", {"page_size": 2})
+        first_page = response.json()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(first_page["next"])
+        second_page = response.json()
+
+        self.assertEqual(
+            [execution["id"] for execution in first_page["results"]],
+            [executions[4].id, executions[3].id],
+        )
+        self.assertEqual(
+            [execution["id"] for execution in second_page["results"]],
+            [executions[2].id, executions[1].id],
+        )
+
+    def test_cursor_is_stable_when_started_at_changes(self):
+        executions = self._create_executions(4, tasks=1)
+
+        first_page = self.client.get("/executions/", {"page_size": 2}).json()
+        Execution.objects.filter(pk=executions[0].pk).update(started_at=timezone.now())
+        second_page = self.client.get(first_page["next"]).json()
+
+        self.assertEqual(
+            [execution["id"] for execution in second_page["results"]],
+            [executions[1].id, executions[0].id],
+        )
+
+    def test_list_filters_by_status_workflow_and_time_range(self):
+        first, second = self._create_executions(2, tasks=1)
+        other = self._create_executions(1, tasks=1)[0]
+        Execution.objects.filter(pk=second.pk).update(status="failed")
+        Execution.objects.filter(pk=first.pk).update(
+            started_at=timezone.now() - timedelta(days=2)
+        )
+
+        def ids(params):
+            response = self.client.get("/executions/", params)
+            return {execution["id"] for execution in response.json()["results"]}
+
+        self.assertEqual(ids({"status": "failed"}), {second.id})
+        self.assertEqual(ids({"workflow": other.workflow_id}), {other.id})
+        self.assertEqual(
+            ids({"started_after": (timezone.now() - timedelta(days=1)).isoformat()}),
+            {second.id, other.id},
+        )
+        self.assertEqual(
+            ids({"started_before": (timezone.now() - timedelta(days=1)).isoformat()}),
+            {first.id},
+        )
+
+    def test_list_rejects_invalid_filters(self):
+        response = self.client.get("/executions/", {"status": "unknown"})
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,11 @@
+from dataclasses import dataclass, field
+from typing import List
+
+from .execution import UpdateExecutionParams
+from .task_execution import UpdateTaskExecutionParams
+
+
+@dataclass
+class TransitionParams:
+    task_executions: List[UpdateTaskExecutionParams] = field(default_factory=list)
+    executions: List[UpdateExecutionParams] = field(default_factory=list)
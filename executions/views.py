@@ -1,9 +1,11 @@
+from django.db.models import Prefetch
 from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from .models import Execution
-from .serializers import ExecutionSerializer
+from .models import Execution, TaskExecution
+from .pagination import ExecutionCursorPagination
+from .serializers import ExecutionFilterSerializer, ExecutionSerializer
 from .services.reset_execution import reset_execution
 from .services.start_execution import start_execution
 
@@ -15,9 +17,38 @@ class ExecutionViewSet(
     viewsets.GenericViewSet,
 ):
     serializer_class = ExecutionSerializer
+    pagination_class = ExecutionCursorPagination
 
     def get_queryset(self):
-        return Execution.objects.filter(created_by=self.request.user)
+        return (
+            Execution.objects.filter(created_by=self.request.user)
+            .select_related("workflow__schedule")
+            .prefetch_related(
+                Prefetch(
+                    "task_executions",
+                    queryset=TaskExecution.objects.select_related("task"),
+                )
+            )
+        )
+
+    def filter_queryset(self, queryset):
+        if self.action != "list":
+            return queryset
+
+        filters = ExecutionFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        params = filters.validated_data
+
+        if "status" in params:
+            queryset = queryset.filter(status=params["status"])
+        if "workflow" in params:
+            queryset = queryset.filter(workflow_id=params["workflow"])
+        if "started_after" in params:
+            queryset = queryset.filter(started_at__gte=params["started_after"])
+        if "started_before" in params:
+            queryset = queryset.filter(started_at__lt=params["started_before"])
+
+        return queryset
 
     @action(detail=True, methods=["post"])
     def execute(self, request, pk=None):
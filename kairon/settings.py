@@ -15,6 +15,7 @@ from datetime import timedelta
 from pathlib import Path
 
 from dj_database_url import config
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -88,7 +89,26 @@ WSGI_APPLICATION = "kairon.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {"default": config(default=os.getenv("DATABASE_URL"))}
+DATABASES = {
+    "default": config(
+        default=os.getenv("DATABASE_URL"),
+        conn_max_age=int(os.getenv("DATABASE_CONN_MAX_AGE", 0)),
+        conn_health_checks=True,
+    )
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
 
 
 # Password validation
@@ -174,6 +194,101 @@ DEFAULT_FROM_EMAIL = os.getenv("MAILERSEND_DEFAULT_EMAIL")
 
 DEFAULT_FROM_NAME = "KaironAPP"
 
+MAILERSEND_API_BASE = os.getenv("MAILERSEND_API_BASE", "https://api.mailersend.com/v1")
+
+MAILERSEND_HTTP_POOL_SIZE = int(os.getenv("MAILERSEND_HTTP_POOL_SIZE", 10))
+
+MAILERSEND_HTTP_TIMEOUT = float(os.getenv("MAILERSEND_HTTP_TIMEOUT", 10))
+
+MAILERSEND_RATE_LIMITS = [
+    (int(os.getenv("MAILERSEND_RATE_LIMIT_PER_SECOND", 0)), 1),
+    (int(os.getenv("MAILERSEND_RATE_LIMIT_PER_DAY", 0)), 24 * 60 * 60),
+]
+
+MAILERSEND_RATE_LIMITER = os.getenv(
+    "MAILERSEND_RATE_LIMITER", "notifications.ratelimit.database.DatabaseRateLimiter"
+)
+
+MAILERSEND_RATE_LIMITER_OPTIONS = (
+    {"path": os.getenv("MAILERSEND_RATE_LIMITER_PATH")}
+    if os.getenv("MAILERSEND_RATE_LIMITER_PATH")
+    else {}
+)
+
+MAILERSEND_RATE_LIMIT_MAX_WAIT = float(os.getenv("MAILERSEND_RATE_LIMIT_MAX_WAIT", 5))
+
+MAILERSEND_DEFAULT_RETRY_AFTER = float(os.getenv("MAILERSEND_DEFAULT_RETRY_AFTER", 1))
+
+
+# Email failover settings
+
+EMAIL_CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(
+    os.getenv("EMAIL_CIRCUIT_BREAKER_FAILURE_THRESHOLD", 5)
+)
+
+EMAIL_CIRCUIT_BREAKER_RECOVERY_TIMEOUT = float(
+    os.getenv("EMAIL_CIRCUIT_BREAKER_RECOVERY_TIMEOUT", 30)
+)
+
+EMAIL_FAILOVER_SERVICE = os.getenv("EMAIL_FAILOVER_SERVICE", "")
+
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", 25))
+
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "false").lower() == "true"
+
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 5))
+
+
+# Email idempotency settings
+
+EMAIL_IDEMPOTENCY_LEASE = int(os.getenv("EMAIL_IDEMPOTENCY_LEASE", 60))
+
+EMAIL_RETENTION_DAYS = int(os.getenv("EMAIL_RETENTION_DAYS", 30))
+
+
+# Email outbox settings
+
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 100))
+
+EMAIL_OUTBOX_CONCURRENCY = int(os.getenv("EMAIL_OUTBOX_CONCURRENCY", 10))
+
+EMAIL_OUTBOX_RATE_LIMIT = float(os.getenv("EMAIL_OUTBOX_RATE_LIMIT", 0))
+
+EMAIL_OUTBOX_BULK = os.getenv("EMAIL_OUTBOX_BULK", "false").lower() == "true"
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv("EMAIL_OUTBOX_RETRY_DELAY", 30))
+
+EMAIL_OUTBOX_CLAIM_TIMEOUT = int(os.getenv("EMAIL_OUTBOX_CLAIM_TIMEOUT", 300))
+
+EMAIL_OUTBOX_IDLE_INTERVAL = float(os.getenv("EMAIL_OUTBOX_IDLE_INTERVAL", 1))
+
+MAILERSEND_BULK_BATCH_SIZE = int(os.getenv("MAILERSEND_BULK_BATCH_SIZE", 500))
+
+MAILERSEND_BULK_POLL_INTERVAL = float(os.getenv("MAILERSEND_BULK_POLL_INTERVAL", 1))
+
+MAILERSEND_BULK_POLL_TIMEOUT = float(os.getenv("MAILERSEND_BULK_POLL_TIMEOUT", 120))
+
+
+# Report settings
+
+REPORT_APPROXIMATE_RECIPIENTS = (
+    os.getenv("REPORT_APPROXIMATE_RECIPIENTS", "false").lower() == "true"
+)
+
+REPORT_CACHE_ALIAS = os.getenv("REPORT_CACHE_ALIAS", "default")
+
+REPORT_CACHE_BUCKET = int(os.getenv("REPORT_CACHE_BUCKET", 0))
+
+REPORT_CACHE_LOCK_TIMEOUT = float(os.getenv("REPORT_CACHE_LOCK_TIMEOUT", 10))
+
 
 # Temporal IO settings
 
@@ -182,3 +297,89 @@ TEMPORAL_TASK_QUEUE_NAME = "Kairon-default-queue"
 TEMPORAL_CLIENT_ADDRESS = os.getenv("TEMPORAL_CLIENT_ADDRESS")
 
 TEMPORAL_CLIENT_NAMESPACE = os.getenv("TEMPORAL_CLIENT_NAMESPACE")
+
+TEMPORAL_WORKFLOW_CACHE_TIMEOUT = int(
+    os.getenv("TEMPORAL_WORKFLOW_CACHE_TIMEOUT", 60 * 60)
+)
+
+TEMPORAL_MAX_PARALLEL_TASKS = int(os.getenv("TEMPORAL_MAX_PARALLEL_TASKS", 5))
+
+TEMPORAL_CONTINUE_AS_NEW_AFTER_TASKS = int(
+    os.getenv("TEMPORAL_CONTINUE_AS_NEW_AFTER_TASKS", 100)
+)
+
+TEMPORAL_CONTINUE_AS_NEW_AFTER_EVENTS = int(
+    os.getenv("TEMPORAL_CONTINUE_AS_NEW_AFTER_EVENTS", 10000)
+)
+
+if 0 < TEMPORAL_CONTINUE_AS_NEW_AFTER_EVENTS < 1000:
+    raise ImproperlyConfigured(
+        "TEMPORAL_CONTINUE_AS_NEW_AFTER_EVENTS deve ser 0 (desativado) ou no "
+        "mínimo 1000."
+    )
+
+TEMPORAL_EMAIL_CHUNK_SIZE = int(os.getenv("TEMPORAL_EMAIL_CHUNK_SIZE", 50))
+
+TEMPORAL_MAX_PARALLEL_EMAIL_CHUNKS = int(
+    os.getenv("TEMPORAL_MAX_PARALLEL_EMAIL_CHUNKS", 5)
+)
+
+TEMPORAL_BULK_EMAIL = os.getenv("TEMPORAL_BULK_EMAIL", "false").lower() == "true"
+
+TEMPORAL_EMAIL_OUTBOX = os.getenv("TEMPORAL_EMAIL_OUTBOX", "false").lower() == "true"
+
+TEMPORAL_ACTIVITY_THREADS = int(os.getenv("TEMPORAL_ACTIVITY_THREADS", 20))
+
+TEMPORAL_MAX_CONCURRENT_LOCAL_ACTIVITIES = int(
+    os.getenv("TEMPORAL_MAX_CONCURRENT_LOCAL_ACTIVITIES", 4)
+)
+
+TEMPORAL_MAX_CONCURRENT_ACTIVITIES = int(
+    os.getenv("TEMPORAL_MAX_CONCURRENT_ACTIVITIES", TEMPORAL_ACTIVITY_THREADS)
+)
+
+TEMPORAL_ACTIVITY_TASK_QUEUES = {
+    activity_type: {
+        "task_queue": os.getenv(
+            f"TEMPORAL_{activity_type.upper()}_TASK_QUEUE",
+            f"Kairon-{activity_type}-queue",
+        ),
+        "max_concurrent_activities": int(
+            os.getenv(
+                f"TEMPORAL_{activity_type.upper()}_MAX_CONCURRENT_ACTIVITIES",
+                TEMPORAL_MAX_CONCURRENT_ACTIVITIES,
+            )
+        ),
+    }
+    for activity_type in ("status", "email", "report")
+}
+
+TEMPORAL_PAYLOAD_COMPRESSION = os.getenv("TEMPORAL_PAYLOAD_COMPRESSION", "")
+
+TEMPORAL_PAYLOAD_COMPRESSION_THRESHOLD = int(
+    os.getenv("TEMPORAL_PAYLOAD_COMPRESSION_THRESHOLD", 1024)
+)
+
+TEMPORAL_CLAIM_CHECK_ENABLED = (
+    os.getenv("TEMPORAL_CLAIM_CHECK_ENABLED", "false").lower() == "true"
+)
+
+TEMPORAL_CLAIM_CHECK_THRESHOLD = int(
+    os.getenv("TEMPORAL_CLAIM_CHECK_THRESHOLD", 32 * 1024)
+)
+
+TEMPORAL_CLAIM_CHECK_STORE = os.getenv(
+    "TEMPORAL_CLAIM_CHECK_STORE", "temporal.storage.filesystem.FileSystemBlobStore"
+)
+
+TEMPORAL_CLAIM_CHECK_STORE_OPTIONS = {
+    "root": os.getenv("TEMPORAL_CLAIM_CHECK_PATH", str(BASE_DIR / "payloads")),
+}
+
+TEMPORAL_WORKER_SHUTDOWN_TIMEOUT = int(
+    os.getenv("TEMPORAL_WORKER_SHUTDOWN_TIMEOUT", 30)
+)
+
+TEMPORAL_LOCAL_STATUS_ACTIVITIES = (
+    os.getenv("TEMPORAL_LOCAL_STATUS_ACTIVITIES", "false").lower() == "true"
+)
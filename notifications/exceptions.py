@@ -1,2 +1,46 @@
+from typing import Optional
+
+
 class EmailServiceError(Exception):
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+
+class EmailDeliveryUnknownError(EmailServiceError):
     pass
+
+
+class EmailRetryLaterError(EmailServiceError):
+    def __init__(self, message: str, retry_after: float, code: int):
+        super().__init__(message, code)
+        self.retry_after = retry_after
+
+
+class EmailRateLimitError(EmailRetryLaterError):
+    def __init__(self, retry_after: float):
+        super().__init__(
+            f"Limite de envio do provedor atingido, tente novamente em "
+            f"{retry_after:.1f}s",
+            retry_after,
+            429,
+        )
+
+
+class EmailCircuitOpenError(EmailRetryLaterError):
+    def __init__(self, retry_after: float):
+        super().__init__(
+            f"Serviço de e-mail indisponível, tente novamente em {retry_after:.1f}s",
+            retry_after,
+            503,
+        )
+
+
+class EmailSendInProgressError(EmailRetryLaterError):
+    def __init__(self, retry_after: float):
+        super().__init__(
+            f"Envio com a mesma chave de idempotência em andamento, tente novamente "
+            f"em {retry_after:.1f}s",
+            retry_after,
+            409,
+        )
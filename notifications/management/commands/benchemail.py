@@ -0,0 +1,98 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from ...services.mailersend import MailerSendService
+from ...services.pooled_mailersend import PooledMailerSendService, create_http_session
+from ...ratelimit.memory import MemoryRateLimiter
+from ...stub_server import MailerSendStubServer
+from ...types.email import EmailParams
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks sends per second of the email service with and without "
+        "a pooled keep-alive HTTP transport, against a local MailerSend stub."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--emails", type=int, default=500)
+        parser.add_argument("--threads", type=int, default=10)
+        parser.add_argument(
+            "--handshake-delay",
+            type=float,
+            default=0.02,
+            help="Seconds the stub adds to every new connection (TCP/TLS setup).",
+        )
+        parser.add_argument(
+            "--quota",
+            type=int,
+            default=0,
+            help=(
+                "Requests per second the stub accepts before answering 429. "
+                "Adds a run with a shared rate limiter at that quota."
+            ),
+        )
+        parser.add_argument(
+            "--url", help="Existing MailerSend-compatible API to use instead."
+        )
+
+    def _run(self, send, emails: int, threads: int) -> float:
+        email_params = EmailParams(
+            to_email=["bench@example.com"], subject="Benchmark", content="Olá"
+        )
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda _: send(email_params), range(emails)))
+        return emails / (time.perf_counter() - started)
+
+    def handle(self, *args, **options):
+        server = None
+        url = options["url"]
+
+        if url is None:
+            server = MailerSendStubServer(
+                handshake_delay=options["handshake_delay"],
+                requests_per_second=options["quota"],
+            )
+            server.start()
+            url = server.url
+
+        pooled_service = PooledMailerSendService(
+            api_base=url, session=create_http_session(options["threads"])
+        )
+        modes = {
+            "unpooled": lambda params: MailerSendService(api_base=url).send_email(
+                params
+            ),
+            "pooled": pooled_service.send_email,
+        }
+
+        if options["quota"]:
+            limited_service = PooledMailerSendService(
+                api_base=url,
+                session=pooled_service.session,
+                rate_limiter=MemoryRateLimiter([(options["quota"], 1)], max_wait=60),
+            )
+            limited_service.rate_limit_max_wait = 60
+            pooled_service.rate_limit_max_wait = 60
+            modes["limited"] = limited_service.send_email
+
+        try:
+            for name, send in modes.items():
+                connections = server.connections if server else 0
+                rejected = server.rejected if server else 0
+                rate = self._run(send, options["emails"], options["threads"])
+                line = f"{name:<9} sends/s={rate:.1f}"
+                if server:
+                    line += (
+                        f" connections={server.connections - connections}"
+                        f" rejected={server.rejected - rejected}"
+                    )
+                self.stdout.write(line)
+        finally:
+            pooled_service.close()
+            if server:
+                server.stop()
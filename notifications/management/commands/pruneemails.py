@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...services.idempotency import prune_sent_emails
+from ...services.outbox import prune_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes idempotency ledger entries and finished outbox emails older "
+        "than the retention period. Schedule it to run periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.EMAIL_RETENTION_DAYS,
+            help="Keep records newer than this many days.",
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options["days"])
+        sent_emails = prune_sent_emails(before)
+        outbox_emails = prune_outbox(before)
+        self.stdout.write(
+            f"Pruned {sent_emails} sent email records and {outbox_emails} "
+            "outbox emails"
+        )
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+
+from ...stub_server import MailerSendStubServer, SMTPStubServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs local stand-ins for the MailerSend API and, optionally, an SMTP "
+        "server. Point MAILERSEND_API_BASE and EMAIL_HOST/EMAIL_PORT at them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8025)
+        parser.add_argument(
+            "--handshake-delay",
+            type=float,
+            default=0.0,
+            help="Seconds added to every new connection.",
+        )
+        parser.add_argument(
+            "--response-delay",
+            type=float,
+            default=0.0,
+            help="Seconds added to every request.",
+        )
+        parser.add_argument(
+            "--requests-per-second",
+            type=int,
+            default=0,
+            help="Answer 429 with Retry-After above this rate. 0 disables it.",
+        )
+        parser.add_argument(
+            "--smtp-port",
+            type=int,
+            default=0,
+            help="Also run an SMTP stand-in on this port. 0 disables it.",
+        )
+
+    def handle(self, *args, **options):
+        server = MailerSendStubServer(
+            (options["host"], options["port"]),
+            handshake_delay=options["handshake_delay"],
+            response_delay=options["response_delay"],
+            requests_per_second=options["requests_per_second"],
+        )
+        self.stdout.write(f"MailerSend stub listening on {server.url}")
+
+        smtp_server = None
+        if options["smtp_port"]:
+            smtp_server = SMTPStubServer((options["host"], options["smtp_port"]))
+            smtp_server.start()
+            self.stdout.write(
+                f"SMTP stub listening on {options['host']}:{options['smtp_port']}"
+            )
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if smtp_server:
+                smtp_server.stop()
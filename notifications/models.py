@@ -0,0 +1,51 @@
+from django.db import models
+
+
+class OutboxEmail(models.Model):
+    key = models.CharField(max_length=255, unique=True)
+    workflow_id = models.CharField(max_length=255, blank=True)
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ("pending", "Pending"),
+            ("sending", "Sending"),
+            ("sent", "Sent"),
+            ("failed", "Failed"),
+        ],
+        default="pending",
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"Outbox email {self.key} ({self.status})"
+
+
+class RateLimitState(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    state = models.JSONField(default=dict)
+
+    def __str__(self):
+        return f"Rate limit {self.name}"
+
+
+class SentEmail(models.Model):
+    key = models.CharField(max_length=255, unique=True)
+    status = models.CharField(
+        max_length=20,
+        choices=[("sending", "Sending"), ("sent", "Sent")],
+        default="sending",
+    )
+    claimed_at = models.DateTimeField()
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Sent email {self.key} ({self.status})"
@@ -0,0 +1,63 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Sequence
+
+from ..exceptions import EmailRateLimitError
+
+
+class RateLimiter(ABC):
+    def __init__(self, limits: Sequence[Sequence[float]], max_wait: float = 5.0):
+        self.limits: List[Sequence[float]] = [
+            (float(limit), float(period)) for limit, period in limits if limit > 0
+        ]
+        self.max_wait = max_wait
+
+    @abstractmethod
+    def _update(self, update: Callable[[Dict[str, Any]], float]) -> float:
+        pass
+
+    def _take(self, state: Dict[str, Any], now: float) -> float:
+        blocked_until = state.get("blocked_until", 0.0)
+        if blocked_until > now:
+            return blocked_until - now
+
+        buckets = state.setdefault("buckets", {})
+        levels = {}
+        waits = []
+
+        for limit, period in self.limits:
+            key = f"{limit:g}/{period:g}"
+            bucket = buckets.get(key, {"tokens": limit, "updated": now})
+            level = min(
+                limit,
+                bucket["tokens"] + (now - bucket["updated"]) * limit / period,
+            )
+            levels[key] = level
+            if level < 1:
+                waits.append((1 - level) * period / limit)
+
+        for key, level in levels.items():
+            buckets[key] = {"tokens": level if waits else level - 1, "updated": now}
+
+        return max(waits, default=0.0)
+
+    def _block(self, state: Dict[str, Any], until: float) -> float:
+        state["blocked_until"] = max(state.get("blocked_until", 0.0), until)
+        return 0.0
+
+    def acquire(self) -> None:
+        deadline = time.monotonic() + self.max_wait
+
+        while True:
+            wait = self._update(lambda state: self._take(state, time.time()))
+            if wait <= 0:
+                return
+
+            if time.monotonic() + wait > deadline:
+                raise EmailRateLimitError(wait)
+
+            time.sleep(wait)
+
+    def block(self, seconds: float) -> None:
+        until = time.time() + seconds
+        self._update(lambda state: self._block(state, until))
@@ -0,0 +1,28 @@
+from typing import Any, Callable, Dict, Sequence
+
+from django.db import transaction
+
+from ..models import RateLimitState
+from .base import RateLimiter
+
+
+class DatabaseRateLimiter(RateLimiter):
+    def __init__(
+        self,
+        limits: Sequence[Sequence[float]],
+        name: str = "mailersend",
+        max_wait: float = 5.0,
+    ):
+        super().__init__(limits, max_wait)
+        self.name = name
+
+    def _update(self, update: Callable[[Dict[str, Any]], float]) -> float:
+        RateLimitState.objects.get_or_create(name=self.name)
+
+        with transaction.atomic():
+            rate_limit_state = RateLimitState.objects.select_for_update().get(
+                name=self.name
+            )
+            result = update(rate_limit_state.state)
+            rate_limit_state.save(update_fields=["state"])
+            return result
@@ -0,0 +1,31 @@
+import fcntl
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Sequence
+
+from .base import RateLimiter
+
+
+class FileRateLimiter(RateLimiter):
+    def __init__(
+        self, limits: Sequence[Sequence[float]], path: str, max_wait: float = 5.0
+    ):
+        super().__init__(limits, max_wait)
+        self.path = Path(path)
+
+    def _update(self, update: Callable[[Dict[str, Any]], float]) -> float:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        with os.fdopen(fd, "r+") as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            content = state_file.read()
+            state = json.loads(content) if content else {}
+
+            result = update(state)
+
+            state_file.seek(0)
+            state_file.truncate()
+            json.dump(state, state_file)
+            return result
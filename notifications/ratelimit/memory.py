@@ -0,0 +1,15 @@
+import threading
+from typing import Any, Callable, Dict, Sequence
+
+from .base import RateLimiter
+
+
+class MemoryRateLimiter(RateLimiter):
+    def __init__(self, limits: Sequence[Sequence[float]], max_wait: float = 5.0):
+        super().__init__(limits, max_wait)
+        self._state: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _update(self, update: Callable[[Dict[str, Any]], float]) -> float:
+        with self._lock:
+            return update(self._state)
@@ -1,9 +1,43 @@
 from abc import ABC, abstractmethod
+from typing import List
 
+from ..exceptions import EmailDeliveryUnknownError, EmailServiceError
 from ..types.email import EmailParams, EmailResponse
 
 
+def is_unsent_error(error: Exception) -> bool:
+    return isinstance(error, EmailServiceError) and not isinstance(
+        error, EmailDeliveryUnknownError
+    )
+
+
+def error_response(error: Exception) -> EmailResponse:
+    if not is_unsent_error(error):
+        return EmailResponse(
+            code=202,
+            message=f"Envio realizado com status desconhecido: {str(error)}",
+            delivery_unknown=True,
+        )
+
+    return EmailResponse(
+        code=error.code or 500,
+        message=str(error),
+        retry_after=getattr(error, "retry_after", None),
+    )
+
+
 class EmailService(ABC):
     @abstractmethod
     def send_email(self, email_params: EmailParams) -> EmailResponse:
         pass
+
+    def send_bulk(self, email_params_list: List[EmailParams]) -> List[EmailResponse]:
+        responses = []
+
+        for email_params in email_params_list:
+            try:
+                responses.append(self.send_email(email_params))
+            except Exception as e:
+                responses.append(error_response(e))
+
+        return responses
@@ -0,0 +1,108 @@
+import threading
+import time
+from typing import List, Optional
+
+from .base import EmailService, is_unsent_error
+from ..exceptions import (
+    EmailCircuitOpenError,
+    EmailRateLimitError,
+    EmailServiceError,
+)
+from ..types.email import EmailParams, EmailResponse
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+
+            if (
+                self.state == "open"
+                and time.monotonic() - self._opened_at >= self.recovery_timeout
+            ):
+                self.state = "half_open"
+
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+
+            return False
+
+    def retry_after(self) -> float:
+        with self._lock:
+            remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+            return max(remaining, 1.0)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+def is_provider_failure(error: Exception) -> bool:
+    if isinstance(error, EmailRateLimitError):
+        return False
+    if isinstance(error, EmailServiceError) and error.code is not None:
+        return error.code >= 500
+    return True
+
+
+class CircuitBreakerEmailService(EmailService):
+    def __init__(
+        self,
+        primary: EmailService,
+        circuit_breaker: CircuitBreaker,
+        secondary: Optional[EmailService] = None,
+    ):
+        self.primary = primary
+        self.circuit_breaker = circuit_breaker
+        self.secondary = secondary
+
+    def _call(self, method: str, payload):
+        error: Exception = EmailCircuitOpenError(self.circuit_breaker.retry_after())
+
+        if self.circuit_breaker.allow():
+            try:
+                result = getattr(self.primary, method)(payload)
+            except Exception as e:
+                if not is_provider_failure(e):
+                    self.circuit_breaker.record_success()
+                    raise
+                self.circuit_breaker.record_failure()
+                if not is_unsent_error(e):
+                    raise
+                error = e
+            else:
+                self.circuit_breaker.record_success()
+                return result
+
+        if self.secondary is None:
+            raise error
+
+        return getattr(self.secondary, method)(payload)
+
+    def send_email(self, email_params: EmailParams) -> EmailResponse:
+        return self._call("send_email", email_params)
+
+    def send_bulk(self, email_params_list: List[EmailParams]) -> List[EmailResponse]:
+        return self._call("send_bulk", email_params_list)
@@ -0,0 +1,49 @@
+from functools import lru_cache
+from typing import Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .base import EmailService
+from .circuit_breaker import CircuitBreaker, CircuitBreakerEmailService
+from .idempotency import IdempotentEmailService
+from .pooled_mailersend import PooledMailerSendService
+from ..ratelimit.base import RateLimiter
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    limits = [
+        (limit, period)
+        for limit, period in settings.MAILERSEND_RATE_LIMITS
+        if limit > 0
+    ]
+
+    if not limits:
+        return None
+
+    rate_limiter_class = import_string(settings.MAILERSEND_RATE_LIMITER)
+    return rate_limiter_class(
+        limits,
+        max_wait=settings.MAILERSEND_RATE_LIMIT_MAX_WAIT,
+        **settings.MAILERSEND_RATE_LIMITER_OPTIONS,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_email_service() -> EmailService:
+    failover_service = (
+        import_string(settings.EMAIL_FAILOVER_SERVICE)()
+        if settings.EMAIL_FAILOVER_SERVICE
+        else None
+    )
+
+    return IdempotentEmailService(
+        CircuitBreakerEmailService(
+            PooledMailerSendService(rate_limiter=get_rate_limiter()),
+            CircuitBreaker(
+                settings.EMAIL_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                settings.EMAIL_CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+            ),
+            failover_service,
+        )
+    )
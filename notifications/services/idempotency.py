@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+from typing import List
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .base import EmailService, is_unsent_error
+from ..exceptions import EmailSendInProgressError
+from ..models import SentEmail
+from ..types.email import EmailParams, EmailResponse
+
+
+def claim_send(key: str) -> str:
+    now = timezone.now()
+    lease = timedelta(seconds=settings.EMAIL_IDEMPOTENCY_LEASE)
+
+    try:
+        with transaction.atomic():
+            sent_email, created = SentEmail.objects.select_for_update().get_or_create(
+                key=key, defaults={"claimed_at": now}
+            )
+
+            if created:
+                return "claimed"
+
+            if sent_email.status == "sent":
+                return "sent"
+
+            if sent_email.claimed_at + lease > now:
+                raise EmailSendInProgressError(
+                    (sent_email.claimed_at + lease - now).total_seconds()
+                )
+
+            sent_email.claimed_at = now
+            sent_email.save(update_fields=["claimed_at"])
+            return "claimed"
+    except IntegrityError:
+        raise EmailSendInProgressError(settings.EMAIL_IDEMPOTENCY_LEASE)
+
+
+def mark_sent(key: str) -> None:
+    SentEmail.objects.filter(key=key).update(status="sent", sent_at=timezone.now())
+
+
+def release_send(key: str) -> None:
+    SentEmail.objects.filter(key=key, status="sending").delete()
+
+
+def prune_sent_emails(before: datetime) -> int:
+    deleted, _ = SentEmail.objects.filter(
+        Q(status="sent", sent_at__lt=before)
+        | Q(status="sending", claimed_at__lt=before)
+    ).delete()
+    return deleted
+
+
+class IdempotentEmailService(EmailService):
+    def __init__(self, email_service: EmailService):
+        self.email_service = email_service
+
+    def send_email(self, email_params: EmailParams) -> EmailResponse:
+        key = email_params.idempotency_key
+
+        if not key:
+            return self.email_service.send_email(email_params)
+
+        if claim_send(key) == "sent":
+            return EmailResponse(code=202, message="Envio já realizado")
+
+        try:
+            response = self.email_service.send_email(email_params)
+        except Exception as e:
+            if is_unsent_error(e):
+                release_send(key)
+            raise
+
+        mark_sent(key)
+        return response
+
+    def send_bulk(self, email_params_list: List[EmailParams]) -> List[EmailResponse]:
+        responses = {}
+        pending = []
+
+        for index, email_params in enumerate(email_params_list):
+            key = email_params.idempotency_key
+
+            try:
+                if key and claim_send(key) == "sent":
+                    responses[index] = EmailResponse(
+                        code=202, message="Envio já realizado"
+                    )
+                else:
+                    pending.append(index)
+            except EmailSendInProgressError as e:
+                responses[index] = EmailResponse(
+                    code=e.code, message=str(e), retry_after=e.retry_after
+                )
+
+        if not pending:
+            return [responses[index] for index in range(len(email_params_list))]
+
+        try:
+            sent = self.email_service.send_bulk(
+                [email_params_list[index] for index in pending]
+            )
+        except Exception as e:
+            if is_unsent_error(e):
+                for index in pending:
+                    if email_params_list[index].idempotency_key:
+                        release_send(email_params_list[index].idempotency_key)
+            raise
+
+        for index, response in zip(pending, sent):
+            key = email_params_list[index].idempotency_key
+            if key and not response.delivery_unknown:
+                if response.code == 202:
+                    mark_sent(key)
+                else:
+                    release_send(key)
+            responses[index] = response
+
+        return [responses[index] for index in range(len(email_params_list))]
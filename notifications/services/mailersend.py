@@ -1,24 +1,46 @@
-from typing import List, Dict, Any
+import json
+import re
+import time
+from typing import List, Dict, Any, Optional
 
 from django.conf import settings
 from mailersend import emails
 
-from .base import EmailService
-from ..exceptions import EmailServiceError
+from .base import EmailService, error_response, is_unsent_error
+from ..exceptions import (
+    EmailDeliveryUnknownError,
+    EmailRateLimitError,
+    EmailServiceError,
+)
+from ..ratelimit.base import RateLimiter
 from ..types.email import EmailParams, EmailResponse
 
+AMBIGUOUS_RESPONSE_CODES = (500, 502, 504)
+
 
 class MailerSendService(EmailService):
-    def __init__(self):
+    def __init__(
+        self,
+        api_base: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
         self.api_key = settings.MAILERSEND_API_KEY
+        self.api_base = api_base or settings.MAILERSEND_API_BASE
         self.default_from_email = settings.DEFAULT_FROM_EMAIL
         self.default_from_name = settings.DEFAULT_FROM_NAME
+        self.bulk_batch_size = settings.MAILERSEND_BULK_BATCH_SIZE
+        self.bulk_poll_interval = settings.MAILERSEND_BULK_POLL_INTERVAL
+        self.bulk_poll_timeout = settings.MAILERSEND_BULK_POLL_TIMEOUT
+        self.rate_limiter = rate_limiter
+        self.rate_limit_max_wait = settings.MAILERSEND_RATE_LIMIT_MAX_WAIT
+        self.default_retry_after = settings.MAILERSEND_DEFAULT_RETRY_AFTER
         self._mailer = None
 
     @property
     def mailer(self):
         if self._mailer is None:
             self._mailer = emails.NewEmail(self.api_key)
+            self._mailer.api_base = self.api_base
         return self._mailer
 
     def _prepare_recipients(self, emails_list: List[str]) -> List[Dict[str, str]]:
@@ -55,15 +77,167 @@ class MailerSendService(EmailService):
 
         return body
 
-    def send_email(self, email_params: EmailParams) -> EmailResponse:
-        body = self._prepare_email(email_params)
-        response = self.mailer.send(body)
+    def _request(self, send, payload) -> str:
+        deadline = time.monotonic() + self.rate_limit_max_wait
+
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            try:
+                response = send(payload)
+                if int(response[0:3]) != 429:
+                    return response
+                retry_after = self.default_retry_after
+            except EmailRateLimitError as e:
+                retry_after = e.retry_after
+
+            if self.rate_limiter:
+                self.rate_limiter.block(retry_after)
+
+            if time.monotonic() + retry_after > deadline:
+                raise EmailRateLimitError(retry_after)
+
+            time.sleep(retry_after)
+
+    def _check_response(self, response: str) -> None:
         response_code = int(response[0:3])
 
         if response_code != 202:
-            response_message = response[3:-1]
-            raise EmailServiceError(
-                f"code: {response_code}, detail: {response_message}"
+            error_class = (
+                EmailDeliveryUnknownError
+                if response_code in AMBIGUOUS_RESPONSE_CODES
+                else EmailServiceError
+            )
+            raise error_class(
+                f"code: {response_code}, detail: {response[3:-1]}", response_code
+            )
+
+    def send_email(self, email_params: EmailParams) -> EmailResponse:
+        body = self._prepare_email(email_params)
+        response = self._request(self.mailer.send, body)
+        self._check_response(response)
+
+        return EmailResponse(code=202)
+
+    def _submit_bulk(self, bodies: List[Dict[str, Any]]) -> str:
+        response = self._request(self.mailer.send_bulk, bodies)
+        self._check_response(response)
+
+        return json.loads(response[4:])["bulk_email_id"]
+
+    def _wait_bulk(self, bulk_email_id: str) -> Dict[str, Any]:
+        deadline = time.monotonic() + self.bulk_poll_timeout
+
+        while True:
+            status = json.loads(self.mailer.get_bulk_status_by_id(bulk_email_id))
+            data = status.get("data", {})
+
+            if data.get("state") in ("completed", "failed"):
+                return data
+
+            if time.monotonic() >= deadline:
+                raise EmailDeliveryUnknownError(
+                    f"Tempo esgotado aguardando o envio em massa {bulk_email_id}"
+                )
+
+            time.sleep(self.bulk_poll_interval)
+
+    def _map_bulk_errors(self, data: Dict[str, Any], size: int) -> Dict[int, List[str]]:
+        errors: Dict[int, List[str]] = {}
+
+        for field, details in {
+            **(data.get("validation_errors") or {}),
+            **(data.get("suppressed_recipients") or {}),
+        }.items():
+            match = re.match(r"message\.(\d+)", field)
+            if match and int(match.group(1)) < size:
+                errors.setdefault(int(match.group(1)), []).append(f"{field}: {details}")
+
+        return errors
+
+    def _bulk_responses(
+        self, batch: List[EmailParams], bulk_email_id: str
+    ) -> List[EmailResponse]:
+        try:
+            data = self._wait_bulk(bulk_email_id)
+        except Exception as e:
+            return [
+                EmailResponse(
+                    code=202,
+                    message=f"Envio em massa {bulk_email_id} aceito com status "
+                    f"desconhecido: {str(e)}",
+                    delivery_unknown=True,
+                    bulk_email_id=bulk_email_id,
+                )
+                for _ in batch
+            ]
+
+        errors = self._map_bulk_errors(data, len(batch))
+        responses = []
+
+        for index in range(len(batch)):
+            if index in errors:
+                responses.append(
+                    EmailResponse(
+                        code=422,
+                        message="; ".join(errors[index]),
+                        bulk_email_id=bulk_email_id,
+                    )
+                )
+            elif data.get("state") == "failed":
+                responses.append(
+                    EmailResponse(
+                        code=500,
+                        message=f"Envio em massa {bulk_email_id} falhou",
+                        delivery_unknown=True,
+                        bulk_email_id=bulk_email_id,
+                    )
+                )
+            else:
+                responses.append(EmailResponse(code=202, bulk_email_id=bulk_email_id))
+
+        return responses
+
+    def _not_submitted_response(self, error: Exception) -> EmailResponse:
+        if is_unsent_error(error):
+            return error_response(error)
+
+        return EmailResponse(
+            code=500,
+            message=f"Lote não enviado após falha no lote anterior: {str(error)}",
+        )
+
+    def send_bulk(self, email_params_list: List[EmailParams]) -> List[EmailResponse]:
+        batches = [
+            email_params_list[start : start + self.bulk_batch_size]
+            for start in range(0, len(email_params_list), self.bulk_batch_size)
+        ]
+        bulk_email_ids = []
+        error: Optional[Exception] = None
+
+        for batch in batches:
+            try:
+                bulk_email_ids.append(
+                    self._submit_bulk([self._prepare_email(params) for params in batch])
+                )
+            except Exception as e:
+                error = e
+                break
+
+        responses = []
+
+        for batch, bulk_email_id in zip(batches, bulk_email_ids):
+            responses.extend(self._bulk_responses(batch, bulk_email_id))
+
+        if error is not None:
+            responses.extend(
+                error_response(error) for _ in batches[len(bulk_email_ids)]
+            )
+            responses.extend(
+                self._not_submitted_response(error)
+                for batch in batches[len(bulk_email_ids) + 1 :]
+                for _ in batch
             )
 
-        return EmailResponse(code=response_code)
+        return responses
@@ -0,0 +1,174 @@
+from concurrent.futures import Executor
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .base import EmailService, error_response
+from ..models import OutboxEmail
+from ..types.email import EmailParams, EmailResponse
+from ..types.outbox import OutboxEmailParams, OutboxResult
+
+
+def enqueue_emails(outbox_params_list: List[OutboxEmailParams]) -> None:
+    with transaction.atomic():
+        for outbox_params in outbox_params_list:
+            OutboxEmail.objects.get_or_create(
+                key=outbox_params.key,
+                defaults={
+                    "workflow_id": outbox_params.workflow_id,
+                    "payload": asdict(outbox_params.email_params),
+                },
+            )
+
+        OutboxEmail.objects.filter(
+            key__in=[outbox_params.key for outbox_params in outbox_params_list],
+            status="failed",
+        ).update(
+            status="pending",
+            attempts=0,
+            error_message="",
+            next_attempt_at=timezone.now(),
+        )
+
+
+def get_outbox_results(keys: List[str]) -> List[OutboxResult]:
+    return [
+        OutboxResult(
+            key=outbox_email.key,
+            status=outbox_email.status,
+            error_message=outbox_email.error_message or None,
+        )
+        for outbox_email in OutboxEmail.objects.filter(key__in=keys)
+    ]
+
+
+def prune_outbox(before: datetime) -> int:
+    deleted, _ = OutboxEmail.objects.filter(
+        status__in=("sent", "failed"), created_at__lt=before
+    ).delete()
+    return deleted
+
+
+def claim_outbox_batch(batch_size: int) -> List[OutboxEmail]:
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT)
+
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status="pending", next_attempt_at__lte=now)
+                | Q(status="sending", claimed_at__lt=stale)
+            )
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        OutboxEmail.objects.filter(id__in=[email.id for email in batch]).update(
+            status="sending", claimed_at=now
+        )
+
+    return batch
+
+
+def _send(email_service: EmailService, email_params: EmailParams) -> EmailResponse:
+    try:
+        return email_service.send_email(email_params)
+    except Exception as e:
+        return error_response(e)
+
+
+def _send_in_thread(
+    email_service: EmailService, email_params: EmailParams
+) -> EmailResponse:
+    close_old_connections()
+    try:
+        return _send(email_service, email_params)
+    finally:
+        close_old_connections()
+
+
+def _record_response(outbox_email: OutboxEmail, response: EmailResponse) -> None:
+    outbox_email.claimed_at = None
+
+    if response.retry_after is not None:
+        outbox_email.status = "pending"
+        outbox_email.error_message = response.message or ""
+        outbox_email.next_attempt_at = timezone.now() + timedelta(
+            seconds=response.retry_after or 0
+        )
+        outbox_email.save(
+            update_fields=["status", "error_message", "next_attempt_at", "claimed_at"]
+        )
+        return
+
+    outbox_email.attempts += 1
+
+    if response.code == 202:
+        outbox_email.status = "sent"
+        outbox_email.sent_at = timezone.now()
+        outbox_email.error_message = (
+            response.delivery_unknown and response.message
+        ) or ""
+    elif (
+        not response.delivery_unknown
+        and outbox_email.attempts < settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    ):
+        outbox_email.status = "pending"
+        outbox_email.error_message = response.message or ""
+        outbox_email.next_attempt_at = timezone.now() + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (outbox_email.attempts - 1)
+        )
+    else:
+        outbox_email.status = "failed"
+        outbox_email.error_message = response.message or ""
+
+    outbox_email.save(
+        update_fields=[
+            "status",
+            "attempts",
+            "error_message",
+            "next_attempt_at",
+            "claimed_at",
+            "sent_at",
+        ]
+    )
+
+
+def dispatch_outbox_batch(
+    email_service: EmailService,
+    batch_size: int,
+    executor: Optional[Executor] = None,
+    bulk: bool = False,
+) -> List[OutboxEmail]:
+    batch = claim_outbox_batch(batch_size)
+
+    if not batch:
+        return []
+
+    email_params_list = [EmailParams(**email.payload) for email in batch]
+
+    if bulk:
+        try:
+            responses = email_service.send_bulk(email_params_list)
+        except Exception as e:
+            responses = [error_response(e) for _ in batch]
+    elif executor is not None:
+        responses = list(
+            executor.map(
+                lambda email_params: _send_in_thread(email_service, email_params),
+                email_params_list,
+            )
+        )
+    else:
+        responses = [
+            _send(email_service, email_params) for email_params in email_params_list
+        ]
+
+    for outbox_email, response in zip(batch, responses):
+        _record_response(outbox_email, response)
+
+    return batch
@@ -0,0 +1,135 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from django.conf import settings
+from mailersend import emails
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+from .mailersend import MailerSendService
+from ..exceptions import (
+    EmailDeliveryUnknownError,
+    EmailRateLimitError,
+    EmailServiceError,
+)
+from ..ratelimit.base import RateLimiter
+
+
+def create_http_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    if not value:
+        return default
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def is_connection_error(error: requests.RequestException) -> bool:
+    return isinstance(error, requests.ConnectTimeout) or (
+        isinstance(error, requests.ConnectionError)
+        and bool(error.args)
+        and isinstance(getattr(error.args[0], "reason", None), ConnectTimeoutError)
+    )
+
+
+class PooledEmailClient(emails.NewEmail):
+    def __init__(
+        self,
+        api_key: str,
+        api_base: str,
+        session: requests.Session,
+        timeout: float,
+        default_retry_after: float,
+    ):
+        super().__init__(api_key)
+        self.api_base = api_base
+        self.session = session
+        self.timeout = timeout
+        self.default_retry_after = default_retry_after
+
+    def _check_rate_limit(self, response: requests.Response) -> None:
+        if response.status_code == 429:
+            raise EmailRateLimitError(
+                parse_retry_after(
+                    response.headers.get("Retry-After"), self.default_retry_after
+                )
+            )
+
+    def _post(self, path: str, payload) -> str:
+        try:
+            response = self.session.post(
+                f"{self.api_base}/{path}",
+                headers=self.headers_default,
+                json=payload,
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            if is_connection_error(e):
+                raise EmailServiceError(f"Falha de conexão com o MailerSend: {str(e)}")
+            raise EmailDeliveryUnknownError(
+                f"Falha na requisição ao MailerSend: {str(e)}"
+            )
+
+        self._check_rate_limit(response)
+        return f"{response.status_code}\n{response.text}"
+
+    def send(self, message):
+        return self._post("email", message)
+
+    def send_bulk(self, message_list):
+        return self._post("bulk-email", message_list)
+
+    def get_bulk_status_by_id(self, bulk_email_id):
+        response = self.session.get(
+            f"{self.api_base}/bulk-email/{bulk_email_id}",
+            headers=self.headers_default,
+            timeout=self.timeout,
+        )
+        return response.text
+
+
+class PooledMailerSendService(MailerSendService):
+    def __init__(
+        self,
+        api_base: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        super().__init__(api_base, rate_limiter)
+        self.timeout = settings.MAILERSEND_HTTP_TIMEOUT
+        self.session = session or create_http_session(
+            settings.MAILERSEND_HTTP_POOL_SIZE
+        )
+
+    @property
+    def mailer(self):
+        if self._mailer is None:
+            self._mailer = PooledEmailClient(
+                self.api_key,
+                self.api_base,
+                self.session,
+                self.timeout,
+                self.default_retry_after,
+            )
+        return self._mailer
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,82 @@
+import smtplib
+from typing import Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+from .base import EmailService
+from ..exceptions import EmailDeliveryUnknownError, EmailServiceError
+from ..types.email import EmailParams, EmailResponse
+
+
+class SMTPEmailService(EmailService):
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: Optional[bool] = None,
+    ):
+        self.host = host or settings.EMAIL_HOST
+        self.port = port or settings.EMAIL_PORT
+        self.username = username if username is not None else settings.EMAIL_HOST_USER
+        self.password = (
+            password if password is not None else settings.EMAIL_HOST_PASSWORD
+        )
+        self.use_tls = use_tls if use_tls is not None else settings.EMAIL_USE_TLS
+        self.default_from_email = settings.DEFAULT_FROM_EMAIL
+        self.default_from_name = settings.DEFAULT_FROM_NAME
+
+    def _get_connection(self):
+        return get_connection(
+            "django.core.mail.backends.smtp.EmailBackend",
+            host=self.host,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            use_tls=self.use_tls,
+            timeout=settings.EMAIL_TIMEOUT,
+            fail_silently=False,
+        )
+
+    def _prepare_email(self, email_params: EmailParams) -> EmailMultiAlternatives:
+        reply_to = email_params.from_email or self.default_from_email
+        reply_to_name = email_params.from_name or self.default_from_name
+
+        message = EmailMultiAlternatives(
+            subject=email_params.subject,
+            body=email_params.content,
+            from_email=f"{self.default_from_name} <{self.default_from_email}>",
+            to=email_params.to_email,
+            cc=email_params.cc or [],
+            reply_to=[f"{reply_to_name} <{reply_to}>"],
+        )
+
+        if email_params.html_content:
+            message.attach_alternative(email_params.html_content, "text/html")
+
+        return message
+
+    def send_email(self, email_params: EmailParams) -> EmailResponse:
+        connection = self._get_connection()
+
+        try:
+            connection.open()
+        except (smtplib.SMTPException, OSError) as e:
+            raise EmailServiceError(f"Erro no envio por SMTP: {str(e)}")
+
+        try:
+            connection.send_messages([self._prepare_email(email_params)])
+        except (
+            smtplib.SMTPRecipientsRefused,
+            smtplib.SMTPSenderRefused,
+            smtplib.SMTPDataError,
+        ) as e:
+            raise EmailServiceError(f"Erro no envio por SMTP: {str(e)}")
+        except (smtplib.SMTPException, OSError) as e:
+            raise EmailDeliveryUnknownError(f"Erro no envio por SMTP: {str(e)}")
+        finally:
+            connection.close()
+
+        return EmailResponse(code=202)
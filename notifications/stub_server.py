@@ -0,0 +1,189 @@
+import json
+import socketserver
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class MailerSendStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+        time.sleep(self.server.handshake_delay)
+
+    def _respond(self, code: int, body: Optional[dict] = None) -> None:
+        content = json.dumps(body).encode() if body is not None else b""
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        messages = json.loads(self.rfile.read(length) or b"null")
+        time.sleep(self.server.response_delay)
+
+        retry_after = self.server.take_request()
+        if retry_after:
+            self.send_response(429)
+            self.send_header("Retry-After", f"{retry_after:.3f}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.path.endswith("/bulk-email"):
+            self.server.requests += 1
+            self._respond(
+                202,
+                {
+                    "message": "The bulk email is being processed.",
+                    "bulk_email_id": uuid.uuid4().hex,
+                },
+            )
+        elif self.path.endswith("/email") and messages is not None:
+            self.server.requests += 1
+            self._respond(202)
+        else:
+            self._respond(404, {"message": "Not found"})
+
+    def do_GET(self):
+        if "/bulk-email/" in self.path:
+            bulk_email_id = self.path.rsplit("/", 1)[-1]
+            self._respond(
+                200,
+                {
+                    "data": {
+                        "id": bulk_email_id,
+                        "state": "completed",
+                        "validation_errors": None,
+                        "suppressed_recipients": None,
+                    }
+                },
+            )
+        else:
+            self._respond(404, {"message": "Not found"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BackgroundServerMixin:
+    _thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class MailerSendStubServer(BackgroundServerMixin, ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        handshake_delay: float = 0.0,
+        response_delay: float = 0.0,
+        requests_per_second: int = 0,
+    ):
+        super().__init__(address, MailerSendStubHandler)
+        self.handshake_delay = handshake_delay
+        self.response_delay = response_delay
+        self.requests_per_second = requests_per_second
+        self.connections = 0
+        self.requests = 0
+        self.rejected = 0
+        self._window = (0, 0)
+        self._lock = threading.Lock()
+
+    def take_request(self) -> float:
+        if not self.requests_per_second:
+            return 0.0
+
+        now = time.time()
+        with self._lock:
+            second, count = self._window
+            if int(now) != second:
+                second, count = int(now), 0
+
+            if count >= self.requests_per_second:
+                self.rejected += 1
+                return second + 1 - now
+
+            self._window = (second, count + 1)
+            return 0.0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def _read_data(self) -> bytes:
+        lines = []
+
+        while True:
+            line = self.rfile.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                return b"".join(lines)
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+    def handle(self):
+        self._reply("220 kairon-stub ESMTP")
+        sender, recipients = None, []
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+
+            command = line.decode(errors="replace").strip()
+            verb = command[:4].upper()
+            argument = command.partition(":")[2].strip().strip("<>")
+
+            if verb in ("HELO", "EHLO"):
+                self._reply("250 kairon-stub")
+            elif verb == "MAIL":
+                sender, recipients = argument, []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(argument)
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                self.server.messages.append(
+                    {"from": sender, "to": recipients, "data": self._read_data()}
+                )
+                self._reply("250 OK")
+            elif verb == "RSET":
+                sender, recipients = None, []
+                self._reply("250 OK")
+            elif verb == "NOOP":
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class SMTPStubServer(BackgroundServerMixin, socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int] = ("127.0.0.1", 0)):
+        super().__init__(address, SMTPStubHandler)
+        self.messages: List[Dict[str, Any]] = []
@@ -1,11 +1,40 @@
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
 from unittest.mock import patch, MagicMock
 
 from django.conf import settings
-from django.test import TestCase
-
-from .exceptions import EmailServiceError
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .exceptions import (
+    EmailCircuitOpenError,
+    EmailDeliveryUnknownError,
+    EmailRateLimitError,
+    EmailSendInProgressError,
+    EmailServiceError,
+)
+from .models import OutboxEmail, SentEmail
+from .ratelimit.database import DatabaseRateLimiter
+from .ratelimit.filesystem import FileRateLimiter
+from .ratelimit.memory import MemoryRateLimiter
+from .services.circuit_breaker import CircuitBreaker, CircuitBreakerEmailService
+from .services.idempotency import IdempotentEmailService
 from .services.mailersend import MailerSendService
-from .types.email import EmailParams
+from .services.smtp import SMTPEmailService
+from .services.outbox import (
+    claim_outbox_batch,
+    dispatch_outbox_batch,
+    enqueue_emails,
+)
+from .services.pooled_mailersend import PooledMailerSendService, create_http_session
+from .stub_server import MailerSendStubServer, SMTPStubServer
+from .types.email import EmailParams, EmailResponse
+from .types.outbox import OutboxEmailParams
 
 
 class TestMailerSendService(TestCase):
@@ -180,3 +209,596 @@ class TestMailerSendService(TestCase):
         self.assertEqual(self.service.default_from_email, settings.DEFAULT_FROM_EMAIL)
         self.assertEqual(self.service.default_from_name, settings.DEFAULT_FROM_NAME)
         self.assertIsNone(self.service._mailer)
+
+    @patch("notifications.services.mailersend.emails.NewEmail")
+    def test_send_bulk_maps_results_to_messages(self, mock_new_email):
+        mock_mailer = MagicMock()
+        mock_mailer.send_bulk.return_value = "202\n" + json.dumps(
+            {"message": "The bulk email is being processed.", "bulk_email_id": "bulk1"}
+        )
+        mock_mailer.get_bulk_status_by_id.side_effect = [
+            json.dumps({"data": {"id": "bulk1", "state": "processing"}}),
+            json.dumps(
+                {
+                    "data": {
+                        "id": "bulk1",
+                        "state": "completed",
+                        "validation_errors": {
+                            "message.1.to.0.email": ["The email must be valid."]
+                        },
+                    }
+                }
+            ),
+        ]
+        mock_new_email.return_value = mock_mailer
+        self.service.bulk_poll_interval = 0
+
+        responses = self.service.send_bulk(
+            [
+                EmailParams(
+                    to_email=[self.test_email],
+                    subject=self.test_subject,
+                    content=self.test_content,
+                ),
+                EmailParams(
+                    to_email=["invalid"],
+                    subject=self.test_subject,
+                    content=self.test_content,
+                ),
+            ]
+        )
+
+        self.assertEqual([response.code for response in responses], [202, 422])
+        self.assertIn("The email must be valid.", responses[1].message)
+        self.assertEqual(len(mock_mailer.send_bulk.call_args.args[0]), 2)
+        mock_mailer.get_bulk_status_by_id.assert_called_with("bulk1")
+
+    @patch("notifications.services.mailersend.emails.NewEmail")
+    def test_send_bulk_api_error(self, mock_new_email):
+        mock_mailer = MagicMock()
+        mock_mailer.send_bulk.return_value = "503 Service Unavailable"
+        mock_new_email.return_value = mock_mailer
+
+        responses = self.service.send_bulk(
+            [
+                EmailParams(
+                    to_email=[self.test_email],
+                    subject=self.test_subject,
+                    content=self.test_content,
+                )
+            ]
+        )
+
+        self.assertEqual(responses[0].code, 503)
+        self.assertFalse(responses[0].delivery_unknown)
+        self.assertIn("code: 503", responses[0].message)
+
+    @patch("notifications.services.mailersend.emails.NewEmail")
+    def test_send_bulk_keeps_accepted_batches_after_later_failure(self, mock_new_email):
+        mock_mailer = MagicMock()
+        mock_mailer.send_bulk.side_effect = [
+            "202\n" + json.dumps({"bulk_email_id": "bulk1"}),
+            "422 Unprocessable Entity",
+        ]
+        mock_mailer.get_bulk_status_by_id.return_value = json.dumps(
+            {"data": {"id": "bulk1", "state": "completed"}}
+        )
+        mock_new_email.return_value = mock_mailer
+        self.service.bulk_batch_size = 1
+        self.service.bulk_poll_interval = 0
+        email_params = EmailParams(
+            to_email=[self.test_email],
+            subject=self.test_subject,
+            content=self.test_content,
+        )
+
+        responses = self.service.send_bulk([email_params] * 3)
+
+        self.assertEqual([response.code for response in responses], [202, 422, 422])
+        self.assertEqual(responses[0].bulk_email_id, "bulk1")
+        self.assertEqual(mock_mailer.send_bulk.call_count, 2)
+
+    @patch("notifications.services.mailersend.emails.NewEmail")
+    def test_send_bulk_poll_timeout_is_delivery_unknown(self, mock_new_email):
+        mock_mailer = MagicMock()
+        mock_mailer.send_bulk.return_value = "202\n" + json.dumps(
+            {"bulk_email_id": "bulk1"}
+        )
+        mock_mailer.get_bulk_status_by_id.return_value = json.dumps(
+            {"data": {"id": "bulk1", "state": "processing"}}
+        )
+        mock_new_email.return_value = mock_mailer
+        self.service.bulk_poll_timeout = 0
+
+        responses = self.service.send_bulk(
+            [
+                EmailParams(
+                    to_email=[self.test_email],
+                    subject=self.test_subject,
+                    content=self.test_content,
+                )
+            ]
+        )
+
+        self.assertEqual(responses[0].code, 202)
+        self.assertTrue(responses[0].delivery_unknown)
+        self.assertEqual(responses[0].bulk_email_id, "bulk1")
+
+
+class TestPooledMailerSendService(TestCase):
+    def setUp(self):
+        self.server = MailerSendStubServer()
+        self.server.start()
+        self.service = PooledMailerSendService(
+            api_base=self.server.url, session=create_http_session(2)
+        )
+        self.service.bulk_poll_interval = 0
+        self.email_params = EmailParams(
+            to_email=["recipient@test.com"], subject="Subject", content="Content"
+        )
+
+    def tearDown(self):
+        self.service.close()
+        self.server.stop()
+
+    def test_send_email_reuses_connection(self):
+        for _ in range(3):
+            result = self.service.send_email(self.email_params)
+            self.assertEqual(result.code, 202)
+
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_send_bulk(self):
+        responses = self.service.send_bulk([self.email_params, self.email_params])
+
+        self.assertEqual([response.code for response in responses], [202, 202])
+        self.assertEqual(self.server.requests, 1)
+
+    def test_connection_failure_is_not_ambiguous(self):
+        self.server.stop()
+
+        with self.assertRaises(EmailServiceError) as context:
+            self.service.send_email(self.email_params)
+
+        self.assertNotIsInstance(context.exception, EmailDeliveryUnknownError)
+
+
+@override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_DELAY=0)
+class TestEmailOutbox(TestCase):
+    def setUp(self):
+        self.email_service = MagicMock()
+        enqueue_emails(
+            [
+                OutboxEmailParams(
+                    key=f"wf-1:1:{index}",
+                    workflow_id="wf-1",
+                    email_params=EmailParams(
+                        to_email=[f"user{index}@test.com"],
+                        subject="Subject",
+                        content="Content",
+                    ),
+                )
+                for index in range(2)
+            ]
+        )
+
+    def test_enqueue_emails_is_idempotent(self):
+        enqueue_emails(
+            [
+                OutboxEmailParams(
+                    key="wf-1:1:0",
+                    email_params=EmailParams(
+                        to_email=["other@test.com"], subject="Other", content=""
+                    ),
+                )
+            ]
+        )
+
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+        self.assertEqual(
+            OutboxEmail.objects.get(key="wf-1:1:0").payload["to_email"],
+            ["user0@test.com"],
+        )
+
+    def test_enqueue_emails_requeues_failed_messages(self):
+        OutboxEmail.objects.filter(key="wf-1:1:0").update(
+            status="failed", attempts=2, error_message="bounced"
+        )
+
+        enqueue_emails(
+            [
+                OutboxEmailParams(
+                    key="wf-1:1:0",
+                    email_params=EmailParams(
+                        to_email=["user0@test.com"], subject="Subject", content=""
+                    ),
+                )
+            ]
+        )
+
+        outbox_email = OutboxEmail.objects.get(key="wf-1:1:0")
+        self.assertEqual(outbox_email.status, "pending")
+        self.assertEqual(outbox_email.attempts, 0)
+        self.assertEqual(outbox_email.error_message, "")
+        self.assertEqual(
+            {email.key for email in claim_outbox_batch(10)}, {"wf-1:1:0", "wf-1:1:1"}
+        )
+
+    def test_dispatch_outbox_batch_records_results(self):
+        self.email_service.send_email.side_effect = [
+            EmailResponse(code=202),
+            EmailServiceError("code: 500"),
+        ]
+
+        dispatch_outbox_batch(self.email_service, batch_size=10)
+
+        sent = OutboxEmail.objects.get(key="wf-1:1:0")
+        retried = OutboxEmail.objects.get(key="wf-1:1:1")
+        self.assertEqual(sent.status, "sent")
+        self.assertIsNotNone(sent.sent_at)
+        self.assertEqual(retried.status, "pending")
+        self.assertEqual(retried.attempts, 1)
+        self.assertIn("code: 500", retried.error_message)
+
+        self.email_service.send_email.side_effect = EmailServiceError("code: 500")
+        dispatch_outbox_batch(self.email_service, batch_size=10)
+
+        self.assertEqual(self.email_service.send_email.call_count, 3)
+        self.assertEqual(OutboxEmail.objects.get(key="wf-1:1:1").status, "failed")
+
+    @patch("notifications.services.outbox.close_old_connections")
+    def test_dispatch_outbox_batch_reuses_executor(self, mock_close_old_connections):
+        self.email_service.send_email.return_value = EmailResponse(code=202)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            batch = dispatch_outbox_batch(
+                self.email_service, batch_size=10, executor=executor
+            )
+
+        self.assertEqual([email.status for email in batch], ["sent", "sent"])
+        self.assertEqual(mock_close_old_connections.call_count, 4)
+
+    def test_dispatch_outbox_batch_honors_retry_after(self):
+        self.email_service.send_email.side_effect = EmailRateLimitError(120)
+
+        dispatch_outbox_batch(self.email_service, batch_size=10)
+
+        outbox_email = OutboxEmail.objects.get(key="wf-1:1:0")
+        self.assertEqual(outbox_email.status, "pending")
+        self.assertEqual(outbox_email.attempts, 0)
+        self.assertGreater(
+            (outbox_email.next_attempt_at - outbox_email.created_at).total_seconds(),
+            100,
+        )
+
+    def test_dispatch_outbox_batch_with_bulk(self):
+        self.email_service.send_bulk.return_value = [
+            EmailResponse(code=202),
+            EmailResponse(code=202),
+        ]
+
+        batch = dispatch_outbox_batch(self.email_service, batch_size=10, bulk=True)
+
+        self.assertEqual([email.status for email in batch], ["sent", "sent"])
+        self.email_service.send_email.assert_not_called()
+
+    def test_dispatch_outbox_batch_with_bulk_keeps_ambiguous_failures_sent(self):
+        self.email_service.send_bulk.side_effect = EmailDeliveryUnknownError(
+            "code: 504", 504
+        )
+
+        batch = dispatch_outbox_batch(self.email_service, batch_size=10, bulk=True)
+
+        self.assertEqual([email.status for email in batch], ["sent", "sent"])
+        self.assertIn("code: 504", batch[0].error_message)
+
+    def test_dispatch_outbox_batch_with_bulk_retries_unsent_messages(self):
+        self.email_service.send_bulk.return_value = [
+            EmailResponse(code=202, bulk_email_id="bulk1"),
+            EmailResponse(code=422, message="invalid"),
+        ]
+
+        dispatch_outbox_batch(self.email_service, batch_size=10, bulk=True)
+
+        self.assertEqual(OutboxEmail.objects.get(key="wf-1:1:0").status, "sent")
+        self.assertEqual(OutboxEmail.objects.get(key="wf-1:1:1").status, "pending")
+
+
+class TestRateLimiter(TestCase):
+    def test_acquire_within_quota(self):
+        rate_limiter = MemoryRateLimiter([(2, 60)], max_wait=0)
+
+        rate_limiter.acquire()
+        rate_limiter.acquire()
+
+        with self.assertRaises(EmailRateLimitError) as context:
+            rate_limiter.acquire()
+
+        self.assertAlmostEqual(context.exception.retry_after, 30, delta=1)
+
+    def test_block_honors_retry_after(self):
+        rate_limiter = MemoryRateLimiter([(100, 1)], max_wait=0)
+
+        rate_limiter.block(10)
+
+        with self.assertRaises(EmailRateLimitError) as context:
+            rate_limiter.acquire()
+
+        self.assertAlmostEqual(context.exception.retry_after, 10, delta=1)
+
+    def test_file_rate_limiter_is_shared(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/ratelimit.json"
+            first = FileRateLimiter([(1, 60)], path=path, max_wait=0)
+            second = FileRateLimiter([(1, 60)], path=path, max_wait=0)
+
+            first.acquire()
+
+            with self.assertRaises(EmailRateLimitError):
+                second.acquire()
+
+    def test_database_rate_limiter_is_shared(self):
+        first = DatabaseRateLimiter([(1, 60)], max_wait=0)
+        second = DatabaseRateLimiter([(1, 60)], max_wait=0)
+
+        first.acquire()
+
+        with self.assertRaises(EmailRateLimitError):
+            second.acquire()
+
+    def test_service_blocks_limiter_on_429(self):
+        server = MailerSendStubServer(requests_per_second=1)
+        server.start()
+        rate_limiter = MemoryRateLimiter([(100, 1)], max_wait=0)
+        service = PooledMailerSendService(
+            api_base=server.url,
+            session=create_http_session(1),
+            rate_limiter=rate_limiter,
+        )
+        service.rate_limit_max_wait = 0
+        email_params = EmailParams(
+            to_email=["recipient@test.com"], subject="Subject", content="Content"
+        )
+
+        try:
+            while int(time.time() % 1 * 10) > 7:
+                time.sleep(0.05)
+            service.send_email(email_params)
+
+            with self.assertRaises(EmailRateLimitError):
+                service.send_email(email_params)
+
+            self.assertEqual(server.rejected, 1)
+            with self.assertRaises(EmailRateLimitError):
+                rate_limiter.acquire()
+        finally:
+            service.close()
+            server.stop()
+
+
+class TestCircuitBreakerEmailService(TestCase):
+    def setUp(self):
+        self.primary = MagicMock()
+        self.primary.send_email.side_effect = EmailServiceError("code: 503", 503)
+        self.circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        self.email_params = EmailParams(
+            to_email=["recipient@test.com"],
+            subject="Subject",
+            content="Content",
+            cc=["copy@test.com"],
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        service = CircuitBreakerEmailService(self.primary, self.circuit_breaker)
+
+        for _ in range(2):
+            with self.assertRaises(EmailServiceError):
+                service.send_email(self.email_params)
+
+        with self.assertRaises(EmailCircuitOpenError) as context:
+            service.send_email(self.email_params)
+
+        self.assertEqual(self.primary.send_email.call_count, 2)
+        self.assertGreater(context.exception.retry_after, 50)
+
+    def test_client_errors_do_not_open_the_circuit(self):
+        self.primary.send_email.side_effect = EmailServiceError("code: 422", 422)
+        service = CircuitBreakerEmailService(self.primary, self.circuit_breaker)
+
+        for _ in range(3):
+            with self.assertRaises(EmailServiceError):
+                service.send_email(self.email_params)
+
+        self.assertEqual(self.circuit_breaker.state, "closed")
+
+    def test_half_open_trial_closes_the_circuit(self):
+        self.circuit_breaker.recovery_timeout = 0
+        service = CircuitBreakerEmailService(self.primary, self.circuit_breaker)
+
+        for _ in range(2):
+            with self.assertRaises(EmailServiceError):
+                service.send_email(self.email_params)
+
+        self.primary.send_email.side_effect = None
+        self.primary.send_email.return_value = EmailResponse(code=202)
+
+        self.assertEqual(service.send_email(self.email_params).code, 202)
+        self.assertEqual(self.circuit_breaker.state, "closed")
+
+    def test_fails_over_to_smtp(self):
+        smtp_server = SMTPStubServer()
+        smtp_server.start()
+        host, port = smtp_server.server_address[:2]
+        service = CircuitBreakerEmailService(
+            self.primary,
+            self.circuit_breaker,
+            SMTPEmailService(host=host, port=port),
+        )
+
+        try:
+            for _ in range(3):
+                self.assertEqual(service.send_email(self.email_params).code, 202)
+        finally:
+            smtp_server.stop()
+
+        self.assertEqual(self.primary.send_email.call_count, 2)
+        self.assertEqual(len(smtp_server.messages), 3)
+        self.assertEqual(
+            smtp_server.messages[0]["to"], ["recipient@test.com", "copy@test.com"]
+        )
+        self.assertIn(b"Subject: Subject", smtp_server.messages[0]["data"])
+
+    def test_ambiguous_failures_fail_over_only_when_the_circuit_is_open(self):
+        self.primary.send_email.side_effect = EmailDeliveryUnknownError(
+            "Falha na requisição ao MailerSend: read timeout"
+        )
+        secondary = MagicMock()
+        secondary.send_email.return_value = EmailResponse(code=202)
+        service = CircuitBreakerEmailService(
+            self.primary, self.circuit_breaker, secondary
+        )
+
+        for _ in range(2):
+            with self.assertRaises(EmailDeliveryUnknownError):
+                service.send_email(self.email_params)
+
+        secondary.send_email.assert_not_called()
+        self.assertEqual(service.send_email(self.email_params).code, 202)
+        secondary.send_email.assert_called_once_with(self.email_params)
+
+
+@override_settings(EMAIL_IDEMPOTENCY_LEASE=60)
+class TestIdempotentEmailService(TestCase):
+    def setUp(self):
+        self.inner = MagicMock()
+        self.inner.send_email.return_value = EmailResponse(code=202)
+        self.service = IdempotentEmailService(self.inner)
+        self.email_params = EmailParams(
+            to_email=["recipient@test.com"],
+            subject="Subject",
+            content="Content",
+            idempotency_key="wf-1:1:0",
+        )
+
+    def test_retried_send_short_circuits(self):
+        self.service.send_email(self.email_params)
+        response = self.service.send_email(self.email_params)
+
+        self.assertEqual(response.code, 202)
+        self.inner.send_email.assert_called_once()
+        self.assertEqual(SentEmail.objects.get(key="wf-1:1:0").status, "sent")
+
+    def test_failed_send_releases_key(self):
+        self.inner.send_email.side_effect = [
+            EmailServiceError("code: 503", 503),
+            EmailResponse(code=202),
+        ]
+
+        with self.assertRaises(EmailServiceError):
+            self.service.send_email(self.email_params)
+        self.service.send_email(self.email_params)
+
+        self.assertEqual(self.inner.send_email.call_count, 2)
+
+    def test_ambiguous_failure_keeps_the_claim(self):
+        self.inner.send_email.side_effect = EmailDeliveryUnknownError(
+            "Falha na requisição ao MailerSend: read timeout"
+        )
+
+        with self.assertRaises(EmailDeliveryUnknownError):
+            self.service.send_email(self.email_params)
+        with self.assertRaises(EmailSendInProgressError):
+            self.service.send_email(self.email_params)
+
+        self.inner.send_email.assert_called_once()
+        self.assertEqual(SentEmail.objects.get(key="wf-1:1:0").status, "sending")
+
+    def test_send_bulk_keeps_claims_with_unknown_status(self):
+        self.inner.send_bulk.return_value = [
+            EmailResponse(code=202, delivery_unknown=True, bulk_email_id="bulk1")
+        ]
+
+        self.service.send_bulk([self.email_params])
+
+        self.assertEqual(SentEmail.objects.get(key="wf-1:1:0").status, "sending")
+
+    def test_send_in_flight_is_not_duplicated(self):
+        SentEmail.objects.create(key="wf-1:1:0", claimed_at=timezone.now())
+
+        with self.assertRaises(EmailSendInProgressError) as context:
+            self.service.send_email(self.email_params)
+
+        self.inner.send_email.assert_not_called()
+        self.assertGreater(context.exception.retry_after, 50)
+
+    def test_stale_claim_is_resent(self):
+        SentEmail.objects.create(
+            key="wf-1:1:0", claimed_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        self.service.send_email(self.email_params)
+
+        self.inner.send_email.assert_called_once()
+
+    def test_send_bulk_skips_sent_messages(self):
+        self.service.send_email(self.email_params)
+        self.inner.send_bulk.return_value = [EmailResponse(code=422)]
+        other = EmailParams(
+            to_email=["other@test.com"],
+            subject="Subject",
+            content="Content",
+            idempotency_key="wf-1:1:1",
+        )
+
+        responses = self.service.send_bulk([self.email_params, other])
+
+        self.assertEqual([response.code for response in responses], [202, 422])
+        self.inner.send_bulk.assert_called_once_with([other])
+        self.assertFalse(SentEmail.objects.filter(key="wf-1:1:1").exists())
+
+
+class TestEmailRetention(TestCase):
+    def setUp(self):
+        old = timezone.now() - timedelta(days=40)
+        SentEmail.objects.create(
+            key="old-sent", status="sent", claimed_at=old, sent_at=old
+        )
+        SentEmail.objects.create(key="old-claim", claimed_at=old)
+        SentEmail.objects.create(
+            key="new-sent",
+            status="sent",
+            claimed_at=timezone.now(),
+            sent_at=timezone.now(),
+        )
+        for key, status in [
+            ("old-sent", "sent"),
+            ("old-failed", "failed"),
+            ("old-pending", "pending"),
+            ("new-sent", "sent"),
+        ]:
+            OutboxEmail.objects.create(key=key, payload={}, status=status)
+        OutboxEmail.objects.filter(key__startswith="old-").update(created_at=old)
+
+    @override_settings(EMAIL_RETENTION_DAYS=30)
+    def test_prune_removes_records_past_retention(self):
+        stdout = StringIO()
+
+        call_command("pruneemails", stdout=stdout)
+
+        self.assertEqual(
+            set(SentEmail.objects.values_list("key", flat=True)), {"new-sent"}
+        )
+        self.assertEqual(
+            set(OutboxEmail.objects.values_list("key", flat=True)),
+            {"old-pending", "new-sent"},
+        )
+        self.assertIn(
+            "Pruned 2 sent email records and 2 outbox emails", stdout.getvalue()
+        )
+
+    def test_prune_honors_days_option(self):
+        call_command("pruneemails", days=60, stdout=StringIO())
+
+        self.assertEqual(SentEmail.objects.count(), 3)
+        self.assertEqual(OutboxEmail.objects.count(), 4)
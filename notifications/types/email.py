@@ -11,9 +11,13 @@ class EmailParams:
     from_name: Optional[str] = None
     from_email: Optional[str] = None
     cc: Optional[List[str]] = None
+    idempotency_key: Optional[str] = None
 
 
 @dataclass
 class EmailResponse:
     code: int
     message: Optional[str] = None
+    retry_after: Optional[float] = None
+    delivery_unknown: bool = False
+    bulk_email_id: Optional[str] = None
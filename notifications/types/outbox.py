@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from .email import EmailParams
+
+
+@dataclass
+class OutboxEmailParams:
+    key: str
+    email_params: EmailParams
+    workflow_id: str = ""
+
+
+@dataclass
+class OutboxResult:
+    key: str
+    status: str
+    error_message: Optional[str] = None
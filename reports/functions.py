@@ -0,0 +1,50 @@
+import math
+from typing import List, Optional
+
+from django.db.models import Aggregate, DurationField
+
+
+class Percentile(Aggregate):
+    function = "PERCENTILE_CONT"
+    name = "Percentile"
+    output_field = DurationField()
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+
+    def __init__(self, expression, percentile: float, **extra):
+        if not 0 <= percentile <= 1:
+            raise ValueError("percentile must be between 0 and 1")
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            function="percentile_cont",
+            template="%(function)s(%(expressions)s, %(percentile)s)",
+            **extra_context,
+        )
+
+
+class PercentileCont:
+    def __init__(self):
+        self.values: List[float] = []
+        self.percentile = 0.0
+
+    def step(self, value: Optional[float], percentile: float) -> None:
+        self.percentile = percentile
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self) -> Optional[float]:
+        if not self.values:
+            return None
+
+        values = sorted(self.values)
+        position = (len(values) - 1) * self.percentile
+        lower, upper = math.floor(position), math.ceil(position)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def register_sqlite_functions(sender, connection, **kwargs) -> None:
+    if connection.vendor == "sqlite":
+        connection.connection.create_aggregate("percentile_cont", 2, PercentileCont)
@@ -0,0 +1,57 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...services.formart_report import format_report_as_html
+from ...types.report import EmailDeliveryReport, EmailStats
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks HTML rendering of email delivery reports with an "
+        "increasing number of recipient rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, nargs="+", default=[100, 1000, 5000, 20000]
+        )
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def _build_report(self, rows: int) -> EmailDeliveryReport:
+        now = timezone.now()
+        return EmailDeliveryReport(
+            user_email="usuario@empresa.com.br",
+            period_start=now - timedelta(days=30),
+            period_end=now,
+            stats=EmailStats(
+                total_sent=rows * 10,
+                successful_deliveries=rows * 9,
+                failed_deliveries=rows,
+                total_recipients=rows * 30,
+                unique_recipients=rows,
+                average_delivery_time=1.25,
+            ),
+            most_common_recipients=[
+                {"email": f"destinatario{index}@empresa.com.br", "count": rows - index}
+                for index in range(rows)
+            ],
+        )
+
+    def handle(self, *args, **options):
+        format_report_as_html(self._build_report(1))
+
+        for rows in options["rows"]:
+            report = self._build_report(rows)
+            started = time.perf_counter()
+
+            for _ in range(options["iterations"]):
+                html = format_report_as_html(report)
+
+            elapsed = (time.perf_counter() - started) / options["iterations"]
+            self.stdout.write(
+                f"rows={rows:<6} render={elapsed * 1000:.2f}ms "
+                f"per_row={elapsed / rows * 1e6:.2f}us size={len(html)}B"
+            )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ...services.rollup import rebuild_email_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the hourly email report rollups from the task execution "
+        "history. Run it once after deploying the rollup tables."
+    )
+
+    def handle(self, *args, **options):
+        buckets = rebuild_email_rollups()
+        self.stdout.write(f"Rebuilt {buckets} hourly rollup buckets")
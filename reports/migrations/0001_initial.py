@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-18 20:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailHourlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField()),
+                ("sent", models.IntegerField(default=0)),
+                ("successful", models.IntegerField(default=0)),
+                ("failed", models.IntegerField(default=0)),
+                ("recipients", models.IntegerField(default=0)),
+                ("duration_sum", models.FloatField(default=0.0)),
+                ("duration_count", models.IntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="email_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "hour"), name="email_rollup_user_hour_unique"
+                    )
+                ],
+            },
+        ),
+    ]
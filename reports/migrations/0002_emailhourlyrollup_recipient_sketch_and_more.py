@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emailhourlyrollup",
+            name="recipient_sketch",
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.AddField(
+            model_name="emailhourlyrollup",
+            name="top_recipients",
+            field=models.JSONField(default=dict),
+        ),
+    ]
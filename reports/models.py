@@ -0,0 +1,28 @@
+from django.db import models
+
+from users.models import User
+
+
+class EmailHourlyRollup(models.Model):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="email_rollups"
+    )
+    hour = models.DateTimeField()
+    sent = models.IntegerField(default=0)
+    successful = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    recipients = models.IntegerField(default=0)
+    duration_sum = models.FloatField(default=0.0)
+    duration_count = models.IntegerField(default=0)
+    recipient_sketch = models.BinaryField(default=bytes)
+    top_recipients = models.JSONField(default=dict)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "hour"], name="email_rollup_user_hour_unique"
+            )
+        ]
+
+    def __str__(self):
+        return f"Email rollup {self.user_id} @ {self.hour:%Y-%m-%d %H:00}"
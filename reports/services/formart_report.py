@@ -1,60 +1,186 @@
-from ..types.report import EmailDeliveryReport
+from html import escape
+from io import StringIO
+
+from ..types.report import EmailDeliveryReport, ExecutionPerformanceReport
+
+REPORT_HEADER = """<html>
+<head>
+    <style>
+        body {{ font-family: Arial, sans-serif; }}
+        .report {{ max-width: 800px; margin: 0 auto; padding: 20px; }}
+        .stats {{ margin-bottom: 20px; }}
+        table {{ width: 100%; border-collapse: collapse; }}
+        th, td {{ padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }}
+        th {{ background-color: #f2f2f2; }}
+    </style>
+</head>
+<body>
+    <div class="report">
+        <h2>Relatório de Envio de Emails</h2>
+        <p>Usuário: {user_email}</p>
+        <p>Período: {period_start} até {period_end}</p>
+
+        <div class="stats">
+            <h3>Estatísticas</h3>
+            <ul>
+                <li>Total de Emails Enviados: {total_sent}</li>
+                <li>Entregas Bem-sucedidas: {successful_deliveries}</li>
+                <li>Entregas Falhas: {failed_deliveries}</li>
+                <li>Total de Destinatários: {total_recipients}</li>
+                <li>Destinatários Únicos: {unique_recipients}</li>
+                <li>Tempo Médio de Entrega: {average_delivery_time} segundos</li>
+            </ul>
+        </div>
+
+        <div class="recipients">
+            <h3>Destinatários Mais Comuns</h3>
+            <table>
+                <tr>
+                    <th>Email</th>
+                    <th>Quantidade</th>
+                </tr>
+""".format
+
+REPORT_ROW = """                <tr>
+                    <td>{}</td>
+                    <td>{}</td>
+                </tr>
+""".format
+
+REPORT_FOOTER = """            </table>
+        </div>
+    </div>
+</body>
+</html>
+"""
 
 
 def format_report_as_html(report: EmailDeliveryReport) -> str:
-    html = f"""
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; }}
-            .report {{ max-width: 800px; margin: 0 auto; padding: 20px; }}
-            .stats {{ margin-bottom: 20px; }}
-            table {{ width: 100%; border-collapse: collapse; }}
-            th, td {{ padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }}
-            th {{ background-color: #f2f2f2; }}
-        </style>
-    </head>
-    <body>
-        <div class="report">
-            <h2>Relatório de Envio de Emails</h2>
-            <p>Usuário: {report.user_email}</p>
-            <p>Período: {report.period_start.strftime('%d-%m-%Y %H:%M')} até {report.period_end.strftime('%d-%m-%Y %H:%M')}</p>
-            
-            <div class="stats">
-                <h3>Estatísticas</h3>
-                <ul>
-                    <li>Total de Emails Enviados: {report.stats.total_sent}</li>
-                    <li>Entregas Bem-sucedidas: {report.stats.successful_deliveries}</li>
-                    <li>Entregas Falhas: {report.stats.failed_deliveries}</li>
-                    <li>Total de Destinatários: {report.stats.total_recipients}</li>
-                    <li>Destinatários Únicos: {report.stats.unique_recipients}</li>
-                    <li>Tempo Médio de Entrega: {report.stats.average_delivery_time} segundos</li>
-                </ul>
-            </div>
-            
-            <div class="recipients">
-                <h3>Destinatários Mais Comuns</h3>
-                <table>
-                    <tr>
-                        <th>Email</th>
-                        <th>Quantidade</th>
-                    </tr>
-    """
+    buffer = StringIO()
+    buffer.write(
+        REPORT_HEADER(
+            user_email=escape(report.user_email),
+            period_start=report.period_start.strftime("%d-%m-%Y %H:%M"),
+            period_end=report.period_end.strftime("%d-%m-%Y %H:%M"),
+            total_sent=report.stats.total_sent,
+            successful_deliveries=report.stats.successful_deliveries,
+            failed_deliveries=report.stats.failed_deliveries,
+            total_recipients=report.stats.total_recipients,
+            unique_recipients=report.stats.unique_recipients,
+            average_delivery_time=report.stats.average_delivery_time,
+        )
+    )
 
     for recipient in report.most_common_recipients:
-        html += f"""
-                    <tr>
-                        <td>{recipient['email']}</td>
-                        <td>{recipient['count']}</td>
-                    </tr>
-        """
-
-    html += """
-                </table>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+        buffer.write(REPORT_ROW(escape(recipient["email"]), int(recipient["count"])))
+
+    buffer.write(REPORT_FOOTER)
+    return buffer.getvalue()
+
+
+PERFORMANCE_REPORT_HEADER = """<html>
+<head>
+    <style>
+        body {{ font-family: Arial, sans-serif; }}
+        .report {{ max-width: 800px; margin: 0 auto; padding: 20px; }}
+        table {{ width: 100%; border-collapse: collapse; margin-bottom: 20px; }}
+        th, td {{ padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }}
+        th {{ background-color: #f2f2f2; }}
+    </style>
+</head>
+<body>
+    <div class="report">
+        <h2>Relatório de Desempenho das Execuções</h2>
+        <p>Usuário: {user_email}</p>
+        <p>Período: {period_start} até {period_end}</p>
+
+        <h3>Latências (segundos)</h3>
+        <table>
+            <tr>
+                <th>Métrica</th>
+                <th>p50</th>
+                <th>p95</th>
+                <th>p99</th>
+            </tr>
+""".format
+
+PERFORMANCE_LATENCY_ROW = """            <tr>
+                <td>{}</td>
+                <td>{}</td>
+                <td>{}</td>
+                <td>{}</td>
+            </tr>
+""".format
+
+PERFORMANCE_GROUP_HEADER = """        </table>
+
+        <h3>{}</h3>
+        <table>
+            <tr>
+                <th>Nome</th>
+                <th>Total</th>
+                <th>Falhas</th>
+                <th>Taxa de Falha</th>
+                <th>p50 (s)</th>
+                <th>p95 (s)</th>
+                <th>p99 (s)</th>
+            </tr>
+""".format
+
+PERFORMANCE_GROUP_ROW = """            <tr>
+                <td>{}</td>
+                <td>{}</td>
+                <td>{}</td>
+                <td>{:.2%}</td>
+                <td>{}</td>
+                <td>{}</td>
+                <td>{}</td>
+            </tr>
+""".format
+
+PERFORMANCE_REPORT_FOOTER = """        </table>
+    </div>
+</body>
+</html>
+"""
+
+
+def format_performance_report_as_html(report: ExecutionPerformanceReport) -> str:
+    buffer = StringIO()
+    buffer.write(
+        PERFORMANCE_REPORT_HEADER(
+            user_email=escape(report.user_email),
+            period_start=report.period_start.strftime("%d-%m-%Y %H:%M"),
+            period_end=report.period_end.strftime("%d-%m-%Y %H:%M"),
+        )
+    )
+
+    for name, latency in (
+        ("Duração das tarefas", report.task_durations),
+        ("Duração das execuções", report.execution_durations),
+        ("Atraso na fila", report.queue_delay),
+    ):
+        buffer.write(
+            PERFORMANCE_LATENCY_ROW(name, latency.p50, latency.p95, latency.p99)
+        )
+
+    for title, groups in (
+        ("Por Workflow", report.by_workflow),
+        ("Por Tipo de Tarefa", report.by_task_type),
+    ):
+        buffer.write(PERFORMANCE_GROUP_HEADER(title))
+        for group in groups:
+            buffer.write(
+                PERFORMANCE_GROUP_ROW(
+                    escape(group.name),
+                    group.total,
+                    group.failed,
+                    group.failure_rate,
+                    group.duration.p50,
+                    group.duration.p95,
+                    group.duration.p99,
+                )
+            )
 
-    return html
+    buffer.write(PERFORMANCE_REPORT_FOOTER)
+    return buffer.getvalue()
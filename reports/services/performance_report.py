@@ -0,0 +1,129 @@
+from datetime import timedelta
+from typing import Any, Dict, List
+
+from django.db.models import (
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Min,
+    Q,
+    QuerySet,
+)
+
+from executions.models import Execution, TaskExecution
+from reports.functions import Percentile
+from reports.services.report_generator import get_date_range
+from reports.types.report import (
+    ExecutionPerformanceReport,
+    LatencyPercentiles,
+    PerformanceGroup,
+    ReportParams,
+)
+from users.models import User
+
+PERCENTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+
+
+def _percentiles(expression) -> Dict[str, Percentile]:
+    return {
+        name: Percentile(expression, percentile)
+        for name, percentile in PERCENTILES.items()
+    }
+
+
+def _duration():
+    return ExpressionWrapper(
+        F("completed_at") - F("started_at"), output_field=DurationField()
+    )
+
+
+def _to_percentiles(row: Dict[str, Any]) -> LatencyPercentiles:
+    return LatencyPercentiles(
+        **{
+            name: round(row[name].total_seconds(), 3) if row[name] else 0.0
+            for name in PERCENTILES
+        }
+    )
+
+
+def _to_group(name: str, row: Dict[str, Any]) -> PerformanceGroup:
+    return PerformanceGroup(
+        name=name,
+        total=row["total"],
+        failed=row["failed"],
+        failure_rate=round(row["failed"] / row["total"], 4) if row["total"] else 0.0,
+        duration=_to_percentiles(row),
+    )
+
+
+class ExecutionPerformanceReportGenerator:
+    def _group_stats(self, queryset: QuerySet, *fields: str) -> QuerySet:
+        return (
+            queryset.order_by()
+            .values(*fields)
+            .annotate(
+                total=Count("id"),
+                failed=Count("id", filter=Q(status="failed")),
+                **_percentiles(_duration()),
+            )
+            .order_by(*fields)
+        )
+
+    def _queue_delay(self, executions: QuerySet) -> LatencyPercentiles:
+        delays = (
+            executions.filter(queued_at__isnull=False, workflow__schedule__isnull=True)
+            .annotate(first_task_started_at=Min("task_executions__started_at"))
+            .filter(first_task_started_at__isnull=False)
+            .annotate(
+                queue_delay=ExpressionWrapper(
+                    F("first_task_started_at")
+                    - F("queued_at")
+                    - ExpressionWrapper(
+                        F("workflow__delay_minutes") * timedelta(minutes=1),
+                        output_field=DurationField(),
+                    ),
+                    output_field=DurationField(),
+                )
+            )
+        )
+        return _to_percentiles(delays.aggregate(**_percentiles("queue_delay")))
+
+    def generate_report(self, params: ReportParams) -> ExecutionPerformanceReport:
+        try:
+            user = User.objects.get(id=params.user_id)
+        except User.DoesNotExist:
+            raise ValueError(f"User with id {params.user_id} not found")
+
+        start_date, end_date = get_date_range(params.filter_type)
+
+        executions = Execution.objects.filter(
+            created_by=user, started_at__range=(start_date, end_date)
+        )
+        task_executions = TaskExecution.objects.filter(
+            task__created_by=user, started_at__range=(start_date, end_date)
+        )
+
+        by_workflow: List[PerformanceGroup] = [
+            _to_group(row["workflow__name"], row)
+            for row in self._group_stats(executions, "workflow__name", "workflow_id")
+        ]
+        by_task_type: List[PerformanceGroup] = [
+            _to_group(row["task__task_type"], row)
+            for row in self._group_stats(task_executions, "task__task_type")
+        ]
+
+        return ExecutionPerformanceReport(
+            user_email=user.email,
+            period_start=start_date,
+            period_end=end_date,
+            task_durations=_to_percentiles(
+                task_executions.aggregate(**_percentiles(_duration()))
+            ),
+            execution_durations=_to_percentiles(
+                executions.aggregate(**_percentiles(_duration()))
+            ),
+            queue_delay=self._queue_delay(executions),
+            by_workflow=by_workflow,
+            by_task_type=by_task_type,
+        )
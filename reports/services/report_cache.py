@@ -0,0 +1,70 @@
+import time
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+from ..types.report import EmailDeliveryReport, ReportParams
+
+
+class ReportCache:
+    def __init__(
+        self,
+        cache: BaseCache,
+        bucket_seconds: int,
+        lock_timeout: float,
+        poll_interval: float = 0.1,
+    ):
+        self.cache = cache
+        self.bucket_seconds = bucket_seconds
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+
+    def get_key(self, params: ReportParams, variant: str) -> str:
+        bucket = int(time.time() // self.bucket_seconds)
+        return (
+            f"reports:email-delivery:{params.user_id}:{params.filter_type}:"
+            f"{variant}:{bucket}"
+        )
+
+    def _wait_for(self, key: str) -> Optional[EmailDeliveryReport]:
+        deadline = time.monotonic() + self.lock_timeout
+
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            report = self.cache.get(key)
+            if report is not None:
+                return report
+
+        return None
+
+    def get_or_build(
+        self, key: str, build: Callable[[], EmailDeliveryReport]
+    ) -> EmailDeliveryReport:
+        report = self.cache.get(key)
+        if report is not None:
+            return report
+
+        lock_key = f"{key}:lock"
+        locked = self.cache.add(lock_key, True, self.lock_timeout)
+
+        if not locked:
+            report = self._wait_for(key)
+            if report is not None:
+                return report
+
+        try:
+            report = build()
+            self.cache.set(key, report, self.bucket_seconds)
+            return report
+        finally:
+            if locked:
+                self.cache.delete(lock_key)
+
+
+def get_report_cache() -> ReportCache:
+    return ReportCache(
+        caches[settings.REPORT_CACHE_ALIAS],
+        settings.REPORT_CACHE_BUCKET,
+        settings.REPORT_CACHE_LOCK_TIMEOUT,
+    )
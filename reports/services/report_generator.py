@@ -1,113 +1,239 @@
 from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import (
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Q,
+    QuerySet,
+    Sum,
+)
 from django.utils import timezone
 
 from executions.models import TaskExecution
+from reports.models import EmailHourlyRollup
+from reports.services.report_cache import get_report_cache
+from reports.services.rollup import (
+    TERMINAL_STATUSES,
+    ceil_hour,
+    floor_hour,
+    recipients_snapshot,
+    split_recipients,
+)
+from reports.sketches import HyperLogLog, MisraGries
 from reports.types.report import EmailDeliveryReport, EmailStats, ReportParams
 from users.models import User
 
+REPORT_CHUNK_SIZE = 2000
 
-class EmailReportGenerator:
-    @staticmethod
-    def _get_date_range(filter_type: str) -> Tuple[datetime, datetime]:
-        end_date = timezone.now()
-
-        if filter_type == "last_hour":
-            start_date = end_date - timedelta(hours=1)
-        elif filter_type == "last_day":
-            start_date = end_date - timedelta(days=1)
-        elif filter_type == "last_week":
-            start_date = end_date - timedelta(weeks=1)
-        elif filter_type == "last_month":
-            start_date = end_date - timedelta(days=30)
-        else:
-            raise ValueError(f"Invalid filter type: {filter_type}")
 
-        return start_date, end_date
+def get_date_range(filter_type: str) -> Tuple[datetime, datetime]:
+    end_date = timezone.now()
 
-    def _get_email_stats(self, executions: List[TaskExecution]) -> EmailStats:
-        total_sent = len(executions)
-        successful = sum(1 for e in executions if e.status == "completed")
-        failed = sum(1 for e in executions if e.status == "failed")
+    if filter_type == "last_hour":
+        start_date = end_date - timedelta(hours=1)
+    elif filter_type == "last_day":
+        start_date = end_date - timedelta(days=1)
+    elif filter_type == "last_week":
+        start_date = end_date - timedelta(weeks=1)
+    elif filter_type == "last_month":
+        start_date = end_date - timedelta(days=30)
+    else:
+        raise ValueError(f"Invalid filter type: {filter_type}")
 
-        all_recipients = []
-        unique_recipients = set()
+    return start_date, end_date
 
-        for execution in executions:
-            email_task = execution.task.email_config
-            recipients = email_task.get_recipients_list()
-            cc_list = email_task.get_cc_list()
 
-            all_recipients.extend(recipients)
-            all_recipients.extend(cc_list)
-            unique_recipients.update(recipients)
-            unique_recipients.update(cc_list)
+class EmailReportGenerator:
+    def __init__(self, approximate: Optional[bool] = None):
+        self.approximate = (
+            settings.REPORT_APPROXIMATE_RECIPIENTS
+            if approximate is None
+            else approximate
+        )
 
-        avg_delivery_time = (
-            sum(
-                e.execution_time() for e in executions if e.execution_time() is not None
+    def _aggregate_executions(
+        self, executions: QuerySet, count_recipients: bool = True
+    ) -> Dict[str, Any]:
+        stats = executions.aggregate(
+            sent=Count("id"),
+            successful=Count("id", filter=Q(status="completed")),
+            failed=Count("id", filter=Q(status="failed")),
+            duration_count=Count("completed_at"),
+            duration_sum=Sum(
+                ExpressionWrapper(
+                    F("completed_at") - F("started_at"),
+                    output_field=DurationField(),
+                )
+            ),
+        )
+        stats["duration_sum"] = (
+            stats["duration_sum"].total_seconds() if stats["duration_sum"] else 0.0
+        )
+        stats["recipients"] = (
+            self._total_recipients(executions) if count_recipients else 0
+        )
+        return stats
+
+    def _aggregate_rollups(
+        self, user: User, start_hour: datetime, end_hour: datetime
+    ) -> Dict[str, Any]:
+        stats = EmailHourlyRollup.objects.filter(
+            user=user, hour__gte=start_hour, hour__lt=end_hour
+        ).aggregate(
+            sent=Sum("sent"),
+            successful=Sum("successful"),
+            failed=Sum("failed"),
+            recipients=Sum("recipients"),
+            duration_count=Sum("duration_count"),
+            duration_sum=Sum("duration_sum"),
+        )
+        return {field: value or 0 for field, value in stats.items()}
+
+    def _get_email_stats(
+        self,
+        user: User,
+        executions: QuerySet,
+        start_date: datetime,
+        end_date: datetime,
+        total_recipients: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        start_hour, end_hour = ceil_hour(start_date), floor_hour(end_date)
+
+        if start_hour >= end_hour:
+            stats = self._aggregate_executions(
+                executions, count_recipients=total_recipients is None
             )
-            / len([e for e in executions if e.execution_time() is not None])
-            if executions
-            else 0.0
+            if total_recipients is not None:
+                stats["recipients"] = total_recipients
+            return stats
+
+        stats = self._aggregate_rollups(user, start_hour, end_hour)
+        edges = self._aggregate_executions(
+            self._edge_executions(executions, start_hour, end_hour)
+        )
+        return {field: value + edges[field] for field, value in stats.items()}
+
+    @staticmethod
+    def _edge_executions(
+        executions: QuerySet, start_hour: datetime, end_hour: datetime
+    ) -> QuerySet:
+        return executions.filter(
+            Q(started_at__lt=start_hour) | Q(started_at__gte=end_hour)
+        )
+
+    def _recipient_rows(self, executions: QuerySet) -> Iterator[Tuple[List[str], int]]:
+        recipients_by_snapshot = (
+            executions.order_by()
+            .values(snapshot=recipients_snapshot())
+            .annotate(executions=Count("id"))
         )
 
-        return EmailStats(
-            total_sent=total_sent,
-            successful_deliveries=successful,
-            failed_deliveries=failed,
-            total_recipients=len(all_recipients),
-            unique_recipients=len(unique_recipients),
-            average_delivery_time=round(avg_delivery_time, 2),
+        for row in recipients_by_snapshot.iterator(chunk_size=REPORT_CHUNK_SIZE):
+            yield split_recipients(row["snapshot"], None), row["executions"]
+
+    def _total_recipients(self, executions: QuerySet) -> int:
+        return sum(
+            len(recipients) * executions_count
+            for recipients, executions_count in self._recipient_rows(executions)
         )
 
-    def _get_most_common_recipients(
-        self, executions: List[TaskExecution], limit: int = 10
-    ) -> List[Dict[str, int]]:
-        all_recipients = []
+    def _count_recipients(self, executions: QuerySet) -> Counter:
+        counter = Counter()
+
+        for recipients, executions_count in self._recipient_rows(executions):
+            for email in recipients:
+                counter[email] += executions_count
+
+        return counter
+
+    def _estimate_recipients(
+        self, user: User, executions: QuerySet, start_date: datetime, end_date: datetime
+    ) -> Tuple[int, List[Tuple[str, int]]]:
+        unique_recipients = HyperLogLog()
+        top_recipients = MisraGries()
+        start_hour, end_hour = ceil_hour(start_date), floor_hour(end_date)
+
+        if start_hour < end_hour:
+            sketches = EmailHourlyRollup.objects.filter(
+                user=user, hour__gte=start_hour, hour__lt=end_hour
+            ).values_list("recipient_sketch", "top_recipients")
+
+            for recipient_sketch, counters in sketches.iterator(
+                chunk_size=REPORT_CHUNK_SIZE
+            ):
+                unique_recipients.merge(HyperLogLog.from_bytes(recipient_sketch))
+                top_recipients.merge(MisraGries(counters=counters))
+
+            executions = self._edge_executions(executions, start_hour, end_hour)
 
-        for execution in executions:
-            email_task = execution.task.email_config
-            recipients = email_task.get_recipients_list()
-            cc_list = email_task.get_cc_list()
-            all_recipients.extend(recipients)
-            all_recipients.extend(cc_list)
+        for recipients, executions_count in self._recipient_rows(executions):
+            for email in recipients:
+                unique_recipients.add(email)
+                top_recipients.add(email, executions_count)
 
-        counter = Counter(all_recipients)
-        return [
-            {"email": email, "count": count}
-            for email, count in counter.most_common(limit)
-        ]
+        return unique_recipients.estimate(), top_recipients.most_common(10)
 
     def generate_report(self, params: ReportParams) -> EmailDeliveryReport:
+        if not settings.REPORT_CACHE_BUCKET:
+            return self._build_report(params)
+
+        report_cache = get_report_cache()
+        variant = "approximate" if self.approximate else "exact"
+        return report_cache.get_or_build(
+            report_cache.get_key(params, variant),
+            lambda: self._build_report(params),
+        )
+
+    def _build_report(self, params: ReportParams) -> EmailDeliveryReport:
         try:
             user = User.objects.get(id=params.user_id)
         except User.DoesNotExist:
             raise ValueError(f"User with id {params.user_id} not found")
 
-        start_date, end_date = self._get_date_range(params.filter_type)
+        start_date, end_date = get_date_range(params.filter_type)
 
-        executions = (
-            TaskExecution.objects.filter(
-                task__created_by=user,
-                task__task_type="email",
-                started_at__range=(start_date, end_date),
-            )
-            .select_related("task__email_config")
-            .order_by("-started_at")
+        executions = TaskExecution.objects.filter(
+            task__created_by=user,
+            task__task_type="email",
+            status__in=TERMINAL_STATUSES,
+            started_at__range=(start_date, end_date),
         )
 
-        executions_list = list(executions)
-
-        stats = self._get_email_stats(executions_list)
-        most_common = self._get_most_common_recipients(executions_list)
+        if self.approximate:
+            stats = self._get_email_stats(user, executions, start_date, end_date)
+            unique_recipients, most_common = self._estimate_recipients(
+                user, executions, start_date, end_date
+            )
+        else:
+            recipients = self._count_recipients(executions)
+            stats = self._get_email_stats(
+                user, executions, start_date, end_date, sum(recipients.values())
+            )
+            unique_recipients = len(recipients)
+            most_common = recipients.most_common(10)
 
         return EmailDeliveryReport(
             user_email=user.email,
             period_start=start_date,
             period_end=end_date,
-            stats=stats,
-            most_common_recipients=most_common,
+            stats=EmailStats(
+                total_sent=stats["sent"],
+                successful_deliveries=stats["successful"],
+                failed_deliveries=stats["failed"],
+                total_recipients=stats["recipients"],
+                unique_recipients=unique_recipients,
+                average_delivery_time=(
+                    round(stats["duration_sum"] / stats["duration_count"], 2)
+                    if stats["duration_count"]
+                    else 0.0
+                ),
+            ),
+            most_common_recipients=[
+                {"email": email, "count": count} for email, count in most_common
+            ],
         )
@@ -0,0 +1,224 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    TextField,
+    Value,
+)
+from django.db.models.functions import Coalesce, Concat, TruncHour
+
+from executions.models import TaskExecution
+from workflows.models import EmailTask
+from ..models import EmailHourlyRollup
+from ..sketches import HyperLogLog, MisraGries
+
+TERMINAL_STATUSES = ("completed", "failed")
+ROLLUP_CHUNK_SIZE = 2000
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(value: datetime) -> datetime:
+    hour = floor_hour(value)
+    return hour if hour == value else hour + timedelta(hours=1)
+
+
+def split_recipients(recipients: Optional[str], cc: Optional[str]) -> List[str]:
+    return [
+        email.strip()
+        for email in f"{recipients or ''},{cc or ''}".split(",")
+        if email.strip()
+    ]
+
+
+def recipients_snapshot():
+    return Coalesce(
+        F("recipients"),
+        Concat(
+            F("task__email_config__recipients"),
+            Value(","),
+            F("task__email_config__cc"),
+        ),
+        output_field=TextField(),
+    )
+
+
+def snapshot_recipients(task_executions: QuerySet) -> int:
+    return task_executions.filter(recipients__isnull=True).update(
+        recipients=Subquery(
+            EmailTask.objects.filter(task_id=OuterRef("task_id"))
+            .annotate(
+                snapshot=Concat(
+                    F("recipients"), Value(","), F("cc"), output_field=TextField()
+                )
+            )
+            .values("snapshot")[:1]
+        )
+    )
+
+
+def _task_execution_values(
+    task_execution: TaskExecution, recipients: List[str]
+) -> Dict[str, float]:
+    duration = task_execution.execution_time()
+    return {
+        "sent": 1,
+        "successful": int(task_execution.status == "completed"),
+        "failed": int(task_execution.status == "failed"),
+        "recipients": len(recipients),
+        "duration_sum": duration or 0.0,
+        "duration_count": int(duration is not None),
+    }
+
+
+def _is_rolled_up(task_execution: TaskExecution) -> bool:
+    return (
+        task_execution.status in TERMINAL_STATUSES
+        and task_execution.started_at is not None
+        and task_execution.task.task_type == "email"
+    )
+
+
+def _apply(task_execution: TaskExecution, recipients: List[str], sign: int) -> None:
+    values = _task_execution_values(task_execution, recipients)
+    user_id = task_execution.task.created_by_id
+    hour = floor_hour(task_execution.started_at)
+
+    with transaction.atomic():
+        if sign > 0:
+            EmailHourlyRollup.objects.get_or_create(user_id=user_id, hour=hour)
+        rollup = (
+            EmailHourlyRollup.objects.select_for_update()
+            .filter(user_id=user_id, hour=hour)
+            .first()
+        )
+        if rollup is None:
+            return
+
+        unique_recipients = HyperLogLog.from_bytes(rollup.recipient_sketch)
+        top_recipients = MisraGries(counters=rollup.top_recipients)
+
+        for email in recipients:
+            if sign > 0:
+                unique_recipients.add(email)
+                top_recipients.add(email)
+            else:
+                top_recipients.remove(email)
+
+        EmailHourlyRollup.objects.filter(pk=rollup.pk).update(
+            recipient_sketch=unique_recipients.to_bytes(),
+            top_recipients=top_recipients.counters,
+            **{field: F(field) + sign * value for field, value in values.items()},
+        )
+
+
+def add_to_rollup(task_execution: TaskExecution) -> None:
+    if not _is_rolled_up(task_execution):
+        return
+
+    recipients = split_recipients(
+        *EmailTask.objects.filter(task_id=task_execution.task_id)
+        .values_list("recipients", "cc")
+        .first()
+        or (None, None)
+    )
+    task_execution.recipients = ",".join(recipients)
+    TaskExecution.objects.filter(pk=task_execution.pk).update(
+        recipients=task_execution.recipients
+    )
+    _apply(task_execution, recipients, 1)
+
+
+def remove_from_rollup(task_execution: TaskExecution) -> None:
+    if task_execution.recipients is None or not _is_rolled_up(task_execution):
+        return
+
+    _apply(task_execution, split_recipients(task_execution.recipients, None), -1)
+
+
+def _build_rollup(
+    user_id: int, hour: datetime, rows: Iterable[dict]
+) -> EmailHourlyRollup:
+    rollup = EmailHourlyRollup(user_id=user_id, hour=hour)
+    unique_recipients = HyperLogLog()
+    top_recipients = MisraGries()
+
+    for row in rows:
+        recipients = split_recipients(row["recipients"], None)
+        rollup.sent += row["executions"]
+        rollup.successful += row["successful"]
+        rollup.failed += row["executions"] - row["successful"]
+        rollup.recipients += row["executions"] * len(recipients)
+        rollup.duration_count += row["durations"]
+        if row["duration_sum"] is not None:
+            rollup.duration_sum += row["duration_sum"].total_seconds()
+
+        for email in recipients:
+            unique_recipients.add(email)
+            top_recipients.add(email, row["executions"])
+
+    rollup.recipient_sketch = unique_recipients.to_bytes()
+    rollup.top_recipients = top_recipients.counters
+    return rollup
+
+
+def rebuild_email_rollups() -> int:
+    task_executions = TaskExecution.objects.filter(
+        task__task_type="email",
+        status__in=TERMINAL_STATUSES,
+        started_at__isnull=False,
+    )
+    rows = (
+        task_executions.order_by()
+        .values(
+            "recipients",
+            user_id=F("task__created_by_id"),
+            hour=TruncHour("started_at", tzinfo=dt_timezone.utc),
+        )
+        .annotate(
+            executions=Count("id"),
+            successful=Count("id", filter=Q(status="completed")),
+            durations=Count("completed_at"),
+            duration_sum=Sum(
+                ExpressionWrapper(
+                    F("completed_at") - F("started_at"),
+                    output_field=DurationField(),
+                )
+            ),
+        )
+        .order_by("user_id", "hour")
+    )
+    buckets = 0
+
+    with transaction.atomic():
+        snapshot_recipients(task_executions)
+        EmailHourlyRollup.objects.all().delete()
+        pending = []
+
+        for (user_id, hour), bucket_rows in groupby(
+            rows.iterator(chunk_size=ROLLUP_CHUNK_SIZE),
+            key=lambda row: (row["user_id"], row["hour"]),
+        ):
+            pending.append(_build_rollup(user_id, hour, bucket_rows))
+            buckets += 1
+
+            if len(pending) >= ROLLUP_CHUNK_SIZE:
+                EmailHourlyRollup.objects.bulk_create(pending)
+                pending = []
+
+        EmailHourlyRollup.objects.bulk_create(pending)
+
+    return buckets
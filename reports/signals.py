@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from executions.models import TaskExecution
+from .services.rollup import remove_from_rollup
+
+
+@receiver(post_delete, sender=TaskExecution)
+def task_execution_deleted(sender, instance, **kwargs):
+    remove_from_rollup(instance)
@@ -0,0 +1,94 @@
+import hashlib
+import math
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+HLL_PRECISION = 12
+TOP_RECIPIENTS_CAPACITY = 100
+
+
+class HyperLogLog:
+    def __init__(
+        self, precision: int = HLL_PRECISION, registers: Optional[bytes] = None
+    ):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers or self.size)
+
+    @staticmethod
+    def _hash(item: str) -> int:
+        digest = hashlib.blake2b(item.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def add(self, item: str) -> None:
+        value = self._hash(item)
+        bits = 64 - self.precision
+        index = value >> bits
+        rank = bits - (value & ((1 << bits) - 1)).bit_length() + 1
+
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size**2 / sum(2.0**-rank for rank in self.registers)
+        zeros = self.registers.count(0)
+
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        return zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> "HyperLogLog":
+        return cls(registers=zlib.decompress(data)) if data else cls()
+
+
+class MisraGries:
+    def __init__(
+        self,
+        capacity: int = TOP_RECIPIENTS_CAPACITY,
+        counters: Optional[Dict[str, int]] = None,
+    ):
+        self.capacity = capacity
+        self.counters = dict(counters or {})
+
+    def _reduce(self) -> None:
+        threshold = sorted(self.counters.values(), reverse=True)[self.capacity]
+        self.counters = {
+            item: count - threshold
+            for item, count in self.counters.items()
+            if count > threshold
+        }
+
+    def add(self, item: str, count: int = 1) -> None:
+        self.counters[item] = self.counters.get(item, 0) + count
+
+        if len(self.counters) > self.capacity:
+            self._reduce()
+
+    def remove(self, item: str, count: int = 1) -> None:
+        remaining = self.counters.get(item, 0) - count
+
+        if remaining > 0:
+            self.counters[item] = remaining
+        else:
+            self.counters.pop(item, None)
+
+    def merge(self, other: "MisraGries") -> None:
+        for item, count in other.counters.items():
+            self.counters[item] = self.counters.get(item, 0) + count
+
+        if len(self.counters) > self.capacity:
+            self._reduce()
+
+    def most_common(self, limit: int) -> List[Tuple[str, int]]:
+        return sorted(self.counters.items(), key=lambda item: (-item[1], item[0]))[
+            :limit
+        ]
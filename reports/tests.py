@@ -1,13 +1,30 @@
+import threading
+from collections import Counter
 from datetime import timedelta
+from unittest.mock import patch
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.utils import timezone
 
 from executions.models import TaskExecution, Execution
+from executions.services.apply_transition import apply_transition
+from executions.services.update_task_execution import set_task_execution_status
+from executions.types.task_execution import UpdateTaskExecutionParams
+from executions.types.transition import TransitionParams
+from reports.services.formart_report import (
+    format_performance_report_as_html,
+    format_report_as_html,
+)
+from reports.services.performance_report import ExecutionPerformanceReportGenerator
+from reports.services.report_cache import ReportCache
 from reports.services.report_generator import EmailReportGenerator
-from reports.types.report import ReportParams
+from reports.models import EmailHourlyRollup
+from reports.services.rollup import floor_hour, rebuild_email_rollups
+from reports.sketches import HyperLogLog, MisraGries
+from reports.types.report import EmailDeliveryReport, EmailStats, ReportParams
 from users.models import User
-from workflows.models import Task, Workflow, EmailTask
+from workflows.models import Task, Workflow, EmailTask, Schedule
 
 
 class EmailReportGeneratorTests(TestCase):
@@ -86,6 +103,7 @@ class EmailReportGeneratorTests(TestCase):
         self.month_ago = self.now - timedelta(days=30)
 
         self._create_task_executions()
+        rebuild_email_rollups()
 
     def _create_task_executions(self):
         for _ in range(3):
@@ -272,3 +290,458 @@ class EmailReportGeneratorTests(TestCase):
         self.assertEqual(report.stats.successful_deliveries, 8)
         self.assertEqual(report.stats.failed_deliveries, 4)
         self.assertEqual(report.stats.total_sent, 12)
+
+    def test_report_uses_constant_queries(self):
+        generator = EmailReportGenerator()
+        params = ReportParams(user_id=self.user1.id, filter_type="last_month")
+
+        with self.assertNumQueries(5):
+            generator.generate_report(params)
+
+        for _ in range(20):
+            TaskExecution.objects.create(
+                task=self.task1,
+                execution=self.execution1,
+                status="running",
+                started_at=self.now - timedelta(minutes=5),
+            )
+
+        with self.assertNumQueries(5):
+            report = generator.generate_report(params)
+
+        self.assertEqual(report.stats.total_sent, 12)
+        self.assertEqual(report.stats.total_recipients, 36)
+
+    def test_approximate_report_matches_exact_for_small_windows(self):
+        for filter_type in ["last_hour", "last_day", "last_month"]:
+            with self.subTest(filter_type=filter_type):
+                params = ReportParams(user_id=self.user1.id, filter_type=filter_type)
+                exact = EmailReportGenerator(approximate=False).generate_report(params)
+                approximate = EmailReportGenerator(approximate=True).generate_report(
+                    params
+                )
+
+                self.assertEqual(approximate.stats, exact.stats)
+                self.assertCountEqual(
+                    approximate.most_common_recipients, exact.most_common_recipients
+                )
+
+    @override_settings(REPORT_CACHE_BUCKET=300)
+    def test_cached_report_is_reused_within_bucket(self):
+        cache.clear()
+        generator = EmailReportGenerator()
+        params = ReportParams(user_id=self.user1.id, filter_type="last_hour")
+
+        with patch("reports.services.report_cache.time.time", return_value=600):
+            report = generator.generate_report(params)
+
+            with self.assertNumQueries(0):
+                self.assertEqual(generator.generate_report(params), report)
+
+            with self.assertNumQueries(5):
+                generator.generate_report(
+                    ReportParams(user_id=self.user1.id, filter_type="last_day")
+                )
+
+        with patch("reports.services.report_cache.time.time", return_value=900):
+            with self.assertNumQueries(3):
+                generator.generate_report(params)
+
+
+class EmailHourlyRollupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="user1", email="user1@example.com")
+        workflow = Workflow.objects.create(name="Workflow", created_by=self.user)
+        self.task = Task.objects.create(
+            workflow=workflow,
+            created_by=self.user,
+            name="Email Task",
+            task_type="email",
+            order=1,
+        )
+        EmailTask.objects.create(
+            task=self.task,
+            recipients="john@example.com,jane@example.com",
+            subject="Test Email",
+            content="Test content",
+            cc="manager@example.com",
+        )
+        self.execution = Execution.objects.create(
+            workflow=workflow, created_by=self.user
+        )
+
+    def _run_task(self, status):
+        task_execution = TaskExecution.objects.create(
+            task=self.task, execution=self.execution
+        )
+        set_task_execution_status(
+            UpdateTaskExecutionParams(
+                task_execution_id=task_execution.id, status="running"
+            )
+        )
+        set_task_execution_status(
+            UpdateTaskExecutionParams(
+                task_execution_id=task_execution.id, status=status
+            )
+        )
+        return task_execution
+
+    def _rollup_totals(self):
+        return list(
+            EmailHourlyRollup.objects.values_list(
+                "user_id",
+                "hour",
+                "sent",
+                "successful",
+                "failed",
+                "recipients",
+                "top_recipients",
+            )
+        )
+
+    def test_terminal_transitions_update_rollup(self):
+        self._run_task("completed")
+        self._run_task("completed")
+        self._run_task("failed")
+
+        rollup = EmailHourlyRollup.objects.get(user=self.user)
+
+        self.assertEqual(rollup.sent, 3)
+        self.assertEqual(rollup.successful, 2)
+        self.assertEqual(rollup.failed, 1)
+        self.assertEqual(rollup.recipients, 9)
+        self.assertEqual(rollup.duration_count, 3)
+        self.assertEqual(rollup.hour, floor_hour(timezone.now()))
+
+    def test_retried_task_replaces_previous_result(self):
+        task_execution = self._run_task("failed")
+
+        set_task_execution_status(
+            UpdateTaskExecutionParams(
+                task_execution_id=task_execution.id, status="running"
+            )
+        )
+        set_task_execution_status(
+            UpdateTaskExecutionParams(
+                task_execution_id=task_execution.id, status="completed"
+            )
+        )
+
+        rollup = EmailHourlyRollup.objects.get(user=self.user)
+        self.assertEqual(rollup.sent, 1)
+        self.assertEqual(rollup.successful, 1)
+        self.assertEqual(rollup.failed, 0)
+
+    def test_repeated_transition_does_not_double_count(self):
+        task_execution = self._run_task("completed")
+        before = self._rollup_totals()
+
+        apply_transition(
+            TransitionParams(
+                task_executions=[
+                    UpdateTaskExecutionParams(
+                        task_execution_id=task_execution.id, status="completed"
+                    )
+                ]
+            )
+        )
+
+        self.assertEqual(self._rollup_totals(), before)
+        self.assertEqual(EmailHourlyRollup.objects.get(user=self.user).sent, 1)
+
+    def test_deleted_execution_is_removed_from_rollup(self):
+        self._run_task("completed")
+        task_execution = self._run_task("failed")
+
+        TaskExecution.objects.get(pk=task_execution.pk).delete()
+
+        rollup = EmailHourlyRollup.objects.get(user=self.user)
+        self.assertEqual(rollup.sent, 1)
+        self.assertEqual(rollup.failed, 0)
+        self.assertEqual(rollup.recipients, 3)
+
+        self.execution.delete()
+
+        rollup.refresh_from_db()
+        self.assertEqual(rollup.sent, 0)
+        self.assertEqual(rollup.recipients, 0)
+        self.assertEqual(rollup.top_recipients, {})
+
+    def test_recipient_changes_do_not_drift_rollup(self):
+        task_execution = self._run_task("failed")
+        EmailTask.objects.filter(task=self.task).update(
+            recipients="other@example.com", cc=""
+        )
+        self._run_task("completed")
+
+        set_task_execution_status(
+            UpdateTaskExecutionParams(
+                task_execution_id=task_execution.id, status="running"
+            )
+        )
+        set_task_execution_status(
+            UpdateTaskExecutionParams(
+                task_execution_id=task_execution.id, status="completed"
+            )
+        )
+
+        rollup = EmailHourlyRollup.objects.get(user=self.user)
+        self.assertEqual(rollup.sent, 2)
+        self.assertEqual(rollup.recipients, 2)
+        self.assertEqual(rollup.top_recipients, {"other@example.com": 2})
+
+    def test_rebuild_matches_incremental_rollup(self):
+        self._run_task("completed")
+        self._run_task("failed")
+        incremental = self._rollup_totals()
+
+        rebuild_email_rollups()
+
+        self.assertEqual(self._rollup_totals(), incremental)
+
+    def test_running_executions_are_not_counted_in_any_hour(self):
+        for minutes in (5, 90):
+            TaskExecution.objects.create(
+                task=self.task,
+                execution=self.execution,
+                status="running",
+                started_at=timezone.now() - timedelta(minutes=minutes),
+            )
+        self._run_task("completed")
+
+        report = EmailReportGenerator().generate_report(
+            ReportParams(user_id=self.user.id, filter_type="last_day")
+        )
+
+        self.assertEqual(report.stats.total_sent, 1)
+        self.assertEqual(report.stats.total_recipients, 3)
+
+    def test_report_reads_full_hours_from_rollup(self):
+        started_at = floor_hour(timezone.now()) - timedelta(hours=3)
+        EmailHourlyRollup.objects.create(
+            user=self.user,
+            hour=started_at,
+            sent=1000,
+            successful=900,
+            failed=100,
+            recipients=3000,
+            duration_sum=2000.0,
+            duration_count=1000,
+        )
+
+        report = EmailReportGenerator().generate_report(
+            ReportParams(user_id=self.user.id, filter_type="last_day")
+        )
+
+        self.assertEqual(report.stats.total_sent, 1000)
+        self.assertEqual(report.stats.successful_deliveries, 900)
+        self.assertEqual(report.stats.total_recipients, 3000)
+        self.assertEqual(report.stats.average_delivery_time, 2.0)
+
+
+class SketchTests(SimpleTestCase):
+    def test_hyperloglog_estimate_is_within_error_bound(self):
+        sketch = HyperLogLog()
+
+        for index in range(20000):
+            sketch.add(f"user{index}@example.com")
+
+        self.assertAlmostEqual(sketch.estimate(), 20000, delta=20000 * 0.05)
+
+    def test_hyperloglog_merge_matches_union(self):
+        first, second, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+
+        for index in range(3000):
+            first.add(f"user{index}@example.com")
+            union.add(f"user{index}@example.com")
+        for index in range(2000, 6000):
+            second.add(f"user{index}@example.com")
+            union.add(f"user{index}@example.com")
+
+        first.merge(HyperLogLog.from_bytes(second.to_bytes()))
+
+        self.assertEqual(first.estimate(), union.estimate())
+
+    def test_misra_gries_is_exact_below_capacity(self):
+        sketch = MisraGries(capacity=10)
+
+        for email, count in [("a@x.com", 5), ("b@x.com", 3), ("c@x.com", 1)]:
+            sketch.add(email, count)
+
+        self.assertEqual(sketch.most_common(2), [("a@x.com", 5), ("b@x.com", 3)])
+
+    def test_misra_gries_merge_keeps_heavy_hitters_within_bound(self):
+        counts = Counter({f"heavy{index}@x.com": 1000 - index for index in range(5)})
+        counts.update({f"light{index}@x.com": 1 for index in range(2000)})
+        first, second = MisraGries(capacity=50), MisraGries(capacity=50)
+
+        for index, (email, count) in enumerate(counts.items()):
+            (first if index % 2 else second).add(email, count)
+        first.merge(second)
+
+        error_bound = sum(counts.values()) / 51
+        top = dict(first.most_common(5))
+
+        self.assertEqual(set(top), {f"heavy{index}@x.com" for index in range(5)})
+        for email, count in top.items():
+            self.assertLessEqual(count, counts[email])
+            self.assertGreaterEqual(count, counts[email] - error_bound)
+
+
+class ReportCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.report_cache = ReportCache(cache, bucket_seconds=300, lock_timeout=0.5)
+
+    def test_waits_for_report_being_built_elsewhere(self):
+        cache.add("report:lock", True, 1)
+        timer = threading.Timer(0.2, cache.set, ("report", "built elsewhere", 300))
+        timer.start()
+        self.addCleanup(timer.cancel)
+        build_calls = []
+
+        report = self.report_cache.get_or_build(
+            "report", lambda: build_calls.append(1) or "built here"
+        )
+
+        self.assertEqual(report, "built elsewhere")
+        self.assertEqual(build_calls, [])
+
+    def test_builds_when_lock_holder_does_not_finish(self):
+        cache.add("report:lock", True, 1)
+
+        report = self.report_cache.get_or_build("report", lambda: "built here")
+
+        self.assertEqual(report, "built here")
+        self.assertTrue(cache.get("report:lock"))
+
+
+class FormatReportTests(SimpleTestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.report = EmailDeliveryReport(
+            user_email="user1@example.com",
+            period_start=now - timedelta(days=1),
+            period_end=now,
+            stats=EmailStats(
+                total_sent=5,
+                successful_deliveries=3,
+                failed_deliveries=2,
+                total_recipients=15,
+                unique_recipients=3,
+                average_delivery_time=60.0,
+            ),
+            most_common_recipients=[
+                {"email": "john@example.com", "count": 5},
+                {"email": "<script>alert(1)</script>@example.com", "count": 2},
+            ],
+        )
+
+    def test_renders_stats_and_recipients(self):
+        html = format_report_as_html(self.report)
+
+        self.assertIn("<li>Total de Emails Enviados: 5</li>", html)
+        self.assertIn("<li>Tempo Médio de Entrega: 60.0 segundos</li>", html)
+        self.assertIn("<td>john@example.com</td>", html)
+        self.assertEqual(html.count("<tr>"), 3)
+
+    def test_escapes_recipient_data(self):
+        html = format_report_as_html(self.report)
+
+        self.assertNotIn("<script>", html)
+        self.assertIn("&lt;script&gt;alert(1)&lt;/script&gt;@example.com", html)
+
+
+class ExecutionPerformanceReportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="user1", email="user1@example.com")
+        self.workflow = Workflow.objects.create(
+            name="Workflow <1>", created_by=self.user, delay_minutes=1
+        )
+        self.email_task = Task.objects.create(
+            workflow=self.workflow,
+            created_by=self.user,
+            name="Email Task",
+            task_type="email",
+            order=1,
+        )
+        self.report_task = Task.objects.create(
+            workflow=self.workflow,
+            created_by=self.user,
+            name="Report Task",
+            task_type="report",
+            order=2,
+        )
+        now = timezone.now()
+
+        for index in range(1, 11):
+            execution = Execution.objects.create(
+                workflow=self.workflow,
+                created_by=self.user,
+                status="failed" if index > 8 else "completed",
+                queued_at=now - timedelta(minutes=10),
+            )
+            Execution.objects.filter(pk=execution.pk).update(
+                started_at=now - timedelta(minutes=10),
+                completed_at=now - timedelta(minutes=10) + timedelta(seconds=index),
+            )
+            task_started_at = now - timedelta(minutes=9) + timedelta(seconds=index)
+            TaskExecution.objects.create(
+                execution=execution,
+                task=self.email_task,
+                status="completed",
+                started_at=task_started_at,
+                completed_at=task_started_at + timedelta(seconds=index),
+            )
+            TaskExecution.objects.create(
+                execution=execution,
+                task=self.report_task,
+                status="failed" if index > 8 else "completed",
+                started_at=task_started_at,
+                completed_at=task_started_at + timedelta(seconds=10 * index),
+            )
+
+        self.params = ReportParams(
+            user_id=self.user.id,
+            filter_type="last_day",
+            report_type="execution_performance",
+        )
+
+    def test_report_computes_percentiles_and_failure_rates(self):
+        report = ExecutionPerformanceReportGenerator().generate_report(self.params)
+
+        self.assertEqual(report.execution_durations.p50, 5.5)
+        self.assertEqual(report.execution_durations.p95, 9.55)
+        self.assertEqual(report.queue_delay.p50, 5.5)
+        self.assertEqual(report.queue_delay.p99, 9.91)
+
+        by_task_type = {group.name: group for group in report.by_task_type}
+        self.assertEqual(by_task_type["email"].duration.p50, 5.5)
+        self.assertEqual(by_task_type["email"].failure_rate, 0.0)
+        self.assertEqual(by_task_type["report"].duration.p50, 55.0)
+        self.assertEqual(by_task_type["report"].failed, 2)
+        self.assertEqual(by_task_type["report"].failure_rate, 0.2)
+
+        self.assertEqual(len(report.by_workflow), 1)
+        self.assertEqual(report.by_workflow[0].total, 10)
+        self.assertEqual(report.by_workflow[0].failure_rate, 0.2)
+
+    def test_report_uses_constant_queries(self):
+        with self.assertNumQueries(6):
+            ExecutionPerformanceReportGenerator().generate_report(self.params)
+
+    def test_report_ignores_scheduled_workflows_for_queue_delay(self):
+        Schedule.objects.create(workflow=self.workflow, created_by=self.user, hour=0)
+
+        report = ExecutionPerformanceReportGenerator().generate_report(self.params)
+
+        self.assertEqual(report.queue_delay.p50, 0.0)
+        self.assertEqual(report.execution_durations.p50, 5.5)
+
+    def test_html_escapes_workflow_names(self):
+        report = ExecutionPerformanceReportGenerator().generate_report(self.params)
+
+        html = format_performance_report_as_html(report)
+
+        self.assertIn("<td>Workflow &lt;1&gt;</td>", html)
+        self.assertIn("<td>20.00%</td>", html)
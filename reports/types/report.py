@@ -22,7 +22,36 @@ class EmailDeliveryReport:
     most_common_recipients: List[Dict[str, int]]
 
 
+@dataclass
+class LatencyPercentiles:
+    p50: float
+    p95: float
+    p99: float
+
+
+@dataclass
+class PerformanceGroup:
+    name: str
+    total: int
+    failed: int
+    failure_rate: float
+    duration: LatencyPercentiles
+
+
+@dataclass
+class ExecutionPerformanceReport:
+    user_email: str
+    period_start: datetime
+    period_end: datetime
+    task_durations: LatencyPercentiles
+    execution_durations: LatencyPercentiles
+    queue_delay: LatencyPercentiles
+    by_workflow: List[PerformanceGroup]
+    by_task_type: List[PerformanceGroup]
+
+
 @dataclass
 class ReportParams:
     user_id: int
     filter_type: str
+    report_type: str = "email_delivery"
@@ -1,25 +1,54 @@
-from asgiref.sync import sync_to_async
+from datetime import timedelta
+from functools import wraps
+from typing import List
+
+from django.db import close_old_connections
 from temporalio import activity, exceptions
 
+from executions.services.apply_transition import apply_transition
 from executions.services.update_execution import update_execution_status
 from executions.services.update_task_execution import (
     update_task_execution_status,
 )
 from executions.types.execution import UpdateExecutionParams
 from executions.types.task_execution import UpdateTaskExecutionParams
-from notifications.services.mailersend import MailerSendService
-from notifications.types.email import EmailParams
-from reports.services.formart_report import format_report_as_html
+from executions.types.transition import TransitionParams
+from notifications.exceptions import EmailRetryLaterError
+from notifications.services.base import is_unsent_error
+from notifications.services.email_service import get_email_service
+from notifications.services.outbox import enqueue_emails, get_outbox_results
+from notifications.types.email import EmailParams, EmailResponse
+from notifications.types.outbox import OutboxEmailParams, OutboxResult
+from reports.services.formart_report import (
+    format_performance_report_as_html,
+    format_report_as_html,
+)
+from reports.services.performance_report import ExecutionPerformanceReportGenerator
 from reports.services.report_generator import EmailReportGenerator
 from reports.types.report import ReportParams
 
+EMAIL_NOT_SENT_ERROR = "EmailNotSentError"
+
+
+def db_activity(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return wrapper
+
 
 @activity.defn
-async def update_task_status_activity(
+@db_activity
+def update_task_status_activity(
     task_execution_params: UpdateTaskExecutionParams,
 ) -> None:
     try:
-        await sync_to_async(update_task_execution_status)(task_execution_params)
+        update_task_execution_status(task_execution_params)
     except Exception as e:
         raise exceptions.ApplicationError(
             f"Erro ao atualizar o status da task: {str(e)}"
@@ -27,11 +56,12 @@ async def update_task_status_activity(
 
 
 @activity.defn
-async def update_execution_status_activity(
+@db_activity
+def update_execution_status_activity(
     execution_params: UpdateExecutionParams,
 ) -> None:
     try:
-        await sync_to_async(update_execution_status)(execution_params)
+        update_execution_status(execution_params)
     except Exception as e:
         raise exceptions.ApplicationError(
             f"Erro ao atualizar o status do workflow: {str(e)}"
@@ -39,20 +69,93 @@ async def update_execution_status_activity(
 
 
 @activity.defn
-async def send_email_activity(email_params: EmailParams) -> None:
-    email_service = MailerSendService()
+@db_activity
+def apply_transition_activity(transition_params: TransitionParams) -> None:
+    try:
+        apply_transition(transition_params)
+    except Exception as e:
+        raise exceptions.ApplicationError(
+            f"Erro ao aplicar a transição de status: {str(e)}"
+        )
+
+
+@activity.defn
+@db_activity
+def send_email_activity(email_params: EmailParams) -> None:
+    email_service = get_email_service()
 
     try:
-        await sync_to_async(email_service.send_email)(email_params)
+        email_service.send_email(email_params)
+    except EmailRetryLaterError as e:
+        raise exceptions.ApplicationError(
+            f"Erro no serviço de e-mail: {str(e)}",
+            next_retry_delay=timedelta(seconds=e.retry_after),
+        )
     except Exception as e:
         raise exceptions.ApplicationError(f"Erro no serviço de e-mail: {str(e)}")
 
 
 @activity.defn
-async def generate_report_activity(report_params: ReportParams) -> EmailParams:
-    report_generator = EmailReportGenerator()
+@db_activity
+def send_bulk_email_activity(
+    email_params_list: List[EmailParams],
+) -> List[EmailResponse]:
+    email_service = get_email_service()
+
+    try:
+        return email_service.send_bulk(email_params_list)
+    except EmailRetryLaterError as e:
+        raise exceptions.ApplicationError(
+            f"Erro no serviço de e-mail: {str(e)}",
+            type=EMAIL_NOT_SENT_ERROR,
+            next_retry_delay=timedelta(seconds=e.retry_after),
+        )
+    except Exception as e:
+        raise exceptions.ApplicationError(
+            f"Erro no serviço de e-mail: {str(e)}",
+            type=EMAIL_NOT_SENT_ERROR if is_unsent_error(e) else None,
+        )
+
+
+@activity.defn
+@db_activity
+def enqueue_email_activity(outbox_params_list: List[OutboxEmailParams]) -> None:
+    try:
+        enqueue_emails(outbox_params_list)
+    except Exception as e:
+        raise exceptions.ApplicationError(
+            f"Erro ao registrar o e-mail na outbox: {str(e)}"
+        )
+
+
+@activity.defn
+@db_activity
+def get_outbox_results_activity(keys: List[str]) -> List[OutboxResult]:
+    try:
+        return get_outbox_results(keys)
+    except Exception as e:
+        raise exceptions.ApplicationError(
+            f"Erro ao consultar a outbox de e-mails: {str(e)}"
+        )
+
+
+@activity.defn
+@db_activity
+def generate_report_activity(report_params: ReportParams) -> EmailParams:
     try:
-        report = await sync_to_async(report_generator.generate_report)(report_params)
+        if report_params.report_type == "execution_performance":
+            report = ExecutionPerformanceReportGenerator().generate_report(
+                report_params
+            )
+            return EmailParams(
+                subject="Relatório de desempenho das execuções",
+                to_email=[report.user_email],
+                content="",
+                html_content=format_performance_report_as_html(report),
+            )
+
+        report_generator = EmailReportGenerator()
+        report = report_generator.generate_report(report_params)
         email_params = EmailParams(
             subject=f"Envio de relatório de emails",
             to_email=[report.user_email],
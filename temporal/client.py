@@ -3,6 +3,8 @@ from typing import Optional
 from django.conf import settings
 from temporalio.client import Client
 
+from .converter import get_data_converter
+
 
 class TemporalClientSingleton:
     _instance: Optional[Client] = None
@@ -13,6 +15,7 @@ class TemporalClientSingleton:
             cls._instance = await Client.connect(
                 settings.TEMPORAL_CLIENT_ADDRESS,
                 namespace=settings.TEMPORAL_CLIENT_NAMESPACE,
+                data_converter=get_data_converter(),
             )
         return cls._instance
 
@@ -0,0 +1,19 @@
+from typing import List, Sequence
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import PayloadCodec
+
+
+class ChainCodec(PayloadCodec):
+    def __init__(self, codecs: List[PayloadCodec]):
+        self.codecs = codecs
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        for codec in self.codecs:
+            payloads = await codec.encode(payloads)
+        return list(payloads)
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        for codec in reversed(self.codecs):
+            payloads = await codec.decode(payloads)
+        return list(payloads)
@@ -0,0 +1,40 @@
+import asyncio
+import hashlib
+from typing import List, Sequence
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import PayloadCodec
+
+from ..storage.base import BlobStore, validate_key
+
+CLAIM_CHECK_ENCODING = b"binary/claim-check"
+
+
+class ClaimCheckCodec(PayloadCodec):
+    def __init__(self, store: BlobStore, threshold: int):
+        self.store = store
+        self.threshold = threshold
+
+    async def _encode_payload(self, payload: Payload) -> Payload:
+        if payload.ByteSize() <= self.threshold:
+            return payload
+
+        data = payload.SerializeToString()
+        key = hashlib.sha256(data).hexdigest()
+        await asyncio.to_thread(self.store.put, key, data)
+
+        return Payload(metadata={"encoding": CLAIM_CHECK_ENCODING}, data=key.encode())
+
+    async def _decode_payload(self, payload: Payload) -> Payload:
+        if payload.metadata.get("encoding") != CLAIM_CHECK_ENCODING:
+            return payload
+
+        key = validate_key(payload.data.decode())
+        data = await asyncio.to_thread(self.store.get, key)
+        return Payload.FromString(data)
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [await self._encode_payload(payload) for payload in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [await self._decode_payload(payload) for payload in payloads]
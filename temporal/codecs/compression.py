@@ -0,0 +1,62 @@
+import zlib
+from typing import List, Sequence
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import PayloadCodec
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_ENCODINGS = {
+    "zlib": b"binary/zlib",
+    "zstd": b"binary/zstd",
+}
+
+
+class CompressionCodec(PayloadCodec):
+    def __init__(self, algorithm: str = "zlib", threshold: int = 1024):
+        if algorithm not in COMPRESSION_ENCODINGS:
+            raise ValueError(f"Algoritmo de compressão inválido: {algorithm}")
+        if algorithm == "zstd" and zstandard is None:
+            raise ValueError("O pacote zstandard é necessário para usar zstd")
+
+        self.algorithm = algorithm
+        self.threshold = threshold
+        self.encoding = COMPRESSION_ENCODINGS[algorithm]
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.algorithm == "zstd":
+            return zstandard.ZstdCompressor().compress(data)
+        return zlib.compress(data)
+
+    def _decompress(self, encoding: bytes, data: bytes) -> bytes:
+        if encoding == COMPRESSION_ENCODINGS["zstd"]:
+            if zstandard is None:
+                raise ValueError("O pacote zstandard é necessário para usar zstd")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def _encode_payload(self, payload: Payload) -> Payload:
+        if payload.ByteSize() <= self.threshold:
+            return payload
+
+        data = self._compress(payload.SerializeToString())
+        if len(data) >= payload.ByteSize():
+            return payload
+
+        return Payload(metadata={"encoding": self.encoding}, data=data)
+
+    def _decode_payload(self, payload: Payload) -> Payload:
+        encoding = payload.metadata.get("encoding")
+        if encoding not in COMPRESSION_ENCODINGS.values():
+            return payload
+
+        return Payload.FromString(self._decompress(encoding, payload.data))
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [self._encode_payload(payload) for payload in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [self._decode_payload(payload) for payload in payloads]
@@ -0,0 +1,38 @@
+import dataclasses
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from temporalio.converter import DataConverter
+
+from .codecs.chain import ChainCodec
+from .codecs.claim_check import ClaimCheckCodec
+from .codecs.compression import CompressionCodec
+
+
+def get_data_converter() -> DataConverter:
+    codecs = []
+
+    if settings.TEMPORAL_PAYLOAD_COMPRESSION:
+        codecs.append(
+            CompressionCodec(
+                settings.TEMPORAL_PAYLOAD_COMPRESSION,
+                threshold=settings.TEMPORAL_PAYLOAD_COMPRESSION_THRESHOLD,
+            )
+        )
+
+    if settings.TEMPORAL_CLAIM_CHECK_ENABLED:
+        store_class = import_string(settings.TEMPORAL_CLAIM_CHECK_STORE)
+        codecs.append(
+            ClaimCheckCodec(
+                store_class(**settings.TEMPORAL_CLAIM_CHECK_STORE_OPTIONS),
+                threshold=settings.TEMPORAL_CLAIM_CHECK_THRESHOLD,
+            )
+        )
+
+    if not codecs:
+        return DataConverter.default
+
+    return dataclasses.replace(
+        DataConverter.default,
+        payload_codec=codecs[0] if len(codecs) == 1 else ChainCodec(codecs),
+    )
@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+from django.core.management.base import BaseCommand
+from temporalio.converter import DataConverter
+
+from notifications.types.email import EmailParams
+from reports.types.report import ReportParams
+from ...codecs.compression import CompressionCodec, zstandard
+from ...types.task import TaskData, TaskType
+from ...types.workflow import WorkflowInput
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks payload size and encode/decode cost of the compression "
+        "codecs for representative workflow inputs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--tasks", type=int, default=20)
+        parser.add_argument("--recipients", type=int, default=200)
+
+    def _build_input(self, tasks: int, recipients: int) -> WorkflowInput:
+        tasks_data = []
+
+        for index in range(tasks):
+            task_data = TaskData(
+                task_execution_id=index,
+                name=f"Tarefa {index}",
+                task_type=TaskType.EMAIL.value,
+                order=index,
+                initial_interval=15,
+                maximum_attempts=5,
+                backoff_coefficient=2.0,
+            )
+            if index % 5 == 4:
+                task_data.task_type = TaskType.REPORT.value
+                task_data.report_config = ReportParams(
+                    user_id=1, filter_type="last_day"
+                )
+            else:
+                task_data.email_config = EmailParams(
+                    to_email=[
+                        f"destinatario{i}@empresa.com.br" for i in range(recipients)
+                    ],
+                    subject=f"Comunicado semanal {index}",
+                    content="Olá, segue o resumo das atividades da semana. " * 40,
+                    cc=["gestor@empresa.com.br", "diretoria@empresa.com.br"],
+                    from_email="equipe@empresa.com.br",
+                    from_name="Equipe",
+                )
+            tasks_data.append(task_data)
+
+        return WorkflowInput(
+            execution_id=1, workflow_name="Benchmark", tasks=tasks_data
+        )
+
+    def _build_report(self, recipients: int) -> EmailParams:
+        rows = "".join(
+            f"<tr><td>destinatario{i}@empresa.com.br</td><td>{i}</td></tr>"
+            for i in range(recipients)
+        )
+        return EmailParams(
+            to_email=["usuario@empresa.com.br"],
+            subject="Envio de relatório de emails",
+            content="",
+            html_content=f"<html><body><table>{rows}</table></body></html>",
+        )
+
+    async def _measure(self, codec, payloads, iterations):
+        encoded = await codec.encode(payloads) if codec else payloads
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            if codec:
+                await codec.encode(payloads)
+        encode_time = (time.perf_counter() - started) / iterations
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            if codec:
+                await codec.decode(encoded)
+        decode_time = (time.perf_counter() - started) / iterations
+
+        size = sum(payload.ByteSize() for payload in encoded)
+        return size, encode_time, decode_time
+
+    async def _benchmark(self, iterations, tasks, recipients):
+        payload_converter = DataConverter.default.payload_converter
+        samples = {
+            "workflow_input": payload_converter.to_payloads(
+                [self._build_input(tasks, recipients)]
+            ),
+            "report_email": payload_converter.to_payloads(
+                [self._build_report(recipients * 5)]
+            ),
+        }
+        codecs = {"none": None, "zlib": CompressionCodec("zlib", threshold=0)}
+        if zstandard is not None:
+            codecs["zstd"] = CompressionCodec("zstd", threshold=0)
+
+        for sample_name, payloads in samples.items():
+            for codec_name, codec in codecs.items():
+                size, encode_time, decode_time = await self._measure(
+                    codec, payloads, iterations
+                )
+                self.stdout.write(
+                    f"{sample_name:<15} {codec_name:<5} "
+                    f"size={size}B "
+                    f"encode={encode_time * 1e6:.1f}us "
+                    f"decode={decode_time * 1e6:.1f}us"
+                )
+
+    def handle(self, *args, **options):
+        asyncio.run(
+            self._benchmark(
+                options["iterations"], options["tasks"], options["recipients"]
+            )
+        )
@@ -0,0 +1,140 @@
+import statistics
+import time
+import uuid
+from typing import List
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from temporalio import activity
+from temporalio.worker import Worker
+
+from executions.types.execution import UpdateExecutionParams
+from executions.types.task_execution import UpdateTaskExecutionParams
+from executions.types.transition import TransitionParams
+from notifications.types.email import EmailParams, EmailResponse
+from reports.types.report import ReportParams
+from ...client import get_temporal_client
+from ...types.task import TaskData, TaskType
+from ...types.workflow import WorkflowInput
+from ...workflows import KaironWorkflow
+
+
+@activity.defn(name="update_task_status_activity")
+async def _update_task_status(params: UpdateTaskExecutionParams) -> None:
+    return None
+
+
+@activity.defn(name="update_execution_status_activity")
+async def _update_execution_status(params: UpdateExecutionParams) -> None:
+    return None
+
+
+@activity.defn(name="apply_transition_activity")
+async def _apply_transition(params: TransitionParams) -> None:
+    return None
+
+
+@activity.defn(name="send_email_activity")
+async def _send_email(params: EmailParams) -> None:
+    return None
+
+
+@activity.defn(name="send_bulk_email_activity")
+async def _send_bulk_email(params: List[EmailParams]) -> List[EmailResponse]:
+    return [EmailResponse(code=202) for _ in params]
+
+
+@activity.defn(name="generate_report_activity")
+async def _generate_report(params: ReportParams) -> EmailParams:
+    return EmailParams(to_email=["bench@example.com"], subject="", content="")
+
+
+BENCHMARK_ACTIVITIES = [
+    _apply_transition,
+    _update_task_status,
+    _update_execution_status,
+    _send_email,
+    _send_bulk_email,
+    _generate_report,
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks KaironWorkflow history size and latency with regular and "
+        "local status activities, using no-op activities."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workflows", type=int, default=20)
+        parser.add_argument("--tasks", type=int, default=5)
+
+    def _build_input(self, tasks: int, local_status_activities: bool):
+        return WorkflowInput(
+            execution_id=0,
+            workflow_name="benchmark",
+            tasks=[
+                TaskData(
+                    task_execution_id=index,
+                    name=f"benchmark-task-{index}",
+                    task_type=TaskType.EMAIL.value,
+                    order=index,
+                    initial_interval=1,
+                    maximum_attempts=1,
+                    backoff_coefficient=2.0,
+                    email_config=EmailParams(
+                        to_email=["bench@example.com"], subject="", content=""
+                    ),
+                )
+                for index in range(tasks)
+            ],
+            local_status_activities=local_status_activities,
+        )
+
+    async def _run_mode(self, client, task_queue, workflows, tasks, local):
+        latencies = []
+        history_sizes = []
+
+        for _ in range(workflows):
+            started = time.perf_counter()
+            handle = await client.start_workflow(
+                KaironWorkflow.run,
+                self._build_input(tasks, local),
+                id=f"benchmark-{uuid.uuid4()}",
+                task_queue=task_queue,
+            )
+            await handle.result()
+            latencies.append((time.perf_counter() - started) * 1000)
+            history_sizes.append(len([e async for e in handle.fetch_history_events()]))
+
+        return statistics.mean(history_sizes), latencies
+
+    async def _benchmark(self, workflows: int, tasks: int):
+        client = await get_temporal_client()
+        task_queue = f"benchmark-{uuid.uuid4()}"
+
+        async with Worker(
+            client,
+            task_queue=task_queue,
+            workflows=[KaironWorkflow],
+            activities=BENCHMARK_ACTIVITIES,
+        ):
+            for local in (False, True):
+                history_size, latencies = await self._run_mode(
+                    client, task_queue, workflows, tasks, local
+                )
+                latencies.sort()
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                self.stdout.write(
+                    f"{'local' if local else 'regular':<8} "
+                    f"events/workflow={history_size:.1f} "
+                    f"latency_avg={statistics.mean(latencies):.1f}ms "
+                    f"latency_p95={p95:.1f}ms"
+                )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"Running {options['workflows']} workflows with "
+            f"{options['tasks']} tasks per mode"
+        )
+        async_to_sync(self._benchmark)(options["workflows"], options["tasks"])
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from temporalio.service import RPCError
+
+from notifications.services.email_service import get_email_service
+from notifications.services.outbox import dispatch_outbox_batch
+from notifications.types.outbox import OutboxResult
+from ...client import get_temporal_client
+from ...workflows import KaironWorkflow
+
+
+class Command(BaseCommand):
+    help = (
+        "Drains the email outbox in batches and signals the workflows waiting "
+        "for each email."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=settings.EMAIL_OUTBOX_CONCURRENCY
+        )
+        parser.add_argument(
+            "--rate-limit",
+            type=float,
+            default=settings.EMAIL_OUTBOX_RATE_LIMIT,
+            help="Maximum emails per second. 0 disables the limit.",
+        )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            default=settings.EMAIL_OUTBOX_BULK,
+            help="Send each batch through the provider bulk API.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Dispatch a single batch and exit."
+        )
+
+    async def _notify(self, client, outbox_emails) -> None:
+        for outbox_email in outbox_emails:
+            if not outbox_email.workflow_id or outbox_email.status not in (
+                "sent",
+                "failed",
+            ):
+                continue
+
+            try:
+                await client.get_workflow_handle(outbox_email.workflow_id).signal(
+                    KaironWorkflow.email_dispatched,
+                    OutboxResult(
+                        key=outbox_email.key,
+                        status=outbox_email.status,
+                        error_message=outbox_email.error_message or None,
+                    ),
+                )
+            except RPCError as e:
+                self.stderr.write(
+                    f"Could not notify workflow {outbox_email.workflow_id}: {e}"
+                )
+
+    async def _run(self, options, executor: ThreadPoolExecutor) -> None:
+        client = await get_temporal_client()
+        email_service = get_email_service()
+        dispatch = sync_to_async(dispatch_outbox_batch)
+
+        while True:
+            started = time.monotonic()
+            outbox_emails = await dispatch(
+                email_service,
+                options["batch_size"],
+                executor,
+                options["bulk"],
+            )
+            await sync_to_async(close_old_connections)()
+            await self._notify(client, outbox_emails)
+
+            if options["once"]:
+                return
+
+            if not outbox_emails:
+                await asyncio.sleep(settings.EMAIL_OUTBOX_IDLE_INTERVAL)
+            elif options["rate_limit"] > 0:
+                await asyncio.sleep(
+                    max(
+                        0.0,
+                        len(outbox_emails) / options["rate_limit"]
+                        - (time.monotonic() - started),
+                    )
+                )
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(
+            max_workers=max(options["concurrency"], 1),
+            thread_name_prefix="kairon-outbox",
+        ) as executor:
+            try:
+                asyncio.run(self._run(options, executor))
+            except KeyboardInterrupt:
+                pass
@@ -1,15 +1,58 @@
-from asgiref.sync import async_to_sync
+import asyncio
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
-from ...worker import main
+from ...supervisor import WorkerSupervisor
+from ...worker import (
+    assign_task_queues,
+    main,
+    resolve_task_queue,
+    validate_task_queues,
+)
 
 
 class Command(BaseCommand):
     help = "Runs the worker process for handling tasks."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of worker processes to supervise.",
+        )
+        parser.add_argument(
+            "--task-queue",
+            action="append",
+            dest="task_queues",
+            help=(
+                "Task queue to listen on, by name or by type (workflow, status, "
+                "email, report). Can be repeated; with several processes the "
+                "queues are assigned round-robin. Defaults to all queues."
+            ),
+        )
+
     def handle(self, *args, **options):
+        processes = options["processes"]
+        task_queues = [
+            resolve_task_queue(task_queue)
+            for task_queue in options["task_queues"] or []
+        ]
+
         try:
-            async_to_sync(main)()
+            validate_task_queues(task_queues)
+
+            if processes <= 1:
+                asyncio.run(main(task_queues or None))
+            else:
+                assignments = assign_task_queues(task_queues, processes)
+                supervisor = WorkerSupervisor(
+                    assignments,
+                    shutdown_timeout=settings.TEMPORAL_WORKER_SHUTDOWN_TIMEOUT,
+                )
+                self.stdout.write(f"Supervising {len(assignments)} worker processes.")
+                supervisor.run()
             self.stdout.write(
                 self.style.SUCCESS("Worker process started successfully.")
             )
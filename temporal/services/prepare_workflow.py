@@ -1,20 +1,52 @@
+import dataclasses
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
 from executions.models import Execution, TaskExecution
 from notifications.types.email import EmailParams
 from reports.types.report import ReportParams
-from workflows.models import EmailTask, ReportTask
+from workflows.models import Task, Workflow
 from ..types.task import TaskData, TaskType
 from ..types.workflow import WorkflowInput
 
 
-def prepare_workflow_input(execution: Execution) -> WorkflowInput:
-    tasks_data = []
-    tasks_execution = TaskExecution.objects.filter(execution_id=execution.id)
+def _link_previous_stage(tasks_data: List[TaskData]) -> None:
+    orders = sorted({task_data.order for task_data in tasks_data})
+
+    for task_data in tasks_data:
+        if task_data.depends_on:
+            continue
+
+        index = orders.index(task_data.order)
+        task_data.depends_on = (
+            [
+                previous.task_execution_id
+                for previous in tasks_data
+                if previous.order == orders[index - 1]
+            ]
+            if index
+            else []
+        )
 
-    for task_execution in tasks_execution:
-        task = task_execution.task
 
+def _compile_workflow_tasks(
+    workflow_id: int,
+) -> Tuple[List[TaskData], Dict[int, List[int]]]:
+    tasks = (
+        Task.objects.filter(workflow_id=workflow_id)
+        .select_related("email_config", "report_config")
+        .prefetch_related("depends_on")
+        .order_by("order", "id")
+    )
+    tasks_data = []
+    dependencies = {}
+
+    for task in tasks:
         task_data = TaskData(
-            task_execution_id=task_execution.id,
+            task_execution_id=0,
+            task_id=task.id,
             name=task.name,
             order=task.order,
             task_type=task.task_type,
@@ -22,31 +54,104 @@ def prepare_workflow_input(execution: Execution) -> WorkflowInput:
             maximum_attempts=task.maximum_attempts,
             backoff_coefficient=task.back_off,
         )
+        dependencies[task.id] = [dependency.id for dependency in task.depends_on.all()]
 
-        if task.task_type == TaskType.EMAIL.value:
-            email_task = EmailTask.objects.get(task_id=task.id)
+        if task.task_type == TaskType.EMAIL.value and hasattr(task, "email_config"):
+            email_task = task.email_config
             email_config = EmailParams(
                 to_email=email_task.get_recipients_list(),
                 subject=email_task.subject,
                 content=email_task.content,
                 cc=email_task.get_cc_list(),
-                from_email=email_task.task.created_by.email,
-                from_name=email_task.task.created_by.first_name,
             )
             task_data.email_config = email_config
-        elif task.task_type == TaskType.REPORT.value:
-            report_task = ReportTask.objects.get(task_id=task.id)
+        elif task.task_type == TaskType.REPORT.value and hasattr(task, "report_config"):
+            report_task = task.report_config
             report_config = ReportParams(
-                user_id=report_task.task.created_by.id,
+                user_id=task.created_by_id,
                 filter_type=report_task.filter_type,
+                report_type=report_task.report_type,
             )
             task_data.report_config = report_config
 
         tasks_data.append(task_data)
 
+    return tasks_data, dependencies
+
+
+def get_workflow_tasks(
+    workflow: Workflow,
+) -> Tuple[List[TaskData], Dict[int, List[int]]]:
+    cache_key = f"temporal:workflow-tasks:{workflow.id}:{workflow.version}"
+    compiled = cache.get(cache_key)
+
+    if compiled is None:
+        compiled = _compile_workflow_tasks(workflow.id)
+        cache.set(cache_key, compiled, settings.TEMPORAL_WORKFLOW_CACHE_TIMEOUT)
+
+    return compiled
+
+
+def prepare_workflow_input(execution: Execution) -> WorkflowInput:
+    task_executions = {
+        task_id: (task_execution_id, from_email, from_name)
+        for task_id, task_execution_id, from_email, from_name in (
+            TaskExecution.objects.filter(execution_id=execution.id).values_list(
+                "task_id",
+                "id",
+                "task__created_by__email",
+                "task__created_by__first_name",
+            )
+        )
+    }
+    cached_tasks, dependencies = get_workflow_tasks(execution.workflow)
+    tasks_data = []
+
+    for task_data in cached_tasks:
+        if task_data.task_id not in task_executions:
+            continue
+
+        if task_data.task_type == TaskType.EMAIL.value and not task_data.email_config:
+            raise ValueError(f"Task {task_data.name} não possui configuração de e-mail")
+        if task_data.task_type == TaskType.REPORT.value and not task_data.report_config:
+            raise ValueError(
+                f"Task {task_data.name} não possui configuração de relatório"
+            )
+
+        task_execution_id, from_email, from_name = task_executions[task_data.task_id]
+        tasks_data.append(
+            dataclasses.replace(
+                task_data,
+                task_execution_id=task_execution_id,
+                depends_on=[
+                    task_executions[dependency][0]
+                    for dependency in dependencies[task_data.task_id]
+                    if dependency in task_executions
+                ],
+                email_config=task_data.email_config
+                and dataclasses.replace(
+                    task_data.email_config, from_email=from_email, from_name=from_name
+                ),
+            )
+        )
+
+    _link_previous_stage(tasks_data)
+
     return WorkflowInput(
         execution_id=execution.id,
         workflow_name=execution.workflow.name,
-        tasks=sorted(tasks_data, key=lambda x: x.order),
+        tasks=tasks_data,
         delay_minutes=execution.workflow.delay_minutes,
+        max_parallel_tasks=settings.TEMPORAL_MAX_PARALLEL_TASKS,
+        local_status_activities=settings.TEMPORAL_LOCAL_STATUS_ACTIVITIES,
+        continue_as_new_after_tasks=settings.TEMPORAL_CONTINUE_AS_NEW_AFTER_TASKS,
+        continue_as_new_after_events=settings.TEMPORAL_CONTINUE_AS_NEW_AFTER_EVENTS,
+        email_chunk_size=settings.TEMPORAL_EMAIL_CHUNK_SIZE,
+        max_parallel_email_chunks=settings.TEMPORAL_MAX_PARALLEL_EMAIL_CHUNKS,
+        bulk_email=settings.TEMPORAL_BULK_EMAIL,
+        email_outbox=settings.TEMPORAL_EMAIL_OUTBOX,
+        task_queues={
+            activity_type: config["task_queue"]
+            for activity_type, config in settings.TEMPORAL_ACTIVITY_TASK_QUEUES.items()
+        },
     )
@@ -0,0 +1,20 @@
+import re
+from abc import ABC, abstractmethod
+
+KEY_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def validate_key(key: str) -> str:
+    if not KEY_PATTERN.fullmatch(key):
+        raise ValueError(f"Chave de payload inválida: {key!r}")
+    return key
+
+
+class BlobStore(ABC):
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        pass
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_RESTART_DELAY = 60.0
+
+
+def run_worker_process(task_queues: Optional[List[str]]) -> None:
+    import django
+
+    django.setup()
+
+    from django.db import connections
+
+    from .worker import main
+
+    connections.close_all()
+    asyncio.run(main(task_queues))
+
+
+class WorkerSupervisor:
+    def __init__(
+        self,
+        task_queues: List[Optional[List[str]]],
+        shutdown_timeout: float,
+        restart_delay: float = 1.0,
+        stable_after: float = 60.0,
+    ):
+        self._task_queues = task_queues
+        self._shutdown_timeout = shutdown_timeout
+        self._restart_delay = restart_delay
+        self._stable_after = stable_after
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: List[Optional[multiprocessing.Process]] = [None] * len(
+            task_queues
+        )
+        self._started_at = [0.0] * len(task_queues)
+        self._restart_at: List[Optional[float]] = [None] * len(task_queues)
+        self._failures = [0] * len(task_queues)
+        self._stopping = False
+
+    def _spawn(self, index: int) -> None:
+        process = self._context.Process(
+            target=run_worker_process,
+            args=(self._task_queues[index],),
+            name=f"kairon-worker-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+        self._started_at[index] = time.monotonic()
+        self._restart_at[index] = None
+
+    def _check_processes(self) -> None:
+        now = time.monotonic()
+
+        for index, process in enumerate(self._processes):
+            if self._restart_at[index] is not None:
+                if now >= self._restart_at[index]:
+                    self._spawn(index)
+                continue
+
+            if process is None or process.is_alive():
+                continue
+
+            if now - self._started_at[index] >= self._stable_after:
+                self._failures[index] = 0
+            delay = min(
+                self._restart_delay * 2 ** self._failures[index], MAX_RESTART_DELAY
+            )
+            self._failures[index] += 1
+            self._restart_at[index] = now + delay
+
+            logger.warning(
+                "Worker %s (task queues %s) exited with code %s, restarting in %.1fs",
+                process.name,
+                ", ".join(self._task_queues[index] or ["all"]),
+                process.exitcode,
+                delay,
+            )
+
+    def _request_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _shutdown(self) -> None:
+        alive = [p for p in self._processes if p is not None and p.is_alive()]
+
+        for process in alive:
+            process.terminate()
+
+        deadline = time.monotonic() + self._shutdown_timeout
+        for process in alive:
+            process.join(max(deadline - time.monotonic(), 0))
+
+        for process in alive:
+            if process.is_alive():
+                logger.warning("Worker %s did not stop in time, killing", process.name)
+                process.kill()
+                process.join()
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGTERM, self._request_stop)
+
+        for index in range(len(self._task_queues)):
+            self._spawn(index)
+
+        try:
+            while not self._stopping:
+                self._check_processes()
+                time.sleep(0.5)
+        finally:
+            self._shutdown()
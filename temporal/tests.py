@@ -1,21 +1,62 @@
 # temporal/tests.py
 import asyncio
+import tempfile
+from io import StringIO
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock, AsyncMock
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils import timezone
 from temporalio import exceptions
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import DataConverter
 
+from executions.models import Execution, TaskExecution
 from executions.types.execution import UpdateExecutionParams
 from executions.types.task_execution import UpdateTaskExecutionParams
-from notifications.types.email import EmailParams
+from notifications.exceptions import EmailRateLimitError
+from notifications.types.email import EmailParams, EmailResponse
+from notifications.types.outbox import OutboxEmailParams, OutboxResult
 from reports.types.report import ReportParams, EmailDeliveryReport, EmailStats
+from users.models import User
+from workflows.models import EmailTask, Workflow, Task, ReportTask
+from executions.types.transition import TransitionParams
 from temporal.activities import (
+    EMAIL_NOT_SENT_ERROR,
+    apply_transition_activity,
     update_task_status_activity,
     update_execution_status_activity,
     send_email_activity,
+    send_bulk_email_activity,
     generate_report_activity,
 )
+from temporal.codecs.chain import ChainCodec
+from temporal.codecs.claim_check import CLAIM_CHECK_ENCODING, ClaimCheckCodec
+from temporal.codecs.compression import CompressionCodec
+from temporal.services.prepare_workflow import prepare_workflow_input
+from temporal.storage.filesystem import FileSystemBlobStore
+from temporal.supervisor import WorkerSupervisor
+from temporal.types.task import TaskData, TaskResult
+from temporal.types.workflow import WorkflowInput
+from temporal.worker import (
+    TemporalWorker,
+    assign_task_queues,
+    resolve_task_queue,
+    validate_task_queues,
+)
+from temporal.workflows import (
+    KaironWorkflow,
+    LOCAL_RETRY_POLICY,
+    LOCAL_STATUS_ACTIVITY_TIMEOUT,
+    RETRY_DEFAULT_POLICY,
+    chunk_email_params,
+    get_task_dependencies,
+    get_ready_tasks,
+)
 
 
 class TemporalActivitiesTestCase(TestCase):
@@ -53,145 +94,878 @@ class TemporalActivitiesTestCase(TestCase):
         )
 
     @patch("temporal.activities.update_task_execution_status")
-    @patch("temporal.activities.sync_to_async")
-    def test_update_task_status_activity_success(
-        self, mock_sync_to_async, mock_update_task
-    ):
-        async_result = AsyncMock()
-        mock_sync_to_async.return_value = async_result
+    def test_update_task_status_activity_success(self, mock_update_task):
+        update_task_status_activity(self.task_params)
 
-        async def run_test():
-            await update_task_status_activity(self.task_params)
-
-        asyncio.run(run_test())
-
-        mock_sync_to_async.assert_called_once_with(mock_update_task)
-        async_result.assert_called_once_with(self.task_params)
+        mock_update_task.assert_called_once_with(self.task_params)
 
     @patch("temporal.activities.update_task_execution_status")
-    @patch("temporal.activities.sync_to_async")
-    def test_update_task_status_activity_error(
-        self, mock_sync_to_async, mock_update_task
-    ):
-        async_mock = AsyncMock()
-        async_mock.side_effect = ValueError("Erro de teste")
-        mock_sync_to_async.return_value = async_mock
+    def test_update_task_status_activity_error(self, mock_update_task):
+        mock_update_task.side_effect = ValueError("Erro de teste")
 
-        async def run_test():
-            with self.assertRaises(exceptions.ApplicationError):
-                await update_task_status_activity(self.task_params)
+        with self.assertRaises(exceptions.ApplicationError):
+            update_task_status_activity(self.task_params)
 
-        asyncio.run(run_test())
+    @patch("temporal.activities.update_execution_status")
+    def test_update_execution_status_activity_success(self, mock_update_execution):
+        update_execution_status_activity(self.execution_params)
+
+        mock_update_execution.assert_called_once_with(self.execution_params)
 
     @patch("temporal.activities.update_execution_status")
-    @patch("temporal.activities.sync_to_async")
-    def test_update_execution_status_activity_success(
-        self, mock_sync_to_async, mock_update_execution
-    ):
-        async_result = AsyncMock()
-        mock_sync_to_async.return_value = async_result
+    def test_update_execution_status_activity_error(self, mock_update_execution):
+        mock_update_execution.side_effect = ValueError("Erro de teste")
 
-        async def run_test():
-            await update_execution_status_activity(self.execution_params)
+        with self.assertRaises(exceptions.ApplicationError):
+            update_execution_status_activity(self.execution_params)
 
-        asyncio.run(run_test())
+    @patch("temporal.activities.apply_transition")
+    def test_apply_transition_activity_success(self, mock_apply_transition):
+        transition_params = TransitionParams(
+            task_executions=[self.task_params], executions=[self.execution_params]
+        )
 
-        mock_sync_to_async.assert_called_once_with(mock_update_execution)
-        async_result.assert_called_once_with(self.execution_params)
+        apply_transition_activity(transition_params)
 
-    @patch("temporal.activities.update_execution_status")
-    @patch("temporal.activities.sync_to_async")
-    def test_update_execution_status_activity_error(
-        self, mock_sync_to_async, mock_update_execution
-    ):
-        async_mock = AsyncMock()
-        async_mock.side_effect = ValueError("Erro de teste")
-        mock_sync_to_async.return_value = async_mock
+        mock_apply_transition.assert_called_once_with(transition_params)
 
-        async def run_test():
-            with self.assertRaises(exceptions.ApplicationError):
-                await update_execution_status_activity(self.execution_params)
+    @patch("temporal.activities.apply_transition")
+    def test_apply_transition_activity_error(self, mock_apply_transition):
+        mock_apply_transition.side_effect = ValueError("Erro de teste")
 
-        asyncio.run(run_test())
+        with self.assertRaises(exceptions.ApplicationError):
+            apply_transition_activity(TransitionParams())
 
-    @patch("temporal.activities.MailerSendService")
-    @patch("temporal.activities.sync_to_async")
-    def test_send_email_activity_success(
-        self, mock_sync_to_async, mock_mailer_service_class
+    @patch("temporal.activities.close_old_connections")
+    @patch("temporal.activities.update_task_execution_status")
+    def test_db_activity_closes_old_connections(
+        self, mock_update_task, mock_close_old_connections
     ):
-        mock_mailer = MagicMock()
-        mock_mailer_service_class.return_value = mock_mailer
+        update_task_status_activity(self.task_params)
+
+        self.assertEqual(mock_close_old_connections.call_count, 2)
+
+    @patch("temporal.activities.close_old_connections")
+    @patch("temporal.activities.get_email_service")
+    def test_email_activities_close_old_connections(
+        self, mock_get_email_service, mock_close_old_connections
+    ):
+        send_email_activity(self.email_params)
+        send_bulk_email_activity([self.email_params])
 
-        async_result = AsyncMock()
-        mock_sync_to_async.return_value = async_result
+        self.assertEqual(mock_close_old_connections.call_count, 4)
 
-        async def run_test():
-            await send_email_activity(self.email_params)
+    @patch("temporal.activities.get_email_service")
+    def test_send_email_activity_success(self, mock_get_email_service):
+        mock_mailer = MagicMock()
+        mock_get_email_service.return_value = mock_mailer
 
-        asyncio.run(run_test())
+        send_email_activity(self.email_params)
 
-        mock_mailer_service_class.assert_called_once()
-        mock_sync_to_async.assert_called_once()
-        async_result.assert_called_once_with(self.email_params)
+        mock_get_email_service.assert_called_once()
+        mock_mailer.send_email.assert_called_once_with(self.email_params)
 
-    @patch("temporal.activities.MailerSendService")
-    @patch("temporal.activities.sync_to_async")
-    def test_send_email_activity_error(
-        self, mock_sync_to_async, mock_mailer_service_class
-    ):
+    @patch("temporal.activities.get_email_service")
+    def test_send_email_activity_error(self, mock_get_email_service):
         mock_mailer = MagicMock()
-        mock_mailer_service_class.return_value = mock_mailer
+        mock_mailer.send_email.side_effect = ValueError("Erro de teste")
+        mock_get_email_service.return_value = mock_mailer
 
-        async_mock = AsyncMock()
-        async_mock.side_effect = ValueError("Erro de teste")
-        mock_sync_to_async.return_value = async_mock
+        with self.assertRaises(exceptions.ApplicationError):
+            send_email_activity(self.email_params)
+
+    @patch("temporal.activities.get_email_service")
+    def test_send_email_activity_rate_limited(self, mock_get_email_service):
+        mock_get_email_service.return_value.send_email.side_effect = (
+            EmailRateLimitError(7)
+        )
 
-        async def run_test():
-            with self.assertRaises(exceptions.ApplicationError):
-                await send_email_activity(self.email_params)
+        with self.assertRaises(exceptions.ApplicationError) as context:
+            send_email_activity(self.email_params)
 
-        asyncio.run(run_test())
+        self.assertEqual(context.exception.next_retry_delay, timedelta(seconds=7))
 
     @patch("temporal.activities.EmailReportGenerator")
     @patch("temporal.activities.format_report_as_html")
-    @patch("temporal.activities.sync_to_async")
     def test_generate_report_activity_success(
-        self, mock_sync_to_async, mock_format_html, mock_report_generator_class
+        self, mock_format_html, mock_report_generator_class
     ):
         mock_generator = MagicMock()
+        mock_generator.generate_report.return_value = self.report_result
         mock_report_generator_class.return_value = mock_generator
 
-        async_mock = AsyncMock(return_value=self.report_result)
-        mock_sync_to_async.return_value = async_mock
-
         mock_format_html.return_value = "<html>Report content</html>"
 
-        async def run_test():
-            result = await generate_report_activity(self.report_params)
-            self.assertEqual(result.subject, "Envio de relatório de emails")
-            self.assertEqual(result.to_email, ["user@example.com"])
-            self.assertEqual(result.html_content, "<html>Report content</html>")
+        result = generate_report_activity(self.report_params)
 
-        asyncio.run(run_test())
+        self.assertEqual(result.subject, "Envio de relatório de emails")
+        self.assertEqual(result.to_email, ["user@example.com"])
+        self.assertEqual(result.html_content, "<html>Report content</html>")
 
         mock_report_generator_class.assert_called_once()
-        mock_sync_to_async.assert_called_once()
+        mock_generator.generate_report.assert_called_once_with(self.report_params)
         mock_format_html.assert_called_once_with(self.report_result)
 
-    @patch("temporal.activities.EmailReportGenerator")
-    @patch("temporal.activities.sync_to_async")
-    def test_generate_report_activity_error(
-        self, mock_sync_to_async, mock_report_generator_class
+    @patch("temporal.activities.ExecutionPerformanceReportGenerator")
+    @patch("temporal.activities.format_performance_report_as_html")
+    def test_generate_report_activity_builds_performance_report(
+        self, mock_format_html, mock_report_generator_class
     ):
+        report_params = ReportParams(
+            user_id=1, filter_type="last_day", report_type="execution_performance"
+        )
+        mock_report_generator_class.return_value.generate_report.return_value = (
+            MagicMock(user_email="user@example.com")
+        )
+        mock_format_html.return_value = "<html>Performance</html>"
+
+        result = generate_report_activity(report_params)
+
+        self.assertEqual(result.subject, "Relatório de desempenho das execuções")
+        self.assertEqual(result.to_email, ["user@example.com"])
+        self.assertEqual(result.html_content, "<html>Performance</html>")
+        mock_report_generator_class.return_value.generate_report.assert_called_once_with(
+            report_params
+        )
+
+    @patch("temporal.activities.EmailReportGenerator")
+    def test_generate_report_activity_error(self, mock_report_generator_class):
         mock_generator = MagicMock()
+        mock_generator.generate_report.side_effect = ValueError("Erro de teste")
         mock_report_generator_class.return_value = mock_generator
 
-        async_mock = AsyncMock()
-        async_mock.side_effect = ValueError("Erro de teste")
-        mock_sync_to_async.return_value = async_mock
+        with self.assertRaises(exceptions.ApplicationError):
+            generate_report_activity(self.report_params)
+
+
+class TemporalWorkerTestCase(TestCase):
+    def tearDown(self):
+        TemporalWorker._instance = None
+        TemporalWorker._is_running = False
+
+    def _start(self, mock_worker, task_queues=None, threads=20):
+        mock_worker.return_value.run = AsyncMock()
+        mock_worker.return_value.shutdown = AsyncMock()
+        worker = TemporalWorker()
+
+        with self.settings(
+            TEMPORAL_ACTIVITY_THREADS=threads,
+            TEMPORAL_MAX_CONCURRENT_ACTIVITIES=3,
+            TEMPORAL_MAX_CONCURRENT_LOCAL_ACTIVITIES=2,
+            TEMPORAL_ACTIVITY_TASK_QUEUES=self.activity_task_queues,
+        ):
+            asyncio.run(worker.start(task_queues))
+            asyncio.run(worker.stop())
+
+        return {
+            call.kwargs["task_queue"]: call.kwargs
+            for call in mock_worker.call_args_list
+        }
+
+    def setUp(self):
+        self.activity_task_queues = {
+            "status": {"task_queue": "status-queue", "max_concurrent_activities": 8},
+            "email": {"task_queue": "email-queue", "max_concurrent_activities": 5},
+            "report": {"task_queue": "report-queue", "max_concurrent_activities": 2},
+        }
+
+    @patch("temporal.worker.Worker")
+    @patch("temporal.worker.Client.connect", new_callable=AsyncMock)
+    def test_start_runs_activities_on_thread_pool(self, mock_connect, mock_worker):
+        workers = self._start(mock_worker)
+
+        workflow_worker = workers[settings.TEMPORAL_TASK_QUEUE_NAME]
+        self.assertIsInstance(workflow_worker["activity_executor"], ThreadPoolExecutor)
+        self.assertEqual(workflow_worker["activity_executor"]._max_workers, 5)
+        self.assertEqual(workflow_worker["max_concurrent_activities"], 3)
+        self.assertEqual(workflow_worker["max_concurrent_local_activities"], 2)
+        self.assertEqual(workflow_worker["workflows"], [KaironWorkflow])
+
+    @patch("temporal.worker.Worker")
+    @patch("temporal.worker.Client.connect", new_callable=AsyncMock)
+    def test_start_creates_one_worker_per_task_queue(self, mock_connect, mock_worker):
+        workers = self._start(mock_worker)
+
+        self.assertEqual(
+            set(workers),
+            {
+                settings.TEMPORAL_TASK_QUEUE_NAME,
+                "status-queue",
+                "email-queue",
+                "report-queue",
+            },
+        )
+        self.assertEqual(
+            workers["email-queue"]["activities"],
+            [send_email_activity, send_bulk_email_activity],
+        )
+        self.assertEqual(workers["email-queue"]["max_concurrent_activities"], 5)
+        self.assertEqual(workers["report-queue"]["activity_executor"]._max_workers, 2)
+        self.assertEqual(workers["report-queue"]["workflows"], [])
+
+    @patch("temporal.worker.Worker")
+    @patch("temporal.worker.Client.connect", new_callable=AsyncMock)
+    def test_activity_threads_bound_all_task_queues(self, mock_connect, mock_worker):
+        workers = self._start(mock_worker, threads=9)
+
+        self.assertEqual(
+            {
+                task_queue: worker["activity_executor"]._max_workers
+                for task_queue, worker in workers.items()
+            },
+            {
+                settings.TEMPORAL_TASK_QUEUE_NAME: 3,
+                "status-queue": 3,
+                "email-queue": 1,
+                "report-queue": 1,
+            },
+        )
+        self.assertEqual(
+            workers[settings.TEMPORAL_TASK_QUEUE_NAME]["max_concurrent_activities"], 1
+        )
+        self.assertEqual(
+            workers[settings.TEMPORAL_TASK_QUEUE_NAME][
+                "max_concurrent_local_activities"
+            ],
+            2,
+        )
+        self.assertEqual(workers["email-queue"]["max_concurrent_activities"], 1)
+
+    @patch("temporal.worker.Worker")
+    @patch("temporal.worker.Client.connect", new_callable=AsyncMock)
+    def test_start_with_selected_task_queues(self, mock_connect, mock_worker):
+        with self.settings(TEMPORAL_ACTIVITY_TASK_QUEUES=self.activity_task_queues):
+            task_queues = [resolve_task_queue("email"), resolve_task_queue("report")]
+
+        workers = self._start(mock_worker, task_queues)
+
+        self.assertEqual(set(workers), {"email-queue", "report-queue"})
+
+
+class RunWorkerCommandTestCase(TestCase):
+    def setUp(self):
+        self.activity_task_queues = {
+            "status": {"task_queue": "status-queue", "max_concurrent_activities": 8},
+            "email": {"task_queue": "email-queue", "max_concurrent_activities": 5},
+        }
+
+    def test_task_queues_are_assigned_round_robin(self):
+        task_queues = ["a", "b", "c", "d"]
+
+        self.assertEqual(assign_task_queues(task_queues, 2), [["a", "c"], ["b", "d"]])
+        self.assertEqual(assign_task_queues(task_queues[:2], 4), [["a"], ["b"]])
+        self.assertEqual(assign_task_queues([], 3), [None, None, None])
+
+    def test_unknown_task_queue_is_rejected(self):
+        with self.settings(TEMPORAL_ACTIVITY_TASK_QUEUES=self.activity_task_queues):
+            validate_task_queues([settings.TEMPORAL_TASK_QUEUE_NAME, "email-queue"])
+
+            with self.assertRaises(ValueError):
+                validate_task_queues(["email-queue", "unknown-queue"])
+
+    @patch("temporal.management.commands.runworker.WorkerSupervisor")
+    def test_command_supervises_requested_processes(self, mock_supervisor):
+        with self.settings(TEMPORAL_ACTIVITY_TASK_QUEUES=self.activity_task_queues):
+            call_command(
+                "runworker",
+                processes=2,
+                task_queues=["workflow", "status", "email"],
+                stdout=StringIO(),
+            )
+
+        self.assertEqual(
+            mock_supervisor.call_args.args[0],
+            [[settings.TEMPORAL_TASK_QUEUE_NAME, "email-queue"], ["status-queue"]],
+        )
+        mock_supervisor.return_value.run.assert_called_once()
+
+    @patch("temporal.management.commands.runworker.WorkerSupervisor")
+    def test_command_does_not_supervise_unknown_task_queue(self, mock_supervisor):
+        stderr = StringIO()
+
+        with self.settings(TEMPORAL_ACTIVITY_TASK_QUEUES=self.activity_task_queues):
+            call_command(
+                "runworker",
+                processes=2,
+                task_queues=["email", "unknown-queue"],
+                stdout=StringIO(),
+                stderr=stderr,
+            )
+
+        mock_supervisor.assert_not_called()
+        self.assertIn("unknown-queue", stderr.getvalue())
+
+
+class TaskDependenciesTestCase(TestCase):
+    def _task(self, task_execution_id, order, depends_on=None):
+        return TaskData(
+            task_execution_id=task_execution_id,
+            name=f"Task {task_execution_id}",
+            task_type="email",
+            order=order,
+            initial_interval=10,
+            maximum_attempts=3,
+            backoff_coefficient=2.0,
+            depends_on=depends_on,
+        )
+
+    def test_legacy_tasks_run_sequentially(self):
+        tasks = [self._task(1, 1), self._task(2, 2), self._task(3, 3)]
+
+        dependencies = get_task_dependencies(tasks)
+
+        self.assertEqual(dependencies, {1: [], 2: [1], 3: [2]})
+        self.assertEqual(get_ready_tasks(tasks, set(), dependencies), [tasks[0]])
+
+    def test_independent_tasks_are_ready_together(self):
+        tasks = [
+            self._task(1, 1, []),
+            self._task(2, 1, []),
+            self._task(3, 2, [1, 2]),
+        ]
+        dependencies = get_task_dependencies(tasks)
+
+        self.assertEqual(get_ready_tasks(tasks, set(), dependencies), tasks[:2])
+        self.assertEqual(get_ready_tasks(tasks[2:], {1}, dependencies), [])
+        self.assertEqual(get_ready_tasks(tasks[2:], {1, 2}, dependencies), tasks[2:])
+
+
+class PrepareWorkflowInputTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="password123"
+        )
+        self.workflow = Workflow.objects.create(
+            name="Test Workflow", created_by=self.user
+        )
+        self.execution = Execution.objects.create(
+            workflow=self.workflow, created_by=self.user
+        )
+
+    def _create_task(self, name, order):
+        task = Task.objects.create(
+            workflow=self.workflow,
+            created_by=self.user,
+            name=name,
+            order=order,
+            task_type="report",
+        )
+        ReportTask.objects.create(task=task, filter_type="last_day")
+        task_execution = TaskExecution.objects.create(
+            execution=self.execution, task=task
+        )
+        return task, task_execution
+
+    def test_prepare_workflow_input_resolves_dependencies(self):
+        first, first_execution = self._create_task("First", 1)
+        second, second_execution = self._create_task("Second", 1)
+        third, third_execution = self._create_task("Third", 2)
+        fourth, fourth_execution = self._create_task("Fourth", 3)
+        fourth.depends_on.set([first])
+
+        workflow_input = prepare_workflow_input(self.execution)
+        depends_on = {
+            task.task_execution_id: sorted(task.depends_on)
+            for task in workflow_input.tasks
+        }
+
+        self.assertEqual(depends_on[first_execution.id], [])
+        self.assertEqual(depends_on[second_execution.id], [])
+        self.assertEqual(
+            depends_on[third_execution.id],
+            sorted([first_execution.id, second_execution.id]),
+        )
+        self.assertEqual(depends_on[fourth_execution.id], [first_execution.id])
+
+    def _get_execution(self):
+        return Execution.objects.select_related("workflow").get(pk=self.execution.id)
+
+    def test_prepare_workflow_input_uses_constant_queries(self):
+        for index in range(2):
+            self._create_task(f"Task {index}", index)
+        cache.clear()
+
+        with self.assertNumQueries(4):
+            prepare_workflow_input(self._get_execution())
+
+        for index in range(2, 6):
+            self._create_task(f"Task {index}", index)
+        cache.clear()
+
+        with self.assertNumQueries(4):
+            prepare_workflow_input(self._get_execution())
+
+    def test_prepare_workflow_input_reuses_cached_tasks_until_workflow_changes(self):
+        first, _ = self._create_task("First", 1)
+        cache.clear()
+
+        prepare_workflow_input(self._get_execution())
+
+        with self.assertNumQueries(2):
+            prepare_workflow_input(self._get_execution())
+
+        first.name = "Renamed"
+        first.save()
+
+        workflow_input = prepare_workflow_input(self._get_execution())
+
+        self.assertEqual(workflow_input.tasks[0].name, "Renamed")
+
+    def test_prepare_workflow_input_requires_task_config(self):
+        task = Task.objects.create(
+            workflow=self.workflow,
+            created_by=self.user,
+            name="Email",
+            order=1,
+            task_type="email",
+        )
+        TaskExecution.objects.create(execution=self.execution, task=task)
+
+        with self.assertRaises(ValueError):
+            prepare_workflow_input(self._get_execution())
+
+    def test_prepare_workflow_input_resolves_sender_outside_the_cache(self):
+        task = Task.objects.create(
+            workflow=self.workflow,
+            created_by=self.user,
+            name="Email",
+            order=1,
+            task_type="email",
+        )
+        EmailTask.objects.create(
+            task=task, subject="Subject", content="Content", recipients="a@test.com"
+        )
+        task_execution = TaskExecution.objects.create(
+            execution=self.execution, task=task
+        )
+        prepare_workflow_input(self._get_execution())
+
+        self.user.email = "new@example.com"
+        self.user.save()
+
+        task_data = prepare_workflow_input(self._get_execution()).tasks[0]
+
+        self.assertEqual(task_data.task_id, task.id)
+        self.assertEqual(task_data.task_execution_id, task_execution.id)
+        self.assertEqual(task_data.email_config.from_email, "new@example.com")
 
-        async def run_test():
-            with self.assertRaises(exceptions.ApplicationError):
-                await generate_report_activity(self.report_params)
 
-        asyncio.run(run_test())
+class KaironWorkflowStatusTestCase(TestCase):
+    def setUp(self):
+        self.params = UpdateTaskExecutionParams(task_execution_id=1, status="running")
+
+    @patch("temporal.workflows.workflow.execute_local_activity", new_callable=AsyncMock)
+    @patch("temporal.workflows.workflow.execute_activity", new_callable=AsyncMock)
+    def test_update_status_uses_regular_activity_by_default(
+        self, mock_execute_activity, mock_execute_local_activity
+    ):
+        kairon_workflow = KaironWorkflow()
+
+        asyncio.run(
+            kairon_workflow._update_status(update_task_status_activity, self.params)
+        )
+
+        mock_execute_activity.assert_awaited_once()
+        mock_execute_local_activity.assert_not_awaited()
+
+    @patch("temporal.workflows.workflow.execute_local_activity", new_callable=AsyncMock)
+    @patch("temporal.workflows.workflow.execute_activity", new_callable=AsyncMock)
+    def test_update_status_uses_local_activity_when_enabled(
+        self, mock_execute_activity, mock_execute_local_activity
+    ):
+        kairon_workflow = KaironWorkflow()
+        kairon_workflow._local_status_activities = True
+
+        asyncio.run(
+            kairon_workflow._update_status(update_task_status_activity, self.params)
+        )
+
+        mock_execute_local_activity.assert_awaited_once_with(
+            update_task_status_activity,
+            self.params,
+            start_to_close_timeout=LOCAL_STATUS_ACTIVITY_TIMEOUT,
+            retry_policy=LOCAL_RETRY_POLICY,
+        )
+        mock_execute_activity.assert_not_awaited()
+
+    @patch("temporal.workflows.workflow.info")
+    def test_should_continue_as_new_after_task_limit(self, mock_info):
+        mock_info.return_value.is_continue_as_new_suggested.return_value = False
+        mock_info.return_value.get_current_history_length.return_value = 10
+        input_data = WorkflowInput(
+            execution_id=1,
+            workflow_name="Test",
+            tasks=[],
+            continue_as_new_after_tasks=2,
+            continue_as_new_after_events=100,
+        )
+        kairon_workflow = KaironWorkflow()
+
+        self.assertFalse(kairon_workflow._should_continue_as_new(input_data, 1))
+        self.assertTrue(kairon_workflow._should_continue_as_new(input_data, 2))
+
+    @patch("temporal.workflows.workflow.info")
+    def test_should_continue_as_new_after_history_limit(self, mock_info):
+        mock_info.return_value.is_continue_as_new_suggested.return_value = False
+        mock_info.return_value.get_current_history_length.return_value = 100
+        input_data = WorkflowInput(
+            execution_id=1,
+            workflow_name="Test",
+            tasks=[],
+            continue_as_new_after_events=100,
+        )
+
+        self.assertFalse(KaironWorkflow()._should_continue_as_new(input_data, 0))
+        self.assertTrue(KaironWorkflow()._should_continue_as_new(input_data, 1))
+
+    @patch("temporal.workflows.workflow.continue_as_new")
+    @patch("temporal.workflows.workflow.info")
+    def test_continued_run_starts_a_task_before_continuing_again(
+        self, mock_info, mock_continue_as_new
+    ):
+        mock_info.return_value.is_continue_as_new_suggested.return_value = True
+        mock_info.return_value.get_current_history_length.return_value = 500
+        tasks = [
+            TaskData(
+                task_execution_id=index,
+                name=f"Task {index}",
+                task_type="email",
+                order=index,
+                initial_interval=1,
+                maximum_attempts=1,
+                backoff_coefficient=2.0,
+                depends_on=[],
+            )
+            for index in (1, 2)
+        ]
+        input_data = WorkflowInput(
+            execution_id=1,
+            workflow_name="Test",
+            tasks=tasks,
+            max_parallel_tasks=1,
+            continue_as_new_after_events=100,
+            execution_started=True,
+        )
+        kairon_workflow = KaironWorkflow()
+        kairon_workflow._apply_transition = AsyncMock()
+        kairon_workflow._execute_task = AsyncMock(
+            side_effect=lambda task: TaskResult(
+                task_execution_id=task.task_execution_id, status="completed"
+            )
+        )
+
+        asyncio.run(kairon_workflow._execute_tasks(input_data))
+
+        kairon_workflow._execute_task.assert_awaited_once_with(tasks[0])
+        continued = mock_continue_as_new.call_args.args[0]
+        self.assertEqual(continued.tasks, [tasks[1]])
+        self.assertEqual(continued.completed_task_ids, [])
+
+
+class EmailChunksTestCase(TestCase):
+    def setUp(self):
+        self.email_params = EmailParams(
+            subject="Test Email",
+            to_email=[f"user{i}@example.com" for i in range(5)],
+            content="Test content",
+            cc=["manager@example.com"],
+        )
+
+    def test_chunk_email_params_splits_recipients(self):
+        chunks = chunk_email_params(self.email_params, 2)
+
+        self.assertEqual(
+            [chunk.to_email for chunk in chunks],
+            [
+                ["user0@example.com", "user1@example.com"],
+                ["user2@example.com", "user3@example.com"],
+                ["user4@example.com"],
+            ],
+        )
+        self.assertEqual(chunks[0].cc, ["manager@example.com"])
+        self.assertIsNone(chunks[1].cc)
+
+    def test_chunk_email_params_disabled(self):
+        self.assertEqual(chunk_email_params(self.email_params, 0), [self.email_params])
+
+    @patch("temporal.workflows.workflow.info")
+    @patch("temporal.workflows.workflow.execute_activity", new_callable=AsyncMock)
+    def test_send_email_reports_failed_chunks(self, mock_execute_activity, mock_info):
+        mock_execute_activity.side_effect = [
+            None,
+            exceptions.ApplicationError("limit exceeded"),
+            None,
+        ]
+        kairon_workflow = KaironWorkflow()
+        kairon_workflow._email_chunk_size = 2
+        kairon_workflow._max_parallel_email_chunks = 2
+
+        with self.assertRaises(exceptions.ApplicationError) as context:
+            asyncio.run(
+                kairon_workflow._send_email(self.email_params, RETRY_DEFAULT_POLICY, 1)
+            )
+
+        self.assertEqual(mock_execute_activity.await_count, 3)
+        self.assertIn("1 of 3 email chunks failed", str(context.exception))
+        self.assertIn("chunk 2", str(context.exception))
+
+    @patch("temporal.workflows.workflow.info")
+    @patch("temporal.workflows.workflow.execute_activity", new_callable=AsyncMock)
+    def test_send_email_resends_only_rejected_bulk_chunks(
+        self, mock_execute_activity, mock_info
+    ):
+        mock_info.return_value.workflow_id = "wf-1"
+        mock_execute_activity.side_effect = [
+            [
+                EmailResponse(code=202),
+                EmailResponse(code=422, message="invalid"),
+                EmailResponse(code=202),
+            ],
+            None,
+        ]
+        kairon_workflow = KaironWorkflow()
+        kairon_workflow._email_chunk_size = 2
+        kairon_workflow._bulk_email = True
+
+        asyncio.run(
+            kairon_workflow._send_email(self.email_params, RETRY_DEFAULT_POLICY, 1)
+        )
+
+        self.assertEqual(mock_execute_activity.await_count, 2)
+        resent = mock_execute_activity.await_args_list[1].args[1]
+        self.assertEqual(resent.to_email, ["user2@example.com", "user3@example.com"])
+        self.assertEqual(resent.idempotency_key, "wf-1:1:1")
+
+    @patch("temporal.workflows.workflow.info")
+    @patch("temporal.workflows.workflow.execute_activity", new_callable=AsyncMock)
+    def test_send_email_does_not_resend_bulk_chunks_with_unknown_status(
+        self, mock_execute_activity, mock_info
+    ):
+        mock_execute_activity.side_effect = [
+            [
+                EmailResponse(code=202, delivery_unknown=True),
+                EmailResponse(code=500, delivery_unknown=True, message="failed"),
+                EmailResponse(code=202),
+            ],
+        ]
+        kairon_workflow = KaironWorkflow()
+        kairon_workflow._email_chunk_size = 2
+        kairon_workflow._bulk_email = True
+
+        with self.assertRaises(exceptions.ApplicationError) as context:
+            asyncio.run(
+                kairon_workflow._send_email(self.email_params, RETRY_DEFAULT_POLICY, 1)
+            )
+
+        mock_execute_activity.assert_awaited_once()
+        self.assertIn("1 of 3 email chunks failed", str(context.exception))
+        self.assertIn("chunk 2", str(context.exception))
+
+    @patch("temporal.workflows.workflow.logger")
+    @patch("temporal.workflows.workflow.info")
+    @patch("temporal.workflows.workflow.execute_activity", new_callable=AsyncMock)
+    def test_send_bulk_email_falls_back_only_when_nothing_was_sent(
+        self, mock_execute_activity, mock_info, mock_logger
+    ):
+        chunks = chunk_email_params(self.email_params, 2)
+        kairon_workflow = KaironWorkflow()
+
+        mock_execute_activity.side_effect = exceptions.ActivityError(
+            "failed",
+            scheduled_event_id=1,
+            started_event_id=2,
+            identity="worker",
+            activity_type="send_bulk_email_activity",
+            activity_id="1",
+            retry_state=None,
+        )
+        mock_execute_activity.side_effect.__cause__ = exceptions.ApplicationError(
+            "rate limited", type=EMAIL_NOT_SENT_ERROR
+        )
+        self.assertEqual(
+            asyncio.run(kairon_workflow._send_bulk_email(chunks)), ([0, 1, 2], [])
+        )
+
+        mock_execute_activity.side_effect.__cause__ = exceptions.TimeoutError(
+            "timeout", type=None, last_heartbeat_details=[]
+        )
+        pending, errors = asyncio.run(kairon_workflow._send_bulk_email(chunks))
+        self.assertEqual(pending, [])
+        self.assertEqual(len(errors), 3)
+        self.assertIn("status desconhecido: timeout", errors[0])
+
+        kairon_workflow._email_chunk_size = 2
+        kairon_workflow._bulk_email = True
+        mock_execute_activity.reset_mock()
+
+        with self.assertRaises(exceptions.ApplicationError) as context:
+            asyncio.run(
+                kairon_workflow._send_email(self.email_params, RETRY_DEFAULT_POLICY, 1)
+            )
+
+        mock_execute_activity.assert_awaited_once()
+        self.assertIn("3 of 3 email chunks failed", str(context.exception))
+        self.assertEqual(mock_logger.warning.call_count, 2)
+
+    @patch("temporal.workflows.workflow.execute_activity", new_callable=AsyncMock)
+    def test_send_outbox_email_uses_dispatched_results(self, mock_execute_activity):
+        kairon_workflow = KaironWorkflow()
+        messages = [
+            OutboxEmailParams(key=f"wf-1:1:{index}", email_params=self.email_params)
+            for index in range(2)
+        ]
+        kairon_workflow.email_dispatched(OutboxResult(key="wf-1:1:0", status="sent"))
+        kairon_workflow.email_dispatched(
+            OutboxResult(key="wf-1:1:1", status="failed", error_message="bounced")
+        )
+
+        with self.assertRaises(exceptions.ApplicationError) as context:
+            asyncio.run(kairon_workflow._send_outbox_email(messages))
+
+        mock_execute_activity.assert_awaited_once()
+        self.assertIn("1 of 2 outbox emails failed", str(context.exception))
+        self.assertEqual(kairon_workflow._outbox_results, {})
+
+
+class WorkerSupervisorTestCase(TestCase):
+    def setUp(self):
+        self.supervisor = WorkerSupervisor(
+            [["queue-a"], ["queue-b"]], shutdown_timeout=1, restart_delay=0
+        )
+        self.supervisor._context = MagicMock()
+
+    def test_spawn_assigns_task_queue(self):
+        self.supervisor._spawn(1)
+
+        self.supervisor._context.Process.assert_called_once()
+        kwargs = self.supervisor._context.Process.call_args.kwargs
+        self.assertEqual(kwargs["args"], (["queue-b"],))
+        self.supervisor._context.Process.return_value.start.assert_called_once()
+
+    def test_crashed_process_is_restarted(self):
+        self.supervisor._spawn(0)
+        crashed = self.supervisor._processes[0]
+        crashed.is_alive.return_value = False
+        crashed.exitcode = 1
+
+        self.supervisor._check_processes()
+        self.assertIsNotNone(self.supervisor._restart_at[0])
+
+        self.supervisor._check_processes()
+        self.assertEqual(self.supervisor._context.Process.call_count, 2)
+        self.assertIsNone(self.supervisor._restart_at[0])
+        self.assertEqual(self.supervisor._failures[0], 1)
+
+    def test_shutdown_terminates_alive_processes(self):
+        self.supervisor._spawn(0)
+        process = self.supervisor._processes[0]
+        process.is_alive.side_effect = [True, False]
+
+        self.supervisor._shutdown()
+
+        process.terminate.assert_called_once()
+        process.join.assert_called_once()
+        process.kill.assert_not_called()
+
+
+class ClaimCheckCodecTestCase(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = FileSystemBlobStore(self.tmp_dir.name)
+        self.codec = ClaimCheckCodec(self.store, threshold=1024)
+        self.converter = DataConverter.default.payload_converter
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def small_email(self):
+        return EmailParams(to_email=["test@example.com"], subject="s", content="c")
+
+    def test_small_payload_is_kept_inline(self):
+        payloads = self.converter.to_payloads([self.small_email()])
+
+        encoded = asyncio.run(self.codec.encode(payloads))
+
+        self.assertEqual(encoded, payloads)
+
+    def test_large_payload_is_stored_by_reference(self):
+        email = self.small_email()
+        email.html_content = "<p>relatório</p>" * 1000
+        payloads = self.converter.to_payloads([email])
+
+        encoded = asyncio.run(self.codec.encode(payloads))
+        decoded = asyncio.run(self.codec.decode(encoded))
+
+        self.assertEqual(encoded[0].metadata["encoding"], CLAIM_CHECK_ENCODING)
+        self.assertLess(encoded[0].ByteSize(), 200)
+        self.assertEqual(list(decoded), list(payloads))
+        self.assertEqual(self.converter.from_payloads(decoded, [EmailParams])[0], email)
+
+    def test_missing_payload_raises(self):
+        with self.assertRaises(KeyError):
+            self.store.get("0" * 64)
+
+    def test_invalid_key_is_rejected(self):
+        payload = Payload(
+            metadata={"encoding": CLAIM_CHECK_ENCODING}, data=b"../../etc/passwd"
+        )
+
+        with self.assertRaises(ValueError):
+            asyncio.run(self.codec.decode([payload]))
+        with self.assertRaises(ValueError):
+            self.store.get("../" + "0" * 61)
+        with self.assertRaises(ValueError):
+            self.store.put("A" * 64, b"data")
+
+
+class CompressionCodecTestCase(TestCase):
+    def setUp(self):
+        self.converter = DataConverter.default.payload_converter
+        self.email = EmailParams(
+            to_email=[f"user{i}@example.com" for i in range(100)],
+            subject="Test Email",
+            content="Test content " * 100,
+        )
+
+    def test_large_payload_is_compressed(self):
+        codec = CompressionCodec("zlib", threshold=1024)
+        payloads = self.converter.to_payloads([self.email])
+
+        encoded = asyncio.run(codec.encode(payloads))
+        decoded = asyncio.run(codec.decode(encoded))
+
+        self.assertEqual(encoded[0].metadata["encoding"], b"binary/zlib")
+        self.assertLess(encoded[0].ByteSize(), payloads[0].ByteSize())
+        self.assertEqual(
+            self.converter.from_payloads(decoded, [EmailParams])[0], self.email
+        )
+
+    def test_small_payload_is_not_compressed(self):
+        codec = CompressionCodec("zlib", threshold=1024)
+        payloads = self.converter.to_payloads(
+            [EmailParams(to_email=["a@example.com"], subject="s", content="c")]
+        )
+
+        self.assertEqual(asyncio.run(codec.encode(payloads)), payloads)
+
+    def test_invalid_algorithm(self):
+        with self.assertRaises(ValueError):
+            CompressionCodec("lz4")
+
+    def test_chain_codec_compresses_before_claim_check(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            codec = ChainCodec(
+                [
+                    CompressionCodec("zlib", threshold=0),
+                    ClaimCheckCodec(FileSystemBlobStore(tmp_dir), threshold=0),
+                ]
+            )
+            payloads = self.converter.to_payloads([self.email])
+
+            encoded = asyncio.run(codec.encode(payloads))
+            stored = FileSystemBlobStore(tmp_dir).get(encoded[0].data.decode())
+            decoded = asyncio.run(codec.decode(encoded))
+
+        self.assertEqual(encoded[0].metadata["encoding"], CLAIM_CHECK_ENCODING)
+        self.assertIn(b"binary/zlib", stored)
+        self.assertEqual(list(decoded), list(payloads))
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
 from notifications.types.email import EmailParams
 from reports.types.report import ReportParams
@@ -22,6 +22,8 @@ class TaskData:
     backoff_coefficient: float
     email_config: Optional[EmailParams] = None
     report_config: Optional[ReportParams] = None
+    depends_on: Optional[List[int]] = None
+    task_id: Optional[int] = None
 
 
 @dataclass
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 from .task import TaskData, TaskResult
 
@@ -10,6 +10,17 @@ class WorkflowInput:
     workflow_name: str
     tasks: List[TaskData]
     delay_minutes: int = 0
+    max_parallel_tasks: int = 1
+    local_status_activities: bool = False
+    task_queues: Dict[str, str] = field(default_factory=dict)
+    email_chunk_size: int = 0
+    max_parallel_email_chunks: int = 1
+    bulk_email: bool = False
+    email_outbox: bool = False
+    continue_as_new_after_tasks: int = 0
+    continue_as_new_after_events: int = 0
+    completed_task_ids: List[int] = field(default_factory=list)
+    execution_started: bool = False
 
 
 @dataclass
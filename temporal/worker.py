@@ -1,22 +1,117 @@
-from typing import Optional
+import asyncio
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, List, Optional
 
 from django.conf import settings
 from temporalio.client import Client
 from temporalio.worker import Worker
 
 from temporal.activities import (
+    apply_transition_activity,
+    enqueue_email_activity,
     generate_report_activity,
+    get_outbox_results_activity,
     update_task_status_activity,
     update_execution_status_activity,
+    send_bulk_email_activity,
     send_email_activity,
 )
+from temporal.converter import get_data_converter
 from temporal.workflows import KaironWorkflow
 
+WORKFLOW_QUEUE_ALIAS = "workflow"
+
+ACTIVITIES_BY_TYPE = {
+    "status": [
+        apply_transition_activity,
+        update_task_status_activity,
+        update_execution_status_activity,
+        enqueue_email_activity,
+        get_outbox_results_activity,
+    ],
+    "email": [send_email_activity, send_bulk_email_activity],
+    "report": [generate_report_activity],
+}
+
+
+def get_task_queues() -> List[str]:
+    task_queues = [settings.TEMPORAL_TASK_QUEUE_NAME]
+
+    for config in settings.TEMPORAL_ACTIVITY_TASK_QUEUES.values():
+        if config["task_queue"] not in task_queues:
+            task_queues.append(config["task_queue"])
+
+    return task_queues
+
+
+def get_local_activity_slots(task_queues: List[str]) -> int:
+    if settings.TEMPORAL_TASK_QUEUE_NAME not in task_queues:
+        return 0
+
+    return max(settings.TEMPORAL_MAX_CONCURRENT_LOCAL_ACTIVITIES, 1)
+
+
+def get_activity_slots(task_queues: List[str]) -> Dict[str, int]:
+    slots = {}
+
+    for task_queue in task_queues:
+        if task_queue == settings.TEMPORAL_TASK_QUEUE_NAME:
+            slots[task_queue] = settings.TEMPORAL_MAX_CONCURRENT_ACTIVITIES
+
+        for config in settings.TEMPORAL_ACTIVITY_TASK_QUEUES.values():
+            if config["task_queue"] == task_queue:
+                slots[task_queue] = config["max_concurrent_activities"]
+
+    threads = settings.TEMPORAL_ACTIVITY_THREADS - get_local_activity_slots(task_queues)
+    total = sum(slots.values())
+
+    if total <= threads:
+        return slots
+
+    return {
+        task_queue: max(threads * queue_slots // total, 1)
+        for task_queue, queue_slots in slots.items()
+    }
+
+
+def resolve_task_queue(name: str) -> str:
+    if name == WORKFLOW_QUEUE_ALIAS:
+        return settings.TEMPORAL_TASK_QUEUE_NAME
+
+    if name in settings.TEMPORAL_ACTIVITY_TASK_QUEUES:
+        return settings.TEMPORAL_ACTIVITY_TASK_QUEUES[name]["task_queue"]
+
+    return name
+
+
+def validate_task_queues(task_queues: List[str]) -> None:
+    known_task_queues = get_task_queues()
+
+    for task_queue in task_queues:
+        if task_queue not in known_task_queues:
+            raise ValueError(f"Fila {task_queue} não está configurada.")
+
+
+def assign_task_queues(
+    task_queues: List[str], processes: int
+) -> List[Optional[List[str]]]:
+    if not task_queues:
+        return [None] * processes
+
+    return [
+        task_queues[index::processes]
+        for index in range(processes)
+        if task_queues[index::processes]
+    ]
+
 
 class TemporalWorker:
     _instance: Optional["TemporalWorker"] = None
-    _worker: Optional[Worker] = None
+    _workers: List[Worker] = []
     _client: Optional[Client] = None
+    _activity_executors: List[ThreadPoolExecutor] = []
     _is_running: bool = False
 
     def __new__(cls):
@@ -28,31 +123,78 @@ class TemporalWorker:
         if self._is_running:
             return
 
-    async def start(self):
+    def _build_worker(
+        self, task_queue: str, activity_slots: int, local_activity_slots: int = 0
+    ) -> Worker:
+        workflows = []
+        activities = []
+
+        if task_queue == settings.TEMPORAL_TASK_QUEUE_NAME:
+            workflows.append(KaironWorkflow)
+            for type_activities in ACTIVITIES_BY_TYPE.values():
+                activities.extend(type_activities)
+
+        for activity_type, config in settings.TEMPORAL_ACTIVITY_TASK_QUEUES.items():
+            if config["task_queue"] != task_queue:
+                continue
+
+            activities.extend(
+                activity
+                for activity in ACTIVITIES_BY_TYPE[activity_type]
+                if activity not in activities
+            )
+
+        if not workflows and not activities:
+            raise ValueError(f"Fila {task_queue} não está configurada.")
+
+        local_activity_slots = local_activity_slots if workflows else 0
+        activity_executor = ThreadPoolExecutor(
+            max_workers=activity_slots + local_activity_slots,
+            thread_name_prefix=f"kairon-{task_queue}",
+        )
+        self._activity_executors.append(activity_executor)
+
+        return Worker(
+            self._client,
+            task_queue=task_queue,
+            activity_executor=activity_executor,
+            max_concurrent_activities=activity_slots,
+            max_concurrent_local_activities=max(local_activity_slots, 1),
+            graceful_shutdown_timeout=timedelta(
+                seconds=settings.TEMPORAL_WORKER_SHUTDOWN_TIMEOUT
+            ),
+            workflows=workflows,
+            activities=activities,
+        )
+
+    async def start(self, task_queues: Optional[List[str]] = None):
         if self._is_running:
             return
         self._client = await Client.connect(
             settings.TEMPORAL_CLIENT_ADDRESS,
             namespace=settings.TEMPORAL_CLIENT_NAMESPACE,
+            data_converter=get_data_converter(),
         )
-        self._worker = Worker(
-            self._client,
-            task_queue=settings.TEMPORAL_TASK_QUEUE_NAME,
-            workflows=[KaironWorkflow],
-            activities=[
-                update_task_status_activity,
-                update_execution_status_activity,
-                send_email_activity,
-                generate_report_activity,
-            ],
-        )
+        self._activity_executors = []
+        task_queues = task_queues or get_task_queues()
+        activity_slots = get_activity_slots(task_queues)
+        local_activity_slots = get_local_activity_slots(task_queues)
+        self._workers = [
+            self._build_worker(
+                task_queue, activity_slots.get(task_queue, 1), local_activity_slots
+            )
+            for task_queue in task_queues
+        ]
         self._is_running = True
-        await self._worker.run()
+        await asyncio.gather(*(worker.run() for worker in self._workers))
 
     async def stop(self):
-        if self._worker and self._is_running:
-            await self._worker.shutdown()
+        if self._workers and self._is_running:
+            await asyncio.gather(*(worker.shutdown() for worker in self._workers))
             self._is_running = False
+        for activity_executor in self._activity_executors:
+            activity_executor.shutdown(wait=True)
+        self._activity_executors = []
 
     @property
     def is_running(self) -> bool:
@@ -63,6 +205,16 @@ class TemporalWorker:
         return self._client
 
 
-async def main():
+async def main(task_queues: Optional[List[str]] = None):
     worker = TemporalWorker()
-    await worker.start()
+    loop = asyncio.get_running_loop()
+    stopping = []
+
+    def request_stop():
+        if not stopping:
+            stopping.append(asyncio.ensure_future(worker.stop()))
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, request_stop)
+
+    await worker.start(task_queues)
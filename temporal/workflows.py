@@ -1,4 +1,7 @@
+import asyncio
+import dataclasses
 from datetime import timedelta
+from typing import Dict, List, Optional, Set, Tuple
 
 from temporalio import workflow, exceptions
 from temporalio.common import RetryPolicy
@@ -9,9 +12,16 @@ from .types.workflow import WorkflowInput
 with workflow.unsafe.imports_passed_through():
     from executions.types.execution import UpdateExecutionParams
     from executions.types.task_execution import UpdateTaskExecutionParams
+    from executions.types.transition import TransitionParams
+    from notifications.types.email import EmailParams
+    from notifications.types.outbox import OutboxEmailParams, OutboxResult
     from .activities import (
-        update_task_status_activity,
+        EMAIL_NOT_SENT_ERROR,
+        apply_transition_activity,
+        enqueue_email_activity,
+        get_outbox_results_activity,
         update_execution_status_activity,
+        send_bulk_email_activity,
         send_email_activity,
         generate_report_activity,
     )
@@ -23,62 +33,255 @@ RETRY_DEFAULT_POLICY = RetryPolicy(
     maximum_attempts=5,
 )
 
+LOCAL_RETRY_POLICY = RetryPolicy(
+    backoff_coefficient=2,
+    initial_interval=timedelta(seconds=1),
+    maximum_interval=timedelta(seconds=10),
+    maximum_attempts=5,
+)
+
+STATUS_ACTIVITY_TIMEOUT = timedelta(seconds=10)
+
+LOCAL_STATUS_ACTIVITY_TIMEOUT = timedelta(seconds=5)
+
+BULK_EMAIL_ACTIVITY_TIMEOUT = timedelta(minutes=5)
+
+OUTBOX_POLL_INTERVAL = timedelta(minutes=1)
+
+
+def get_task_dependencies(tasks: List[TaskData]) -> Dict[int, List[int]]:
+    dependencies = {}
+    previous: Optional[TaskData] = None
+
+    for task in tasks:
+        if task.depends_on is not None:
+            dependencies[task.task_execution_id] = list(task.depends_on)
+        else:
+            dependencies[task.task_execution_id] = (
+                [previous.task_execution_id] if previous else []
+            )
+        previous = task
+
+    return dependencies
+
+
+def chunk_email_params(email_params: EmailParams, chunk_size: int) -> List[EmailParams]:
+    recipients = email_params.to_email
+
+    if chunk_size <= 0 or len(recipients) <= chunk_size:
+        return [email_params]
+
+    return [
+        dataclasses.replace(
+            email_params,
+            to_email=recipients[start : start + chunk_size],
+            cc=email_params.cc if start == 0 else None,
+        )
+        for start in range(0, len(recipients), chunk_size)
+    ]
+
+
+def get_ready_tasks(
+    pending: List[TaskData],
+    completed: Set[int],
+    dependencies: Dict[int, List[int]],
+) -> List[TaskData]:
+    return [
+        task
+        for task in pending
+        if all(
+            dependency in completed
+            for dependency in dependencies[task.task_execution_id]
+        )
+    ]
+
 
 @workflow.defn
 class KaironWorkflow:
+    def __init__(self) -> None:
+        self._local_status_activities = False
+        self._task_queues: Dict[str, str] = {}
+        self._email_chunk_size = 0
+        self._max_parallel_email_chunks = 1
+        self._bulk_email = False
+        self._email_outbox = False
+        self._outbox_results: Dict[str, OutboxResult] = {}
+
     @workflow.run
     async def run(self, input_data: WorkflowInput) -> None:
+        self._local_status_activities = input_data.local_status_activities
+        self._task_queues = input_data.task_queues
+        self._email_chunk_size = input_data.email_chunk_size
+        self._max_parallel_email_chunks = input_data.max_parallel_email_chunks
+        self._bulk_email = input_data.bulk_email
+        self._email_outbox = input_data.email_outbox
+
         try:
-            task_results = []
-            await workflow.execute_activity(
+            await self._execute_tasks(input_data)
+        except exceptions.TemporalError as e:
+            error_message = str(e)
+
+            await self._update_status(
                 update_execution_status_activity,
                 UpdateExecutionParams(
-                    execution_id=input_data.execution_id, status="running"
+                    execution_id=input_data.execution_id,
+                    status="failed",
+                    error_message=error_message,
                 ),
-                start_to_close_timeout=timedelta(seconds=10),
             )
 
-            for task in input_data.tasks:
-                result = await self._execute_task(task)
-                task_results.append(result)
-
-                if result.status == "failed":
-                    raise exceptions.ApplicationError(
-                        f"Task {task.name} failed: {result.error_message}"
-                    )
+    @workflow.signal
+    def email_dispatched(self, result: OutboxResult) -> None:
+        self._outbox_results[result.key] = result
 
+    async def _update_status(self, activity, params) -> None:
+        if self._local_status_activities:
+            await workflow.execute_local_activity(
+                activity,
+                params,
+                start_to_close_timeout=LOCAL_STATUS_ACTIVITY_TIMEOUT,
+                retry_policy=LOCAL_RETRY_POLICY,
+            )
+        else:
             await workflow.execute_activity(
-                update_execution_status_activity,
-                UpdateExecutionParams(
-                    execution_id=input_data.execution_id, status="completed"
-                ),
-                start_to_close_timeout=timedelta(seconds=10),
+                activity,
+                params,
+                start_to_close_timeout=STATUS_ACTIVITY_TIMEOUT,
                 retry_policy=RETRY_DEFAULT_POLICY,
+                task_queue=self._task_queues.get("status"),
             )
-        except exceptions.TemporalError as e:
-            error_message = str(e)
 
-            await workflow.execute_activity(
-                update_execution_status_activity,
+    async def _apply_transition(self, transition: TransitionParams) -> None:
+        if transition.task_executions or transition.executions:
+            await self._update_status(apply_transition_activity, transition)
+
+    async def _execute_tasks(self, input_data: WorkflowInput) -> None:
+        dependencies = get_task_dependencies(input_data.tasks)
+        pending = list(input_data.tasks)
+        completed: Set[int] = set(input_data.completed_task_ids)
+        running: Dict[asyncio.Task, TaskData] = {}
+        failure: Optional[str] = None
+        continue_as_new = False
+        started_tasks = 0
+        transition = TransitionParams()
+
+        if not input_data.execution_started:
+            transition.executions.append(
                 UpdateExecutionParams(
-                    execution_id=input_data.execution_id,
-                    status="failed",
-                    error_message=error_message,
-                ),
-                start_to_close_timeout=timedelta(seconds=10),
-                retry_policy=RETRY_DEFAULT_POLICY,
+                    execution_id=input_data.execution_id, status="running"
+                )
             )
 
-    async def _execute_task(self, task: TaskData) -> TaskResult:
-        await workflow.execute_activity(
-            update_task_status_activity,
-            UpdateTaskExecutionParams(
-                task_execution_id=task.task_execution_id, status="running"
-            ),
-            start_to_close_timeout=timedelta(seconds=10),
-            retry_policy=RETRY_DEFAULT_POLICY,
+        while pending or running:
+            launched = []
+
+            if failure is None and not continue_as_new:
+                continue_as_new = self._should_continue_as_new(
+                    input_data, started_tasks
+                )
+
+            if failure is None and not continue_as_new:
+                ready = get_ready_tasks(pending, completed, dependencies)
+                slots = max(input_data.max_parallel_tasks, 1) - len(running)
+                launched = ready[:slots]
+                started_tasks += len(launched)
+
+            if not running and not launched:
+                if failure is None and not continue_as_new:
+                    failure = "Tasks with unresolved dependencies: " + ", ".join(
+                        task.name for task in pending
+                    )
+                break
+
+            for task in launched:
+                pending.remove(task)
+                transition.task_executions.append(
+                    UpdateTaskExecutionParams(
+                        task_execution_id=task.task_execution_id, status="running"
+                    )
+                )
+
+            await self._apply_transition(transition)
+            transition = TransitionParams()
+
+            for task in launched:
+                running[asyncio.create_task(self._execute_task(task))] = task
+
+            done, _ = await workflow.wait(
+                running.keys(), return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for future in [future for future in running if future in done]:
+                task = running.pop(future)
+                result: TaskResult = future.result()
+
+                transition.task_executions.append(
+                    UpdateTaskExecutionParams(
+                        task_execution_id=result.task_execution_id,
+                        status=result.status,
+                        error_message=result.error_message,
+                    )
+                )
+
+                if result.status == "failed":
+                    failure = (
+                        failure or f"Task {task.name} failed: {result.error_message}"
+                    )
+                else:
+                    completed.add(task.task_execution_id)
+
+        if failure is None and pending:
+            await self._apply_transition(transition)
+            referenced = {
+                dependency
+                for task in pending
+                for dependency in dependencies[task.task_execution_id]
+            }
+            workflow.continue_as_new(
+                dataclasses.replace(
+                    input_data,
+                    tasks=[
+                        dataclasses.replace(
+                            task, depends_on=dependencies[task.task_execution_id]
+                        )
+                        for task in pending
+                    ],
+                    completed_task_ids=sorted(completed & referenced),
+                    execution_started=True,
+                )
+            )
+
+        transition.executions.append(
+            UpdateExecutionParams(
+                execution_id=input_data.execution_id,
+                status="failed" if failure else "completed",
+                error_message=failure,
+            )
+        )
+        await self._apply_transition(transition)
+
+    def _should_continue_as_new(
+        self, input_data: WorkflowInput, started_tasks: int
+    ) -> bool:
+        if started_tasks == 0:
+            return False
+
+        info = workflow.info()
+
+        if info.is_continue_as_new_suggested():
+            return True
+        if (
+            input_data.continue_as_new_after_tasks
+            and started_tasks >= input_data.continue_as_new_after_tasks
+        ):
+            return True
+        return bool(
+            input_data.continue_as_new_after_events
+            and info.get_current_history_length()
+            >= input_data.continue_as_new_after_events
         )
 
+    async def _execute_task(self, task: TaskData) -> TaskResult:
         TASK_RETRY_POLICY = RetryPolicy(
             initial_interval=timedelta(seconds=task.initial_interval),
             maximum_attempts=task.maximum_attempts,
@@ -87,11 +290,8 @@ class KaironWorkflow:
 
         try:
             if task.task_type == "email":
-                await workflow.execute_activity(
-                    send_email_activity,
-                    task.email_config,
-                    start_to_close_timeout=timedelta(seconds=10),
-                    retry_policy=TASK_RETRY_POLICY,
+                await self._send_email(
+                    task.email_config, TASK_RETRY_POLICY, task.task_execution_id
                 )
 
             elif task.task_type == "report":
@@ -100,25 +300,13 @@ class KaironWorkflow:
                     task.report_config,
                     start_to_close_timeout=timedelta(seconds=30),
                     retry_policy=TASK_RETRY_POLICY,
+                    task_queue=self._task_queues.get("report"),
                 )
 
-                await workflow.execute_activity(
-                    send_email_activity,
-                    report,
-                    start_to_close_timeout=timedelta(seconds=10),
-                    retry_policy=TASK_RETRY_POLICY,
+                await self._send_email(
+                    report, TASK_RETRY_POLICY, task.task_execution_id
                 )
 
-            await workflow.execute_activity(
-                update_task_status_activity,
-                UpdateTaskExecutionParams(
-                    task_execution_id=task.task_execution_id,
-                    status="completed",
-                ),
-                start_to_close_timeout=timedelta(seconds=10),
-                retry_policy=RETRY_DEFAULT_POLICY,
-            )
-
             return TaskResult(
                 task_execution_id=task.task_execution_id, status="completed"
             )
@@ -126,19 +314,154 @@ class KaironWorkflow:
         except exceptions.TemporalError as e:
             error_message = str(e)
 
-            await workflow.execute_activity(
-                update_task_status_activity,
-                UpdateTaskExecutionParams(
-                    task_execution_id=task.task_execution_id,
-                    status="failed",
-                    error_message=error_message,
-                ),
-                start_to_close_timeout=timedelta(seconds=10),
-                retry_policy=RETRY_DEFAULT_POLICY,
-            )
-
             return TaskResult(
                 task_execution_id=task.task_execution_id,
                 status="failed",
                 error_message=error_message,
             )
+
+    async def _send_email(
+        self, email_params: EmailParams, retry_policy: RetryPolicy, task_id: int
+    ) -> None:
+        workflow_id = workflow.info().workflow_id
+        chunks = [
+            dataclasses.replace(
+                chunk, idempotency_key=f"{workflow_id}:{task_id}:{index}"
+            )
+            for index, chunk in enumerate(
+                chunk_email_params(email_params, self._email_chunk_size)
+            )
+        ]
+
+        if self._email_outbox:
+            await self._send_outbox_email(
+                [
+                    OutboxEmailParams(
+                        key=chunk.idempotency_key,
+                        email_params=chunk,
+                        workflow_id=workflow_id,
+                    )
+                    for chunk in chunks
+                ]
+            )
+            return
+
+        pending = list(range(len(chunks)))
+        errors: List[str] = []
+
+        if self._bulk_email and len(chunks) > 1:
+            pending, errors = await self._send_bulk_email(chunks)
+        semaphore = asyncio.Semaphore(max(self._max_parallel_email_chunks, 1))
+
+        async def send_chunk(chunk: EmailParams) -> None:
+            async with semaphore:
+                await workflow.execute_activity(
+                    send_email_activity,
+                    chunk,
+                    start_to_close_timeout=timedelta(seconds=10),
+                    retry_policy=retry_policy,
+                    task_queue=self._task_queues.get("email"),
+                )
+
+        results = await asyncio.gather(
+            *(send_chunk(chunks[index]) for index in pending), return_exceptions=True
+        )
+
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(
+                result, exceptions.TemporalError
+            ):
+                raise result
+
+        errors += [
+            f"chunk {index + 1} ({len(chunks[index].to_email)} recipients): {result}"
+            for index, result in zip(pending, results)
+            if isinstance(result, BaseException)
+        ]
+
+        if errors:
+            raise exceptions.ApplicationError(
+                f"{len(errors)} of {len(chunks)} email chunks failed: "
+                + "; ".join(errors)
+            )
+
+    async def _send_bulk_email(
+        self, chunks: List[EmailParams]
+    ) -> Tuple[List[int], List[str]]:
+        try:
+            responses = await workflow.execute_activity(
+                send_bulk_email_activity,
+                chunks,
+                start_to_close_timeout=BULK_EMAIL_ACTIVITY_TIMEOUT,
+                retry_policy=RetryPolicy(maximum_attempts=1),
+                task_queue=self._task_queues.get("email"),
+            )
+        except exceptions.ActivityError as e:
+            if (
+                isinstance(e.cause, exceptions.ApplicationError)
+                and e.cause.type == EMAIL_NOT_SENT_ERROR
+            ):
+                return list(range(len(chunks))), []
+
+            workflow.logger.warning(f"Envio em massa com status desconhecido: {e}")
+            return [], [
+                f"chunk {index + 1} ({len(chunk.to_email)} recipients): "
+                f"envio em massa com status desconhecido: {e.cause or e}"
+                for index, chunk in enumerate(chunks)
+            ]
+
+        return (
+            [
+                index
+                for index, response in enumerate(responses)
+                if response.code != 202 and not response.delivery_unknown
+            ],
+            [
+                f"chunk {index + 1} ({len(chunks[index].to_email)} recipients): "
+                f"{response.message}"
+                for index, response in enumerate(responses)
+                if response.code != 202 and response.delivery_unknown
+            ],
+        )
+
+    async def _send_outbox_email(self, messages: List[OutboxEmailParams]) -> None:
+        keys = [message.key for message in messages]
+
+        await workflow.execute_activity(
+            enqueue_email_activity,
+            messages,
+            start_to_close_timeout=STATUS_ACTIVITY_TIMEOUT,
+            retry_policy=RETRY_DEFAULT_POLICY,
+            task_queue=self._task_queues.get("status"),
+        )
+
+        while not all(key in self._outbox_results for key in keys):
+            try:
+                await workflow.wait_condition(
+                    lambda: all(key in self._outbox_results for key in keys),
+                    timeout=OUTBOX_POLL_INTERVAL,
+                )
+            except asyncio.TimeoutError:
+                results = await workflow.execute_activity(
+                    get_outbox_results_activity,
+                    keys,
+                    start_to_close_timeout=STATUS_ACTIVITY_TIMEOUT,
+                    retry_policy=RETRY_DEFAULT_POLICY,
+                    task_queue=self._task_queues.get("status"),
+                )
+                for result in results:
+                    if result.status in ("sent", "failed"):
+                        self._outbox_results[result.key] = result
+
+        results = [self._outbox_results.pop(key) for key in keys]
+        errors = [
+            f"{result.key}: {result.error_message}"
+            for result in results
+            if result.status == "failed"
+        ]
+
+        if errors:
+            raise exceptions.ApplicationError(
+                f"{len(errors)} of {len(results)} outbox emails failed: "
+                + "; ".join(errors)
+            )
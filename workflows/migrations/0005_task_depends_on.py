@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 20:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflows", "0004_rename_delay_seconds_workflow_delay_minutes_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="depends_on",
+            field=models.ManyToManyField(
+                blank=True, related_name="dependents", to="workflows.task"
+            ),
+        ),
+    ]
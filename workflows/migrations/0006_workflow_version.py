@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 20:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflows", "0005_task_depends_on"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workflow",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 20:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflows", "0006_workflow_version"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="workflow",
+            index=models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="workflow_user_created_idx",
+            ),
+        ),
+    ]
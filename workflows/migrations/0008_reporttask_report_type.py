@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflows", "0007_workflow_workflow_user_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reporttask",
+            name="report_type",
+            field=models.CharField(
+                choices=[
+                    ("email_delivery", "Email Delivery"),
+                    ("execution_performance", "Execution Performance"),
+                ],
+                default="email_delivery",
+                max_length=30,
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 21:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflows", "0008_reporttask_report_type"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="workflow",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
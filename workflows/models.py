@@ -11,6 +11,29 @@ class Workflow(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     delay_minutes = models.IntegerField(default=0)
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="workflow_user_created_idx",
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        if "version" in (kwargs.get("update_fields") or ()):
+            raise ValueError(
+                "A versão do workflow é incrementada automaticamente e não pode "
+                "ser salva diretamente."
+            )
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "version"
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -52,6 +75,9 @@ class Task(models.Model):
     maximum_attempts = models.PositiveIntegerField(default=5)
     initial_interval = models.PositiveIntegerField(default=15)
     back_off = models.FloatField(default=2.0)
+    depends_on = models.ManyToManyField(
+        "self", symmetrical=False, related_name="dependents", blank=True
+    )
 
     def __str__(self):
         return self.name
@@ -94,6 +120,14 @@ class ReportTask(models.Model):
         ],
         default="last_hour",
     )
+    report_type = models.CharField(
+        max_length=30,
+        choices=[
+            ("email_delivery", "Email Delivery"),
+            ("execution_performance", "Execution Performance"),
+        ],
+        default="email_delivery",
+    )
 
     def __str__(self):
         return self.task.name
@@ -13,12 +13,15 @@ class EmailTaskSerializer(serializers.ModelSerializer):
 class ReportTaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReportTask
-        fields = ["filter_type"]
+        fields = ["filter_type", "report_type"]
 
 
 class TaskSerializer(serializers.ModelSerializer):
     email_config = EmailTaskSerializer(required=False)
     report_config = ReportTaskSerializer(required=False)
+    depends_on = serializers.ListField(
+        child=serializers.IntegerField(min_value=0), required=False, write_only=True
+    )
 
     class Meta:
         model = Task
@@ -32,6 +35,7 @@ class TaskSerializer(serializers.ModelSerializer):
             "back_off",
             "email_config",
             "report_config",
+            "depends_on",
         ]
 
     def validate(self, data):
@@ -91,6 +95,22 @@ class WorkflowSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_by", "created_at", "id"]
 
+    def validate_tasks(self, tasks):
+        orders = {task["order"] for task in tasks}
+
+        for task in tasks:
+            for dependency in task.get("depends_on", []):
+                if dependency not in orders:
+                    raise serializers.ValidationError(
+                        f"Task {task['name']} depends on unknown order {dependency}"
+                    )
+                if dependency >= task["order"]:
+                    raise serializers.ValidationError(
+                        f"Task {task['name']} can only depend on tasks with a lower order"
+                    )
+
+        return tasks
+
     def create(self, validated_data):
         tasks_data = validated_data.pop("tasks")
         schedule_data = validated_data.pop("schedule", None)
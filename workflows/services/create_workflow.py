@@ -8,20 +8,36 @@ def create_workflow(data, tasks_data, schedule_data=None) -> Workflow:
         workflow=workflow, created_by=data["created_by"]
     )
 
+    tasks_by_order = {}
+    dependencies = []
+
     for task_data in tasks_data:
         email_config = task_data.pop("email_config", None)
         report_config = task_data.pop("report_config", None)
+        depends_on = task_data.pop("depends_on", [])
 
         task = Task.objects.create(
             workflow=workflow, created_by=data["created_by"], **task_data
         )
         task.execution = TaskExecution.objects.create(execution=execution, task=task)
+        tasks_by_order.setdefault(task.order, []).append(task)
+        dependencies.append((task, depends_on))
 
         if email_config:
             EmailTask.objects.create(task=task, **email_config)
         elif report_config:
             ReportTask.objects.create(task=task, **report_config)
 
+    for task, depends_on in dependencies:
+        if depends_on:
+            task.depends_on.set(
+                [
+                    dependency
+                    for order in depends_on
+                    for dependency in tasks_by_order.get(order, [])
+                ]
+            )
+
     if schedule_data:
         Schedule.objects.create(
             workflow=workflow,
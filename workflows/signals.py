@@ -0,0 +1,35 @@
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import EmailTask, ReportTask, Task, Workflow
+
+
+def bump_workflow_version(workflow_id: int) -> None:
+    Workflow.objects.filter(pk=workflow_id).update(version=F("version") + 1)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_workflow_version(instance.workflow_id)
+
+
+@receiver(post_save, sender=EmailTask)
+@receiver(post_delete, sender=EmailTask)
+@receiver(post_save, sender=ReportTask)
+@receiver(post_delete, sender=ReportTask)
+def task_config_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_workflow_version(
+            Task.objects.filter(pk=instance.task_id)
+            .values_list("workflow_id", flat=True)
+            .first()
+        )
+
+
+@receiver(m2m_changed, sender=Task.depends_on.through)
+def task_dependencies_changed(sender, instance, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_workflow_version(instance.workflow_id)
@@ -1,5 +1,6 @@
 from django.test import TestCase
 from model_bakery import baker
+from rest_framework.test import APIClient
 
 from executions.models import Execution, TaskExecution
 from workflows.models import Workflow, Task, Schedule, EmailTask, ReportTask
@@ -149,3 +150,101 @@ class CreateWorkflowServiceTest(TestCase):
         execution = Execution.objects.first()
         task_executions = TaskExecution.objects.filter(execution=execution)
         self.assertEqual(task_executions.count(), 2)
+
+    def test_create_workflow_with_dependencies(self):
+        tasks_data = self.mixed_tasks_data + [
+            {
+                "name": "Independent Email Task",
+                "description": "Task to send email",
+                "order": 2,
+                "task_type": "email",
+                "email_config": {
+                    "recipients": "test@example.com",
+                    "subject": "Test Email Subject",
+                    "content": "This is a test email content",
+                },
+            },
+            {
+                "name": "Final Report Task",
+                "description": "Task to generate report",
+                "order": 3,
+                "task_type": "report",
+                "depends_on": [1, 2],
+                "report_config": {"filter_type": "last_day"},
+            },
+        ]
+
+        create_workflow(self.workflow_data, tasks_data)
+
+        final_task = Task.objects.get(name="Final Report Task")
+        self.assertEqual(
+            set(final_task.depends_on.values_list("name", flat=True)),
+            {"Send Email Task", "Generate Report Task", "Independent Email Task"},
+        )
+        self.assertFalse(Task.objects.get(order=1).depends_on.exists())
+        self.assertEqual(list(Task.objects.get(order=1).dependents.all()), [final_task])
+
+
+class WorkflowViewsetTest(TestCase):
+    def setUp(self):
+        self.user = baker.make("users.User")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_paginates_with_cursor(self):
+        workflows = [
+            baker.make("workflows.Workflow", created_by=self.user) for _ in range(3)
+        ]
+        baker.make("workflows.Workflow")
+
+        first_page = self.client.get("/workflows/", {"page_size": 2}).json()
+        second_page = self.client.get(first_page["next"]).json()
+
+        self.assertEqual(
+            [workflow["id"] for workflow in first_page["results"]],
+            [workflows[2].id, workflows[1].id],
+        )
+        self.assertEqual(
+            [workflow["id"] for workflow in second_page["results"]],
+            [workflows[0].id],
+        )
+        self.assertIsNone(second_page["next"])
+
+
+class WorkflowVersionTest(TestCase):
+    def setUp(self):
+        self.workflow = Workflow.objects.create(
+            name="Workflow", created_by=baker.make("users.User")
+        )
+
+    def test_task_changes_bump_version(self):
+        Task.objects.create(
+            workflow=self.workflow,
+            created_by=self.workflow.created_by,
+            name="Task",
+            task_type="email",
+            order=1,
+        )
+
+        self.workflow.refresh_from_db()
+        self.assertEqual(self.workflow.version, 2)
+
+    def test_save_does_not_overwrite_version(self):
+        Workflow.objects.filter(pk=self.workflow.pk).update(version=5)
+        self.workflow.name = "Renamed"
+        self.workflow.version = 1
+
+        self.workflow.save()
+
+        self.workflow.refresh_from_db()
+        self.assertEqual(self.workflow.name, "Renamed")
+        self.assertEqual(self.workflow.version, 5)
+
+    def test_saving_version_explicitly_raises(self):
+        self.workflow.version = 3
+
+        with self.assertRaises(ValueError):
+            self.workflow.save(update_fields=["name", "version"])
+
+        self.workflow.refresh_from_db()
+        self.assertEqual(self.workflow.version, 1)
@@ -1,6 +1,7 @@
 from rest_framework import viewsets, mixins
 
 from .models import Workflow
+from .pagination import WorkflowCursorPagination
 from .serializers import WorkflowSerializer
 
 
@@ -12,6 +13,7 @@ class WorkflowViewset(
     viewsets.GenericViewSet,
 ):
     serializer_class = WorkflowSerializer
+    pagination_class = WorkflowCursorPagination
 
     def get_queryset(self):
         return Workflow.objects.filter(created_by=self.request.user)